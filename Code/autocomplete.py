@@ -21,7 +21,7 @@ def generate_prefixes(vocabulary):
 
 def autocomplete_setup(vocabulary, algorithm='linear_search'):
     """Return the main data structure needed to set up autocomplete using the
-    given vocabulary and algorithm, specified as linear_search, trie, etc."""
+    given vocabulary and algorithm, specified as linear_search, trie, btree."""
     if algorithm == 'linear_search':
         # Use the given vocabulary list
         return vocabulary
@@ -29,17 +29,24 @@ def autocomplete_setup(vocabulary, algorithm='linear_search'):
         from trie import Trie
         # Create a trie structure with the vocabulary
         return Trie(vocabulary)
+    elif algorithm == 'btree':
+        from btree import BTree
+        # Create a B-tree sorted set with the vocabulary
+        return BTree(vocabulary)
 
 
 def autocomplete(prefix, structure, algorithm='linear_search'):
     """Return all vocabulary entries that start with the given prefix using the
-    given structure and algorithm, specified as linear_search, trie, etc."""
+    given structure and algorithm, specified as linear_search, trie, btree."""
     if algorithm == 'linear_search':
         # Search the list using linear search
         return [word for word in structure if word.startswith(prefix)]
     elif algorithm == 'trie':
         # Search the trie structure for the prefix
         return structure.search(prefix)
+    elif algorithm == 'btree':
+        # Scan the B-tree for the range of keys starting with the prefix
+        return structure.complete(prefix)
 
 
 def main():
@@ -7,13 +7,17 @@ class BinaryMinHeap(object):
     Items are stored in a dynamic array that implicitly represents a complete
     binary tree with root node at index 0 and last leaf node at index n-1."""
 
+    # Bulk methods sort all n items at once instead of finding k items one by
+    # one if k is at least 1/SORT_FRACTION of n, as the built-in sort is faster
+    SORT_FRACTION = 16
+
     def __init__(self, items=None):
-        """Initialize this heap and insert the given items, if any."""
-        # Initialize an empty list to store the items
-        self.items = []
-        if items:
-            for item in items:
-                self.insert(item)
+        """Initialize this heap and insert the given items, if any.
+        Running time: O(n) to build the heap bottom-up from n given items."""
+        # Initialize a list to store the items
+        self.items = list(items) if items else []
+        if len(self.items) > 1:
+            self._heapify()
 
     def __repr__(self):
         """Return a string representation of this heap."""
@@ -33,8 +37,7 @@ class BinaryMinHeap(object):
         Worst case running time: o(logn) if heap is larger than 1 item. Each traversal of level cuts node count in half. This would occur be if a new min is inserted."""
         # Insert the item at the end and bubble up to the root
         self.items.append(item)
-        if self.size() > 1:
-            self._bubble_up(self._last_index())
+        self._bubble_up(len(self.items) - 1)
 
     def get_min(self):
         """Return the minimum item at the root of this heap.
@@ -78,61 +81,128 @@ class BinaryMinHeap(object):
             self._bubble_down(0)
         return min_item
 
+    def insert_many(self, items):
+        """Insert all of the given items into this heap. If there are at least
+        as many new items as items already in the heap, rebuild the whole heap
+        at once in O(n + k) time instead of bubbling up each of the k new items
+        in O(k log n) time.
+        Running time: O(min(k log n, n + k)) for k new items."""
+        items = list(items)
+        if len(items) >= len(self.items):
+            self.items.extend(items)
+            if len(self.items) > 1:
+                self._heapify()
+        else:
+            for item in items:
+                self.items.append(item)
+                self._bubble_up(len(self.items) - 1)
+
+    def pop_many(self, k):
+        """Remove and return a list of the k minimum items in this heap in
+        sorted order, or all items if this heap has fewer than k items.
+        If k is a large fraction of the heap's size, all items are sorted
+        at once instead, which leaves the remaining items in sorted order,
+        and a sorted array is always a valid heap.
+        Running time: O(k log n), or O(n log n) for large k."""
+        if k <= 0:
+            return []
+        if k * self.SORT_FRACTION >= len(self.items):
+            self.items.sort()
+            items = self.items[:k]
+            del self.items[:k]
+            return items
+        return [self.delete_min() for _ in range(k)]
+
+    def nsmallest(self, k):
+        """Return a list of the k minimum items in this heap in sorted order,
+        or all items if this heap has fewer than k items, without changing it.
+        If k is a large fraction of the heap's size, a sorted copy of all items
+        is sliced instead. Running time: O(k log k), or O(n log n) for large k."""
+        if k * self.SORT_FRACTION >= len(self.items):
+            return sorted(self.items)[:k]
+        return [self.items[index] for index in self._nsmallest_indexes(k)]
+
+    def meld(self, other):
+        """Move all items from the given other heap into this heap, leaving the
+        other heap empty, or raise ValueError if it is this heap.
+        Running time: O(n + m) for heaps of n and m items."""
+        if other is self:
+            raise ValueError('Cannot meld a heap with itself')
+        self.insert_many(other.items)
+        other.items = []
+
+    def _nsmallest_indexes(self, k):
+        """Return a list of the indexes of the k minimum items in this heap in
+        sorted order. The candidates for the next minimum item are the children
+        of items already found, so they are kept in an auxiliary heap of
+        (item, index) pairs that never holds more than O(k) candidates."""
+        items = self.items
+        size = len(items)
+        if k <= 0 or size == 0:
+            return []
+        indexes = []
+        candidates = BinaryMinHeap([(items[0], 0)])
+        while candidates.size() > 0 and len(indexes) < k:
+            _, index = candidates.delete_min()
+            indexes.append(index)
+            for child_index in self._child_indexes(index):
+                if child_index < size:
+                    candidates.insert((items[child_index], child_index))
+        return indexes
+
+    def _heapify(self):
+        """Rearrange the items so the heap ordering property is true everywhere
+        by bubbling down each non-leaf item from the last one up to the root
+        (Floyd's method). Running time: O(n), not O(n log n), because most
+        items are near the leaves and only bubble down a few levels."""
+        for index in reversed(range(len(self.items) >> 1)):
+            self._bubble_down(index)
+
     def _bubble_up(self, index):
         """Ensure the heap ordering property is true above the given index,
-        swapping out of order items, or until the root node is reached.
+        shifting larger parent items down into the hole left by the item until
+        its position is found or the root node is reached, then placing it.
+        The index must be valid; it is not checked, to keep this loop fast.
         Best case running time: O(1) if parent item is smaller than this item.
         Worst case running time: O(log n) if items on path up to root node are
         out of order. Maximum path length in complete binary tree is log n."""
-        if index == 0:
-            return  # This index is the root node (does not have a parent)
-        if not (0 <= index <= self._last_index()):
-            raise IndexError('Invalid index: {}'.format(index))
-        # Get the item's value
-        item = self.items[index]
-        # Get the parent's index and value
-        parent_index = self._parent_index(index)
-        parent_item = self.items[parent_index]
-        # Swap this item with parent item if values are out of order
-        if item < parent_item:
-            self.items[index], self.items[parent_index] = self.items[parent_index], self.items[index]
-            index, parent_index = parent_index, index
-        # Recursively bubble up again if necessary
-            self._bubble_up(index)
+        items = self.items
+        item = items[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent_item = items[parent_index]
+            if not item < parent_item:
+                break
+            # Move the parent item down into the hole
+            items[index] = parent_item
+            index = parent_index
+        items[index] = item
 
     def _bubble_down(self, index):
         """Ensure the heap ordering property is true below the given index,
-        swapping out of order items, or until a leaf node is reached.
+        shifting smaller child items up into the hole left by the item until
+        its position is found or a leaf node is reached, then placing it.
+        The index must be valid; it is not checked, to keep this loop fast.
         Best case running time: O(1) if item is smaller than both child items.
         Worst case running time: O(log n) if items on path down to a leaf are
         out of order. Maximum path length in complete binary tree is log n."""
-        if not (0 <= index <= self._last_index()):
-            raise IndexError('Invalid index: {}'.format(index))
-        # Get the index of the item's left and right children
-        left_index = self._left_child_index(index)
-        right_index = self._right_child_index(index)
-        if left_index > self._last_index():
-            return  # This index is a leaf node (does not have any children)
-        # Get the item's value
-        item = self.items[index]
-        # Determine which child item to compare this node's item to
-        child_index = 0
-        if 0 <= left_index <= self._last_index() and 0 <= right_index <= self._last_index():
-            if self.items[left_index] < self.items[right_index]:
-                child_index = left_index
-            else:
+        items = self.items
+        size = len(items)
+        item = items[index]
+        child_index = (index << 1) + 1
+        while child_index < size:
+            # Determine which child item to compare this node's item to
+            right_index = child_index + 1
+            if right_index < size and not items[child_index] < items[right_index]:
                 child_index = right_index
-        elif not 0 <= left_index <= self._last_index():
-            child_index = right_index
-        else:
-            child_index = left_index
-        # Swap this item with a child item if values are out of order
-        child_item = self.items[child_index]
-        if item > child_item:
-            self.items[index], self.items[child_index] = self.items[child_index], self.items[index]
-            index, child_index = child_index, index
-        # Recursively bubble down again if necessary
-            self._bubble_down(index)
+            child_item = items[child_index]
+            if not child_item < item:
+                break
+            # Move the smaller child item up into the hole
+            items[index] = child_item
+            index = child_index
+            child_index = (index << 1) + 1
+        items[index] = item
 
     def _last_index(self):
         """Return the last valid index in the underlying array of items."""
@@ -152,6 +222,10 @@ class BinaryMinHeap(object):
         """Return the right child index of the item at the given index."""
         return (index << 1) + 2  # Shift left to multiply by 2
 
+    def _child_indexes(self, index):
+        """Return the range of child indexes of the item at the given index."""
+        return range((index << 1) + 1, (index << 1) + 3)
+
 
 def test_binary_min_heap():
     # Create a binary min heap of 7 items
@@ -75,6 +75,74 @@ class TestBinaryMinHeap(unittest.TestCase):
             assert heap.delete_min() == item
         assert heap.size() == 0
 
+    def test_init_with_many_random_items(self):
+        items = random.sample(range(1000), 50) + [7, 7, 7]
+        heap = BinaryMinHeap(items)
+        assert heap.size() == len(items)
+        # Verify the heap ordering property holds for every item
+        for index in range(1, heap.size()):
+            assert heap.items[heap._parent_index(index)] <= heap.items[index]
+        for item in sorted(items):
+            assert heap.delete_min() == item
+        assert heap.size() == 0
+
+    def test_replace_min(self):
+        heap = BinaryMinHeap([9, 25, 86, 3, 29, 5, 55])
+        assert heap.replace_min(30) == 3
+        assert heap.replace_min(1) == 5
+        assert heap.get_min() == 1
+        assert [heap.delete_min() for _ in range(7)] == [1, 9, 25, 29, 30, 55, 86]
+
+    def test_insert_many(self):
+        # Small batch into a larger heap bubbles up each item
+        heap = BinaryMinHeap(random.sample(range(1000), 50))
+        heap.insert_many([5000, -1, 7])
+        assert heap.size() == 53
+        assert heap.get_min() == -1
+        # Large batch into a smaller heap rebuilds the whole heap
+        batch = random.sample(range(1000), 100)
+        heap.insert_many(iter(batch))
+        assert heap.size() == 153
+        for index in range(1, heap.size()):
+            assert heap.items[heap._parent_index(index)] <= heap.items[index]
+
+    def test_pop_many(self):
+        items = random.sample(range(1000), 50)
+        heap = BinaryMinHeap(items)
+        assert heap.pop_many(0) == []
+        assert heap.pop_many(10) == sorted(items)[:10]
+        assert heap.size() == 40
+        assert heap.get_min() == sorted(items)[10]
+        assert heap.pop_many(100) == sorted(items)[10:]
+        assert heap.is_empty() is True
+        # Few items from a large heap are deleted one by one
+        items = random.sample(range(10000), 1000)
+        heap = BinaryMinHeap(items)
+        assert heap.pop_many(5) == sorted(items)[:5]
+        assert heap.nsmallest(5) == sorted(items)[5:10]
+        assert heap.size() == 995
+
+    def test_nsmallest(self):
+        items = [random.randrange(100) for _ in range(200)]
+        heap = BinaryMinHeap(items)
+        before = list(heap.items)
+        for k in [0, 1, 5, 50, 200, 300]:
+            assert heap.nsmallest(k) == sorted(items)[:k]
+        assert heap.items == before
+        assert BinaryMinHeap().nsmallest(3) == []
+
+    def test_meld(self):
+        heap1 = BinaryMinHeap([5, 1, 9])
+        heap2 = BinaryMinHeap([4, 8, 2, 7])
+        heap1.meld(heap2)
+        assert heap2.is_empty() is True
+        assert heap1.size() == 7
+        assert heap1.pop_many(7) == [1, 2, 4, 5, 7, 8, 9]
+        heap1.insert_many([3, 1, 2])
+        with self.assertRaises(ValueError):
+            heap1.meld(heap1)
+        assert heap1.pop_many(3) == [1, 2, 3]
+
     def test_parent_index(self):
         heap = BinaryMinHeap()
         with self.assertRaises(IndexError):
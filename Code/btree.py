@@ -0,0 +1,278 @@
+#!python3
+
+from bisect import bisect_left
+
+
+class BTreeNode:
+    """BTreeNode: A node for use in a B-tree that stores a sorted list of keys
+    and, unless it is a leaf, a list of children nodes with one more child than
+    it has keys. All keys in children[i] are between keys[i-1] and keys[i]."""
+
+    __slots__ = ('keys', 'children')
+
+    def __init__(self, keys=None, children=None):
+        """Initialize this B-tree node with the given keys and children."""
+        # Sorted list of keys stored in this node
+        self.keys = keys if keys is not None else []
+        # List of children nodes, or an empty list if this node is a leaf
+        self.children = children if children is not None else []
+
+    def is_leaf(self):
+        """Return True if this B-tree node has no children nodes."""
+        return len(self.children) == 0
+
+    def __repr__(self):
+        """Return a code representation of this B-tree node."""
+        return f'BTreeNode({self.keys!r})'
+
+
+class BTree:
+    """BTree: A balanced multiple-key search tree that stores a sorted set of
+    keys with efficient methods to insert and delete keys, check if it contains
+    a key, and scan all keys in a range in sorted order. Each node holds up to
+    fanout - 1 keys, so the height of the tree is O(log_B n) with B = fanout.
+    The fanout must be even, since full nodes are split around their middle
+    key into two halves of fanout/2 - 1 keys before an insert descends.
+    A larger fanout makes the tree shallower and keeps more neighboring keys
+    together in one contiguous list, which improves cache and page locality.
+    Unlike a sorted list, which shifts O(n) items on each insert or delete,
+    every operation here only rewrites O(B * log_B n) keys."""
+
+    # Default maximum number of children per node
+    DEFAULT_FANOUT = 64
+
+    def __init__(self, keys=None, fanout=DEFAULT_FANOUT):
+        """Initialize this B-tree with the given fanout (maximum number of
+        children per node, even and at least 4) and insert the given keys, if
+        any."""
+        if fanout < 4:
+            raise ValueError(f'B-tree fanout must be at least 4: {fanout}')
+        if fanout % 2 != 0:
+            raise ValueError(f'B-tree fanout must be even: {fanout}')
+        # Minimum degree: every node except the root has at least t children
+        self.min_degree = fanout // 2
+        self.root = BTreeNode()
+        # Count the number of distinct keys stored in the tree
+        self.size = 0
+        if keys is not None:
+            for key in keys:
+                self.insert(key)
+
+    def __repr__(self):
+        """Return a string representation of this B-tree."""
+        return f'BTree({list(self)!r})'
+
+    def __len__(self):
+        """Return the number of keys stored in this B-tree."""
+        return self.size
+
+    def __iter__(self):
+        """Return an iterator over all keys in this B-tree in sorted order."""
+        return self._scan(self.root, None, None)
+
+    def __contains__(self, key):
+        """Return True if this B-tree contains the given key."""
+        return self.contains(key)
+
+    def is_empty(self):
+        """Return True if this B-tree is empty (contains no keys)."""
+        return self.size == 0
+
+    def height(self):
+        """Return the number of levels of nodes in this B-tree."""
+        node = self.root
+        levels = 1
+        while not node.is_leaf():
+            node = node.children[0]
+            levels += 1
+        return levels
+
+    def contains(self, key):
+        """Return True if this B-tree contains the given key.
+        Running time: O(log n) comparisons, binary searching each node on the
+        O(log_B n) path from the root to a leaf."""
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                return True
+            if node.is_leaf():
+                return False
+            node = node.children[index]
+
+    def insert(self, key):
+        """Insert the given key into this B-tree, if it is not already present.
+        Full nodes are split on the way down, so a single pass from the root
+        to a leaf is needed. Running time: O(B * log_B n)."""
+        root = self.root
+        if len(root.keys) == 2 * self.min_degree - 1:
+            # Grow the tree upward by splitting the full root node
+            if self.contains(key):
+                return
+            self.root = BTreeNode(children=[root])
+            self._split_child(self.root, 0)
+        node = self.root
+        while True:
+            index = bisect_left(node.keys, key)
+            if index < len(node.keys) and node.keys[index] == key:
+                return  # Key is already in the set
+            if node.is_leaf():
+                node.keys.insert(index, key)
+                self.size += 1
+                return
+            if len(node.children[index].keys) == 2 * self.min_degree - 1:
+                self._split_child(node, index)
+                # The median key moved up into this node at the given index
+                if key == node.keys[index]:
+                    return
+                if key > node.keys[index]:
+                    index += 1
+            node = node.children[index]
+
+    def delete(self, key):
+        """Delete the given key from this B-tree, or raise KeyError if this
+        B-tree does not contain it. Nodes on the path down are refilled before
+        descending, so a single pass is needed. Running time: O(B * log_B n)."""
+        if not self._delete(self.root, key):
+            raise KeyError(key)
+        self.size -= 1
+        # Shrink the tree downward if the root node ran out of keys
+        if len(self.root.keys) == 0 and not self.root.is_leaf():
+            self.root = self.root.children[0]
+
+    def irange(self, low=None, high=None):
+        """Return an iterator over all keys in the range [low, high) in sorted
+        order, where a bound of None is unbounded. Only the O(log_B n) nodes
+        on the path to low and the nodes holding the k keys in range are
+        visited. Running time: O(log n + k)."""
+        return self._scan(self.root, low, high)
+
+    def complete(self, prefix):
+        """Return a list of all string keys in this B-tree that start with the
+        given prefix string, in sorted order."""
+        completions = []
+        for key in self._scan(self.root, prefix, None):
+            if not key.startswith(prefix):
+                break
+            completions.append(key)
+        return completions
+
+    def _scan(self, node, low, high):
+        """Yield all keys in the subtree rooted at the given node that are in
+        the range [low, high) in sorted order, with None meaning unbounded."""
+        start = 0 if low is None else bisect_left(node.keys, low)
+        for index in range(start, len(node.keys)):
+            if not node.is_leaf():
+                yield from self._scan(node.children[index], low, high)
+            key = node.keys[index]
+            if high is not None and key >= high:
+                return
+            yield key
+        if not node.is_leaf():
+            yield from self._scan(node.children[len(node.keys)], low, high)
+
+    def _split_child(self, parent, index):
+        """Split the full child node at the given index of the given parent
+        node around its median key, which moves up into the parent node."""
+        t = self.min_degree
+        child = parent.children[index]
+        sibling = BTreeNode(child.keys[t:], child.children[t:])
+        parent.keys.insert(index, child.keys[t - 1])
+        parent.children.insert(index + 1, sibling)
+        del child.keys[t - 1:]
+        del child.children[t:]
+
+    def _delete(self, node, key):
+        """Delete the given key from the subtree rooted at the given node,
+        which has at least min_degree keys unless it is the root node.
+        Return True if the key was found and deleted, or False otherwise."""
+        t = self.min_degree
+        while True:
+            index = bisect_left(node.keys, key)
+            found = index < len(node.keys) and node.keys[index] == key
+            if node.is_leaf():
+                if found:
+                    del node.keys[index]
+                return found
+            if found:
+                left = node.children[index]
+                right = node.children[index + 1]
+                if len(left.keys) >= t:
+                    # Replace key with its predecessor and delete that instead
+                    key = node.keys[index] = self._max_key(left)
+                    node = left
+                elif len(right.keys) >= t:
+                    # Replace key with its successor and delete that instead
+                    key = node.keys[index] = self._min_key(right)
+                    node = right
+                else:
+                    self._merge_children(node, index)
+                    node = left
+                continue
+            if len(node.children[index].keys) < t:
+                index = self._fill_child(node, index)
+            node = node.children[index]
+
+    def _fill_child(self, parent, index):
+        """Ensure the child node at the given index of the given parent node
+        has at least min_degree keys by borrowing a key from a sibling or by
+        merging it with a sibling. Return the index of the refilled child."""
+        t = self.min_degree
+        child = parent.children[index]
+        if index > 0 and len(parent.children[index - 1].keys) >= t:
+            # Rotate a key from the left sibling through the parent
+            left = parent.children[index - 1]
+            child.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = left.keys.pop()
+            if not left.is_leaf():
+                child.children.insert(0, left.children.pop())
+        elif (index < len(parent.keys) and
+              len(parent.children[index + 1].keys) >= t):
+            # Rotate a key from the right sibling through the parent
+            right = parent.children[index + 1]
+            child.keys.append(parent.keys[index])
+            parent.keys[index] = right.keys.pop(0)
+            if not right.is_leaf():
+                child.children.append(right.children.pop(0))
+        elif index < len(parent.keys):
+            self._merge_children(parent, index)
+        else:
+            self._merge_children(parent, index - 1)
+            index -= 1
+        return index
+
+    def _merge_children(self, parent, index):
+        """Merge the child node at index + 1 of the given parent node and the
+        parent's key at the given index into the child node at the index."""
+        left = parent.children[index]
+        right = parent.children.pop(index + 1)
+        left.keys.append(parent.keys.pop(index))
+        left.keys.extend(right.keys)
+        left.children.extend(right.children)
+
+    @staticmethod
+    def _min_key(node):
+        """Return the minimum key in the subtree rooted at the given node."""
+        while not node.is_leaf():
+            node = node.children[0]
+        return node.keys[0]
+
+    @staticmethod
+    def _max_key(node):
+        """Return the maximum key in the subtree rooted at the given node."""
+        while not node.is_leaf():
+            node = node.children[-1]
+        return node.keys[-1]
+
+
+def main():
+    strings = ['ABC', 'ABD', 'A', 'XYZ']
+    tree = BTree(strings, fanout=4)
+    print(f'tree: {tree}')
+    print(f'height: {tree.height()}')
+    for prefix in ['A', 'AB', 'X', 'B']:
+        print(f'complete({prefix!r}): {tree.complete(prefix)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!python3
+
+from btree import BTree, BTreeNode
+import random
+import unittest
+
+
+class BTreeTest(unittest.TestCase):
+
+    def assert_valid(self, tree):
+        """Verify the B-tree ordering, occupancy and balance properties."""
+        t = tree.min_degree
+        leaf_depths = set()
+        stack = [(tree.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            assert node.keys == sorted(set(node.keys))
+            assert len(node.keys) <= 2 * t - 1
+            if node is not tree.root:
+                assert len(node.keys) >= t - 1
+            if node.is_leaf():
+                leaf_depths.add(depth)
+            else:
+                assert len(node.children) == len(node.keys) + 1
+                for child in node.children:
+                    stack.append((child, depth + 1))
+        assert len(leaf_depths) == 1
+        keys = list(tree)
+        assert keys == sorted(set(keys))
+        assert len(keys) == tree.size
+
+    def test_init_and_properties(self):
+        tree = BTree()
+        assert tree.size == 0
+        assert tree.is_empty() is True
+        assert isinstance(tree.root, BTreeNode)
+        assert tree.root.is_leaf() is True
+        assert list(tree) == []
+        with self.assertRaises(ValueError):
+            BTree(fanout=3)
+        for fanout in [5, 7, 65]:
+            with self.assertRaises(ValueError):
+                BTree(fanout=fanout)
+
+    def test_nodes_hold_up_to_fanout_minus_one_keys(self):
+        for fanout in [4, 6, 16]:
+            tree = BTree(range(fanout - 1), fanout=fanout)
+            # Root is a full leaf, which is split by the next insert
+            assert len(tree.root.keys) == fanout - 1
+            assert tree.height() == 1
+            tree.insert(fanout)
+            assert tree.height() == 2
+            self.assert_valid(tree)
+
+    def test_insert_and_contains(self):
+        tree = BTree(fanout=4)
+        for key in [5, 3, 8, 1, 4, 7, 9, 2, 6, 5, 3]:
+            tree.insert(key)
+            self.assert_valid(tree)
+        assert tree.size == 9
+        assert list(tree) == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        assert tree.height() > 1
+        assert 7 in tree
+        assert 0 not in tree
+        assert tree.contains(10) is False
+
+    def test_delete(self):
+        tree = BTree(range(100), fanout=4)
+        with self.assertRaises(KeyError):
+            tree.delete(100)
+        keys = list(range(100))
+        random.shuffle(keys)
+        for index, key in enumerate(keys):
+            tree.delete(key)
+            assert key not in tree
+            assert tree.size == 99 - index
+            self.assert_valid(tree)
+        assert tree.is_empty() is True
+        assert tree.height() == 1
+
+    def test_random_mixed_operations(self):
+        for fanout in [4, 6, 16]:
+            tree = BTree(fanout=fanout)
+            expected = set()
+            for _ in range(2000):
+                key = random.randrange(300)
+                if random.random() < 0.6:
+                    tree.insert(key)
+                    expected.add(key)
+                elif key in expected:
+                    tree.delete(key)
+                    expected.remove(key)
+            self.assert_valid(tree)
+            assert list(tree) == sorted(expected)
+
+    def test_irange(self):
+        tree = BTree(range(0, 100, 2), fanout=4)
+        assert list(tree.irange(10, 20)) == [10, 12, 14, 16, 18]
+        assert list(tree.irange(11, 19)) == [12, 14, 16, 18]
+        assert list(tree.irange(None, 5)) == [0, 2, 4]
+        assert list(tree.irange(95)) == [96, 98]
+        assert list(tree.irange(50, 50)) == []
+
+    def test_complete(self):
+        strings = ['ABC', 'ABD', 'A', 'XYZ']
+        tree = BTree(strings, fanout=4)
+        assert tree.complete('ABC') == ['ABC']
+        assert tree.complete('AB') == ['ABC', 'ABD']
+        assert tree.complete('A') == ['A', 'ABC', 'ABD']
+        assert tree.complete('X') == ['XYZ']
+        assert tree.complete('BC') == []
+        assert tree.complete('') == ['A', 'ABC', 'ABD', 'XYZ']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+#!python
+
+import asyncio
+import collections
+import queue
+import threading
+import time
+
+from priorityqueue import PriorityQueue
+
+
+class ThreadSafePriorityQueue(object):
+    """ThreadSafePriorityQueue: a priority queue that can be shared by many
+    producer and consumer threads. All operations hold one lock around the
+    same PriorityQueue core, and threads that must wait for an item (or for
+    room, if the queue has a maximum size) sleep on a condition variable until
+    another thread wakes them, instead of polling. Like the standard library's
+    queue module, get and put raise queue.Empty and queue.Full on timeout."""
+
+    def __init__(self, maxsize=0):
+        """Initialize this priority queue with the given maximum size, or with
+        no maximum size if maxsize is 0 or negative."""
+        self.maxsize = maxsize
+        self.queue = PriorityQueue()
+        self.lock = threading.Lock()
+        # Conditions sharing the lock to wait for an item or for room
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+
+    def __repr__(self):
+        """Return a string representation of this priority queue."""
+        return 'ThreadSafePriorityQueue({} items)'.format(self.size())
+
+    def size(self):
+        """Return the number of items in this priority queue."""
+        with self.lock:
+            return self.queue.size()
+
+    def is_empty(self):
+        """Return True if this priority queue is empty, or False otherwise."""
+        with self.lock:
+            return self.queue.is_empty()
+
+    def is_full(self):
+        """Return True if this priority queue has reached its maximum size."""
+        with self.lock:
+            return self._is_full()
+
+    def put(self, item, priority, block=True, timeout=None):
+        """Insert the given item in order according to the given priority and
+        return its handle. If the queue is full, wait until there is room, for
+        at most timeout seconds if given, or raise queue.Full if not block."""
+        with self.not_full:
+            if self._is_full():
+                if not block:
+                    raise queue.Full
+                if not self._wait(self.not_full, self._is_full, timeout):
+                    raise queue.Full
+            handle = self.queue.enqueue(item, priority)
+            self.not_empty.notify()
+            return handle
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the item at the front of this priority queue. If
+        the queue is empty, wait until an item is put, for at most timeout
+        seconds if given, or raise queue.Empty if not block."""
+        with self.not_empty:
+            if self.queue.is_empty():
+                if not block:
+                    raise queue.Empty
+                if not self._wait(self.not_empty, self.queue.is_empty, timeout):
+                    raise queue.Empty
+            item = self.queue.dequeue()
+            self.not_full.notify()
+            return item
+
+    def put_nowait(self, item, priority):
+        """Insert the given item without waiting, or raise queue.Full."""
+        return self.put(item, priority, block=False)
+
+    def get_nowait(self):
+        """Remove and return the front item without waiting, or raise
+        queue.Empty."""
+        return self.get(block=False)
+
+    def update_priority(self, handle, priority):
+        """Change the priority of the item with the given handle."""
+        with self.lock:
+            self.queue.update_priority(handle, priority)
+
+    def cancel(self, handle):
+        """Remove and return the item with the given handle in O(1) time."""
+        with self.lock:
+            item = self.queue.cancel(handle)
+            self.not_full.notify()
+            return item
+
+    def _is_full(self):
+        """Return True if the queue has reached its maximum size. The lock
+        must be held by the caller."""
+        return 0 < self.maxsize <= self.queue.size()
+
+    @staticmethod
+    def _wait(condition, blocked, timeout):
+        """Wait on the given condition while the given blocked function returns
+        True, for at most timeout seconds if given. The condition's lock must
+        be held by the caller. Return False if the wait timed out."""
+        if timeout is None:
+            while blocked():
+                condition.wait()
+            return True
+        if timeout < 0:
+            raise ValueError('Timeout must be a non-negative number')
+        deadline = time.monotonic() + timeout
+        while blocked():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            condition.wait(remaining)
+        return True
+
+
+class AsyncPriorityQueue(object):
+    """AsyncPriorityQueue: a priority queue for coroutines running in one
+    asyncio event loop, with awaitable get and put methods that suspend the
+    calling task until an item (or room, with a maximum size) is available.
+    Items are stored in the same PriorityQueue core. Like the asyncio.Queue
+    class, waiting tasks sleep on futures kept in two queues of getters and
+    putters, which are woken up synchronously, so the nowait methods work
+    inside or outside a running event loop, and raise asyncio.QueueEmpty and
+    asyncio.QueueFull."""
+
+    def __init__(self, maxsize=0):
+        """Initialize this priority queue with the given maximum size, or with
+        no maximum size if maxsize is 0 or negative."""
+        self.maxsize = maxsize
+        self.queue = PriorityQueue()
+        # Futures of tasks waiting for an item or for room, in arrival order
+        self.getters = collections.deque()
+        self.putters = collections.deque()
+
+    def __repr__(self):
+        """Return a string representation of this priority queue."""
+        return 'AsyncPriorityQueue({} items)'.format(self.size())
+
+    def size(self):
+        """Return the number of items in this priority queue."""
+        return self.queue.size()
+
+    def is_empty(self):
+        """Return True if this priority queue is empty, or False otherwise."""
+        return self.queue.is_empty()
+
+    def is_full(self):
+        """Return True if this priority queue has reached its maximum size."""
+        return 0 < self.maxsize <= self.queue.size()
+
+    async def put(self, item, priority):
+        """Insert the given item in order according to the given priority and
+        return its handle, waiting until there is room if the queue is full."""
+        while self.is_full():
+            await self._wait(self.putters, self.is_full)
+        return self.put_nowait(item, priority)
+
+    async def get(self):
+        """Remove and return the item at the front of this priority queue,
+        waiting until an item is put if the queue is empty."""
+        while self.is_empty():
+            await self._wait(self.getters, self.is_empty)
+        return self.get_nowait()
+
+    def put_nowait(self, item, priority):
+        """Insert the given item without waiting, or raise asyncio.QueueFull.
+        The first task waiting to get an item, if any, is woken up."""
+        if self.is_full():
+            raise asyncio.QueueFull
+        handle = self.queue.enqueue(item, priority)
+        self._wake_next(self.getters)
+        return handle
+
+    def get_nowait(self):
+        """Remove and return the front item without waiting, or raise
+        asyncio.QueueEmpty. The first task waiting for room, if any, is woken
+        up."""
+        if self.is_empty():
+            raise asyncio.QueueEmpty
+        item = self.queue.dequeue()
+        self._wake_next(self.putters)
+        return item
+
+    def cancel(self, handle):
+        """Remove and return the item with the given handle in O(1) time."""
+        item = self.queue.cancel(handle)
+        self._wake_next(self.putters)
+        return item
+
+    async def _wait(self, waiters, blocked):
+        """Wait on a new future added to the given queue of waiters until it
+        is woken up. If the waiting task is cancelled while it is no longer
+        blocked (according to the given blocked function), wake up the next
+        waiter instead, so the wake-up it was given is not lost."""
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            waiter.cancel()  # In case the waiter was not woken up yet
+            try:
+                waiters.remove(waiter)
+            except ValueError:
+                pass  # Already removed by _wake_next
+            if not blocked() and not waiter.cancelled():
+                self._wake_next(waiters)
+            raise
+
+    @staticmethod
+    def _wake_next(waiters):
+        """Wake up the first task in the given queue of waiters that is still
+        waiting, if any."""
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
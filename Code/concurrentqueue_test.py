@@ -0,0 +1,191 @@
+#!python
+
+from concurrentqueue import ThreadSafePriorityQueue, AsyncPriorityQueue
+import asyncio
+import queue
+import threading
+import unittest
+import warnings
+
+
+class TestThreadSafePriorityQueue(unittest.TestCase):
+    def test_put_and_get(self):
+        pq = ThreadSafePriorityQueue()
+        pq.put('C', 3)
+        pq.put('A', 1)
+        handle = pq.put('B', 2)
+        assert pq.size() == 3
+        pq.update_priority(handle, 0)
+        assert pq.get() == 'B'
+        assert pq.get_nowait() == 'A'
+        assert pq.get(timeout=0.01) == 'C'
+        assert pq.is_empty() is True
+
+    def test_get_timeout_on_empty_queue(self):
+        pq = ThreadSafePriorityQueue()
+        with self.assertRaises(queue.Empty):
+            pq.get_nowait()
+        with self.assertRaises(queue.Empty):
+            pq.get(timeout=0.01)
+
+    def test_put_timeout_on_full_queue(self):
+        pq = ThreadSafePriorityQueue(maxsize=2)
+        pq.put('A', 1)
+        handle = pq.put('B', 2)
+        assert pq.is_full() is True
+        with self.assertRaises(queue.Full):
+            pq.put_nowait('C', 3)
+        with self.assertRaises(queue.Full):
+            pq.put('C', 3, timeout=0.01)
+        assert pq.cancel(handle) == 'B'
+        pq.put_nowait('C', 3)
+        assert pq.size() == 2
+
+    def test_blocked_get_is_woken_by_put(self):
+        pq = ThreadSafePriorityQueue()
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(pq.get(timeout=5)))
+        consumer.start()
+        pq.put('A', 1)
+        consumer.join()
+        assert results == ['A']
+
+    def test_many_producers_and_consumers(self):
+        pq = ThreadSafePriorityQueue(maxsize=10)
+        results = []
+        results_lock = threading.Lock()
+
+        def produce(start):
+            for number in range(start, start + 250):
+                pq.put(number, number)
+
+        def consume():
+            for _ in range(250):
+                item = pq.get(timeout=5)
+                with results_lock:
+                    results.append(item)
+
+        threads = [threading.Thread(target=produce, args=(start,))
+                   for start in range(0, 1000, 250)]
+        threads += [threading.Thread(target=consume) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(results) == list(range(1000))
+        assert pq.is_empty() is True
+
+
+class TestAsyncPriorityQueue(unittest.TestCase):
+    def test_put_and_get(self):
+        async def run():
+            pq = AsyncPriorityQueue()
+            await pq.put('C', 3)
+            await pq.put('A', 1)
+            pq.put_nowait('B', 2)
+            return [await pq.get(), pq.get_nowait(), await pq.get()]
+
+        assert asyncio.run(run()) == ['A', 'B', 'C']
+
+    def test_nowait_errors(self):
+        async def run():
+            pq = AsyncPriorityQueue(maxsize=1)
+            with self.assertRaises(asyncio.QueueEmpty):
+                pq.get_nowait()
+            pq.put_nowait('A', 1)
+            with self.assertRaises(asyncio.QueueFull):
+                pq.put_nowait('B', 2)
+
+        asyncio.run(run())
+
+    def test_get_waits_for_put(self):
+        async def run():
+            pq = AsyncPriorityQueue()
+            getter = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            assert not getter.done()
+            pq.put_nowait('A', 1)
+            return await asyncio.wait_for(getter, 5)
+
+        assert asyncio.run(run()) == 'A'
+
+    def test_put_waits_for_room(self):
+        async def run():
+            pq = AsyncPriorityQueue(maxsize=1)
+            await pq.put('A', 1)
+            putter = asyncio.ensure_future(pq.put('B', 2))
+            await asyncio.sleep(0)
+            assert not putter.done()
+            assert await pq.get() == 'A'
+            await asyncio.wait_for(putter, 5)
+            return await pq.get()
+
+        assert asyncio.run(run()) == 'B'
+
+    def test_nowait_outside_event_loop(self):
+        pq = AsyncPriorityQueue()
+
+        async def run():
+            pq.put_nowait('x', 1)
+            return await pq.get()
+
+        assert asyncio.run(run()) == 'x'
+        # No event loop is running, and no wake-up task may be left behind
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            handle = pq.put_nowait('y', 2)
+            pq.put_nowait('z', 3)
+            assert pq.cancel(handle) == 'y'
+            assert pq.get_nowait() == 'z'
+
+    def test_cancel_wakes_putter(self):
+        async def run():
+            pq = AsyncPriorityQueue(maxsize=1)
+            handle = await pq.put('A', 1)
+            putter = asyncio.ensure_future(pq.put('B', 2))
+            await asyncio.sleep(0)
+            assert not putter.done()
+            pq.cancel(handle)
+            await asyncio.wait_for(putter, 5)
+            return pq.get_nowait()
+
+        assert asyncio.run(run()) == 'B'
+
+    def test_cancelled_getter_passes_on_wake_up(self):
+        async def run():
+            pq = AsyncPriorityQueue()
+            first = asyncio.ensure_future(pq.get())
+            second = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            # Wake up the first getter, but cancel it before it runs
+            pq.put_nowait('A', 1)
+            first.cancel()
+            result = await asyncio.wait_for(second, 5)
+            assert first.cancelled()
+            assert not pq.getters
+            return result
+
+        assert asyncio.run(run()) == 'A'
+
+    def test_many_producers_and_consumers(self):
+        async def run():
+            pq = AsyncPriorityQueue(maxsize=5)
+            results = []
+
+            async def produce(start):
+                for number in range(start, start + 100):
+                    await pq.put(number, number)
+
+            async def consume():
+                for _ in range(100):
+                    results.append(await pq.get())
+
+            await asyncio.gather(*[produce(start) for start in range(0, 400, 100)],
+                                 *[consume() for _ in range(4)])
+            return results
+
+        assert sorted(asyncio.run(run())) == list(range(400))
+
+
+if __name__ == '__main__':
+    unittest.main()
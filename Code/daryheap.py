@@ -0,0 +1,94 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class DaryMinHeap(BinaryMinHeap):
+    """DaryMinHeap: a partially ordered collection with the same methods as
+    BinaryMinHeap, but stored as an implicit complete d-ary tree in which each
+    node has up to d children: the children of the node at index i are at
+    indexes d*i+1 through d*i+d. A larger arity makes the tree shallower, with
+    height log_d n instead of log_2 n, so inserts bubble up fewer levels, and
+    all children of a node are adjacent in the array. Deleting the minimum
+    compares up to d children per level, so it costs O(d log_d n)."""
+
+    def __init__(self, items=None, d=4):
+        """Initialize this heap with the given arity (number of children per
+        node, at least 2) and insert the given items, if any."""
+        if d < 2:
+            raise ValueError('Heap arity must be at least 2: {}'.format(d))
+        self.d = d
+        super().__init__(items)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        return 'DaryMinHeap({}, d={})'.format(self.items, self.d)
+
+    def _heapify(self):
+        """Rearrange the items so the heap ordering property is true everywhere
+        by bubbling down each non-leaf item from the last one up to the root.
+        Running time: O(n)."""
+        last_parent = (len(self.items) - 2) // self.d
+        for index in reversed(range(last_parent + 1)):
+            self._bubble_down(index)
+
+    def _bubble_up(self, index):
+        """Ensure the heap ordering property is true above the given index by
+        shifting larger parent items down into the hole left by the item.
+        Running time: O(log_d n) comparisons."""
+        items = self.items
+        d = self.d
+        item = items[index]
+        while index > 0:
+            parent_index = (index - 1) // d
+            parent_item = items[parent_index]
+            if not item < parent_item:
+                break
+            items[index] = parent_item
+            index = parent_index
+        items[index] = item
+
+    def _bubble_down(self, index):
+        """Ensure the heap ordering property is true below the given index by
+        shifting the smallest child item up into the hole left by the item.
+        Running time: O(d log_d n) comparisons."""
+        items = self.items
+        d = self.d
+        size = len(items)
+        item = items[index]
+        first_child = d * index + 1
+        while first_child < size:
+            # Find the smallest of up to d adjacent child items
+            child_index = first_child
+            child_item = items[first_child]
+            for other_index in range(first_child + 1, min(first_child + d, size)):
+                other_item = items[other_index]
+                if other_item < child_item:
+                    child_index = other_index
+                    child_item = other_item
+            if not child_item < item:
+                break
+            items[index] = child_item
+            index = child_index
+            first_child = d * index + 1
+        items[index] = item
+
+    def _parent_index(self, index):
+        """Return the parent index of the item at the given index."""
+        if index <= 0:
+            raise IndexError('Heap index {} has no parent index'.format(index))
+        return (index - 1) // self.d
+
+    def _left_child_index(self, index):
+        """Return the index of the leftmost (first) of up to d children of the
+        item at the given index."""
+        return self.d * index + 1
+
+    def _right_child_index(self, index):
+        """Return the index of the rightmost (last) of up to d children of the
+        item at the given index."""
+        return self.d * index + self.d
+
+    def _child_indexes(self, index):
+        """Return the range of child indexes of the item at the given index."""
+        return range(self.d * index + 1, self.d * index + self.d + 1)
@@ -0,0 +1,70 @@
+#!python
+
+from daryheap import DaryMinHeap
+import random
+import unittest
+
+
+class TestDaryMinHeap(unittest.TestCase):
+    def assert_heap_order(self, heap):
+        for index in range(1, heap.size()):
+            assert heap.items[heap._parent_index(index)] <= heap.items[index]
+
+    def test_invalid_arity(self):
+        with self.assertRaises(ValueError):
+            DaryMinHeap(d=1)
+
+    def test_get_min_on_empty_heap(self):
+        heap = DaryMinHeap()
+        assert heap.size() == 0
+        with self.assertRaises(ValueError):
+            heap.get_min()
+        with self.assertRaises(ValueError):
+            heap.delete_min()
+
+    def test_child_and_parent_index(self):
+        heap = DaryMinHeap(d=4)
+        assert list(heap._child_indexes(0)) == [1, 2, 3, 4]
+        assert list(heap._child_indexes(1)) == [5, 6, 7, 8]
+        for index in range(1, 100):
+            assert index in heap._child_indexes(heap._parent_index(index))
+        with self.assertRaises(IndexError):
+            heap._parent_index(0)
+        assert heap._left_child_index(0) == 1
+        assert heap._right_child_index(0) == 4
+        assert heap._left_child_index(2) == 9
+        assert heap._right_child_index(2) == 12
+        for d in [2, 3, 4, 8]:
+            heap = DaryMinHeap(d=d)
+            for index in range(50):
+                children = heap._child_indexes(index)
+                assert heap._left_child_index(index) == children[0]
+                assert heap._right_child_index(index) == children[-1]
+
+    def test_insert_and_delete_many_random_items(self):
+        for d in [2, 3, 4, 8]:
+            heap = DaryMinHeap(d=d)
+            items = random.sample(range(1000), 100)
+            for index, item in enumerate(items):
+                heap.insert(item)
+                assert heap.size() == index + 1
+                assert heap.get_min() == min(items[: index + 1])
+                self.assert_heap_order(heap)
+            for item in sorted(items):
+                assert heap.delete_min() == item
+            assert heap.size() == 0
+
+    def test_init_and_replace_min(self):
+        for d in [2, 4, 8]:
+            items = [random.randrange(50) for _ in range(100)]
+            heap = DaryMinHeap(items, d=d)
+            self.assert_heap_order(heap)
+            assert heap.replace_min(1000) == min(items)
+            items.remove(min(items))
+            items.append(1000)
+            self.assert_heap_order(heap)
+            assert [heap.delete_min() for _ in items] == sorted(items)
+
+
+if __name__ == '__main__':
+    unittest.main()
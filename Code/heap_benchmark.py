@@ -0,0 +1,298 @@
+#!python
+
+import heapq
+import random
+import sys
+import time
+from functools import partial
+
+from binaryheap import BinaryMinHeap
+from daryheap import DaryMinHeap
+from pairingheap import PairingHeap
+
+
+class RecursiveBinaryMinHeap(BinaryMinHeap):
+    """RecursiveBinaryMinHeap: the original BinaryMinHeap implementation with
+    recursive, range-checked, swap-based bubble up and bubble down methods and
+    one insert per item to build the heap, kept here for benchmark baselines."""
+
+    def __init__(self, items=None):
+        """Initialize this heap and insert the given items, if any."""
+        self.items = []
+        if items:
+            for item in items:
+                self.insert(item)
+
+    def _bubble_up(self, index):
+        """Recursively swap the item at the given index with its parent."""
+        if index == 0:
+            return
+        if not (0 <= index <= self._last_index()):
+            raise IndexError('Invalid index: {}'.format(index))
+        parent_index = self._parent_index(index)
+        if self.items[index] < self.items[parent_index]:
+            self.items[index], self.items[parent_index] = \
+                self.items[parent_index], self.items[index]
+            self._bubble_up(parent_index)
+
+    def _bubble_down(self, index):
+        """Recursively swap the item at the given index with its min child."""
+        if not (0 <= index <= self._last_index()):
+            raise IndexError('Invalid index: {}'.format(index))
+        left_index = self._left_child_index(index)
+        right_index = self._right_child_index(index)
+        if left_index > self._last_index():
+            return
+        if right_index <= self._last_index() and \
+                not self.items[left_index] < self.items[right_index]:
+            child_index = right_index
+        else:
+            child_index = left_index
+        if self.items[index] > self.items[child_index]:
+            self.items[index], self.items[child_index] = \
+                self.items[child_index], self.items[index]
+            self._bubble_down(child_index)
+
+
+class HeapqMinHeap(object):
+    """HeapqMinHeap: a thin wrapper with BinaryMinHeap's interface around the
+    standard library's heapq functions, which are implemented in C."""
+
+    def __init__(self, items=None):
+        """Initialize this heap and heapify the given items, if any."""
+        self.items = list(items) if items else []
+        heapq.heapify(self.items)
+
+    def size(self):
+        """Return the number of items in this heap."""
+        return len(self.items)
+
+    def insert(self, item):
+        """Insert the given item into this heap."""
+        heapq.heappush(self.items, item)
+
+    def get_min(self):
+        """Return the minimum item at the root of this heap."""
+        return self.items[0]
+
+    def delete_min(self):
+        """Remove and return the minimum item at the root of this heap."""
+        return heapq.heappop(self.items)
+
+    def replace_min(self, item):
+        """Remove and return the minimum item and insert the given item."""
+        return heapq.heapreplace(self.items, item)
+
+    def meld(self, other):
+        """Move all items from the given other heap into this heap."""
+        self.items.extend(other.items)
+        heapq.heapify(self.items)
+        other.items = []
+
+
+# Heap classes to compare, by name
+HEAPS = {
+    'recursive': RecursiveBinaryMinHeap,
+    'binary': BinaryMinHeap,
+    'heapq': HeapqMinHeap,
+    'dary4': partial(DaryMinHeap, d=4),
+    'dary8': partial(DaryMinHeap, d=8),
+    'pairing': PairingHeap,
+}
+
+
+def build(heap_class, data):
+    """Build a heap from all of the given data at once."""
+    heap_class(data)
+
+
+def insert_all(heap_class, data):
+    """Insert each of the given data items into an empty heap."""
+    heap = heap_class()
+    for item in data:
+        heap.insert(item)
+
+
+def heap_sort(heap_class, data):
+    """Build a heap from the given data, then delete every item in order."""
+    heap = heap_class(data)
+    for _ in range(heap.size()):
+        heap.delete_min()
+
+
+def replace_all(heap_class, data):
+    """Build a heap from the first half of the given data, then replace the
+    minimum item with each item from the second half, as in a scheduler."""
+    half = len(data) // 2
+    heap = heap_class(data[:half])
+    for item in data[half:]:
+        heap.replace_min(item)
+
+
+def insert_heavy(heap_class, data):
+    """Insert each of the given data items into an empty heap, deleting the
+    minimum item after every fourth insert, so the heap keeps growing."""
+    heap = heap_class()
+    for index, item in enumerate(data):
+        heap.insert(item)
+        if index % 4 == 3:
+            heap.delete_min()
+
+
+def meld_mixed(heap_class, data, shard_size=64):
+    """Split the given data into shards, as a shard scheduler would receive
+    them, and for each shard build a heap, meld it into the main heap, insert
+    a few more items and delete a few minimum items."""
+    heap = heap_class()
+    for start in range(0, len(data), shard_size):
+        shard = data[start:start + shard_size]
+        heap.meld(heap_class(shard))
+        for item in shard[:4]:
+            heap.insert(item)
+        for _ in range(8):
+            heap.delete_min()
+
+
+# Workloads to run with each heap class, by name
+WORKLOADS = {
+    'build': build,
+    'insert': insert_all,
+    'heap_sort': heap_sort,
+    'replace': replace_all,
+    'insert_heavy': insert_heavy,
+    'meld_mixed': meld_mixed,
+}
+
+
+def insert_loop(heap, data):
+    """Insert each of the given data items into the given heap."""
+    for item in data:
+        heap.insert(item)
+
+
+def insert_bulk(heap, data):
+    """Insert all of the given data items into the given heap at once."""
+    heap.insert_many(data)
+
+
+def pop_loop(heap, data):
+    """Delete the minimum item from the given heap once per data item."""
+    for _ in data:
+        heap.delete_min()
+
+
+def pop_bulk(heap, data):
+    """Delete as many minimum items from the given heap as data items."""
+    heap.pop_many(len(data))
+
+
+def peek_loop(heap, data):
+    """Find as many minimum items as data items by copying the given heap and
+    deleting them from the copy."""
+    copy = BinaryMinHeap()
+    copy.items = list(heap.items)
+    for _ in data:
+        copy.delete_min()
+
+
+def peek_bulk(heap, data):
+    """Find as many minimum items as data items without changing the heap."""
+    heap.nsmallest(len(data))
+
+
+def meld_loop(heap, data):
+    """Insert each of the given data items from another heap into the heap."""
+    other = BinaryMinHeap(data)
+    for item in other.items:
+        heap.insert(item)
+
+
+def meld_bulk(heap, data):
+    """Meld another heap of the given data items into the given heap."""
+    heap.meld(BinaryMinHeap(data))
+
+
+# Pairs of single-item and bulk workloads to compare, by name
+BULK_WORKLOADS = {
+    'insert_many': (insert_loop, insert_bulk),
+    'pop_many': (pop_loop, pop_bulk),
+    'nsmallest': (peek_loop, peek_bulk),
+    'meld': (meld_loop, meld_bulk),
+}
+
+
+def time_workload(workload, heap_class, data, repeat=3):
+    """Return the best time in seconds of the given number of repeated runs of
+    the given workload with the given heap class and data."""
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        workload(heap_class, data)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def run_benchmarks(sizes, heaps=HEAPS, workloads=WORKLOADS, repeat=3):
+    """Time each workload with each heap class on lists of random floats of
+    each size and print a table of results, one row per workload and size."""
+    print('{:<12} {:>10}'.format('workload', 'size') +
+          ''.join(' {:>12}'.format(name) for name in heaps))
+    for workload_name, workload in workloads.items():
+        for size in sizes:
+            data = [random.random() for _ in range(size)]
+            row = '{:<12} {:>10}'.format(workload_name, size)
+            for heap_class in heaps.values():
+                seconds = time_workload(workload, heap_class, data, repeat)
+                row += ' {:>12.6f}'.format(seconds)
+            print(row)
+
+
+def run_bulk_benchmarks(sizes, workloads=BULK_WORKLOADS, repeat=3):
+    """Time each pair of single-item and bulk workloads on a heap of random
+    floats of each size with batches of a tenth, half and all of its size,
+    and print a table of results, one row per workload, size and batch."""
+    print('{:<12} {:>10} {:>10} {:>12} {:>12}'.format(
+        'workload', 'size', 'batch', 'loop', 'bulk'))
+    for workload_name, (loop, bulk) in workloads.items():
+        for size in sizes:
+            for batch_size in [size // 10, size // 2, size]:
+                data = [random.random() for _ in range(size)]
+                batch = [random.random() for _ in range(batch_size)]
+                row = '{:<12} {:>10} {:>10}'.format(workload_name, size, batch_size)
+                for workload in [loop, bulk]:
+                    best = float('inf')
+                    for _ in range(repeat):
+                        heap = BinaryMinHeap(data)
+                        start_time = time.perf_counter()
+                        workload(heap, batch)
+                        best = min(best, time.perf_counter() - start_time)
+                    row += ' {:>12.6f}'.format(best)
+                print(row)
+
+
+def main():
+    """Read command-line arguments and benchmark heap implementations."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} [--bulk] size [size ...]'.format(script))
+        print('Benchmark heap workloads on random lists of the given sizes')
+        print('With --bulk, compare bulk heap methods to single-item loops')
+        print('Example: {} 1000 10000 100000'.format(script))
+        return
+    bulk = args[0] == '--bulk'
+    if bulk:
+        args = args[1:]
+    try:
+        sizes = [int(arg) for arg in args]
+    except ValueError:
+        print('Integer required for `size` command-line arguments')
+        return
+    if bulk:
+        run_bulk_benchmarks(sizes)
+    else:
+        run_benchmarks(sizes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class IndexedMinHeap(BinaryMinHeap):
+    """IndexedMinHeap: a binary min heap of handles ordered by priority, with
+    efficient methods to change the priority of any handle already in the heap
+    or to remove it. Priorities are stored in the items array exactly as in
+    BinaryMinHeap, with the handles in a parallel array and a dictionary that
+    maps each handle to its current index, which is updated on every move.
+    Handles must be hashable and unique, and they are never compared."""
+
+    def __init__(self, pairs=None):
+        """Initialize this heap and insert the given (handle, priority) pairs,
+        if any. Running time: O(n) to build the heap from n given pairs."""
+        # Parallel arrays of priorities (compared) and handles (not compared)
+        self.items = []
+        self.handles = []
+        # Map each handle to its current index in the arrays
+        self.positions = {}
+        if pairs:
+            self.insert_many(pairs)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        return 'IndexedMinHeap({})'.format(list(zip(self.handles, self.items)))
+
+    def __contains__(self, handle):
+        """Return True if the given handle is in this heap. Running time: O(1)."""
+        return handle in self.positions
+
+    def priority(self, handle):
+        """Return the priority of the given handle, or raise KeyError if the
+        handle is not in this heap. Running time: O(1)."""
+        return self.items[self.positions[handle]]
+
+    def insert(self, handle, priority):
+        """Insert the given handle into this heap with the given priority, or
+        raise ValueError if the handle is already in this heap.
+        Running time: O(log n) to bubble up from the last leaf."""
+        if handle in self.positions:
+            raise ValueError('Handle is already in heap: {!r}'.format(handle))
+        self.positions[handle] = len(self.items)
+        self.handles.append(handle)
+        self.items.append(priority)
+        self._bubble_up(len(self.items) - 1)
+
+    def get_min(self):
+        """Return the handle with the minimum priority at the root of this heap.
+        Running time: O(1)."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        return self.handles[0]
+
+    def delete_min(self):
+        """Remove and return the handle with the minimum priority at the root
+        of this heap. Running time: O(log n) to bubble down to a leaf."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        return self._remove_at(0)
+
+    def replace_min(self, handle, priority):
+        """Remove and return the handle with the minimum priority at the root
+        of this heap, and insert the given handle with the given priority.
+        Running time: O(log n) for a single bubble down from the root."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_handle = self.handles[0]
+        if handle in self.positions and handle != min_handle:
+            raise ValueError('Handle is already in heap: {!r}'.format(handle))
+        del self.positions[min_handle]
+        self.positions[handle] = 0
+        self.handles[0] = handle
+        self.items[0] = priority
+        self._bubble_down(0)
+        return min_handle
+
+    def insert_many(self, pairs):
+        """Insert all of the given (handle, priority) pairs into this heap,
+        rebuilding the whole heap at once if there are at least as many new
+        pairs as pairs already in the heap. Raise ValueError without changing
+        this heap if any handle is already in it or is given more than once.
+        Running time: O(min(k log n, n + k)) for k new pairs."""
+        pairs = list(pairs)
+        new_handles = set()
+        for handle, _ in pairs:
+            if handle in self.positions or handle in new_handles:
+                raise ValueError('Handle is already in heap: {!r}'.format(handle))
+            new_handles.add(handle)
+        if len(pairs) < len(self.items):
+            for handle, priority in pairs:
+                self.insert(handle, priority)
+            return
+        for handle, priority in pairs:
+            self.positions[handle] = len(self.items)
+            self.handles.append(handle)
+            self.items.append(priority)
+        if len(self.items) > 1:
+            self._heapify()
+
+    def pop_many(self, k):
+        """Remove and return a list of the k handles with minimum priorities in
+        this heap in sorted order, or all handles if it has fewer than k.
+        Running time: O(k log n)."""
+        return [self.delete_min() for _ in range(min(k, self.size()))]
+
+    def nsmallest(self, k):
+        """Return a list of the k handles with minimum priorities in this heap
+        in sorted order without changing it. Running time: O(k log k)."""
+        return [self.handles[index] for index in self._nsmallest_indexes(k)]
+
+    def meld(self, other):
+        """Move all (handle, priority) pairs from the given other indexed heap
+        into this heap, leaving the other heap empty. Raise ValueError without
+        changing either heap if the heaps share a handle or are the same heap.
+        Running time: O(n + m) for heaps of n and m pairs."""
+        if other is self:
+            raise ValueError('Cannot meld a heap with itself')
+        self.insert_many(zip(other.handles, other.items))
+        other.items = []
+        other.handles = []
+        other.positions = {}
+
+    def decrease_key(self, handle, priority):
+        """Lower the priority of the given handle to the given priority, or
+        raise ValueError if it is greater than the handle's current priority.
+        Running time: O(log n) to bubble up toward the root."""
+        index = self.positions[handle]
+        if self.items[index] < priority:
+            raise ValueError('New priority {!r} is greater than current priority {!r}'
+                             .format(priority, self.items[index]))
+        self.items[index] = priority
+        self._bubble_up(index)
+
+    def increase_key(self, handle, priority):
+        """Raise the priority of the given handle to the given priority, or
+        raise ValueError if it is less than the handle's current priority.
+        Running time: O(log n) to bubble down toward a leaf."""
+        index = self.positions[handle]
+        if priority < self.items[index]:
+            raise ValueError('New priority {!r} is less than current priority {!r}'
+                             .format(priority, self.items[index]))
+        self.items[index] = priority
+        self._bubble_down(index)
+
+    def update(self, handle, priority):
+        """Change the priority of the given handle to the given priority, in
+        either direction. Running time: O(log n)."""
+        index = self.positions[handle]
+        old_priority = self.items[index]
+        self.items[index] = priority
+        if priority < old_priority:
+            self._bubble_up(index)
+        else:
+            self._bubble_down(index)
+
+    def remove(self, handle):
+        """Remove the given handle from this heap and return its priority, or
+        raise KeyError if the handle is not in this heap.
+        Running time: O(log n) to restore the heap ordering property."""
+        index = self.positions[handle]
+        priority = self.items[index]
+        self._remove_at(index)
+        return priority
+
+    def _remove_at(self, index):
+        """Remove and return the handle at the given index by moving the last
+        item into its place and bubbling that item up or down as needed."""
+        handle = self.handles[index]
+        del self.positions[handle]
+        last_handle = self.handles.pop()
+        last_item = self.items.pop()
+        if index < len(self.items):
+            self.handles[index] = last_handle
+            self.items[index] = last_item
+            self.positions[last_handle] = index
+            if index > 0 and last_item < self.items[(index - 1) >> 1]:
+                self._bubble_up(index)
+            else:
+                self._bubble_down(index)
+        return handle
+
+    def _bubble_up(self, index):
+        """Ensure the heap ordering property is true above the given index by
+        shifting larger parent items down into the hole left by the item, and
+        update the positions of all moved handles.
+        Running time: O(log n)."""
+        items = self.items
+        handles = self.handles
+        positions = self.positions
+        item = items[index]
+        handle = handles[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent_item = items[parent_index]
+            if not item < parent_item:
+                break
+            parent_handle = handles[parent_index]
+            items[index] = parent_item
+            handles[index] = parent_handle
+            positions[parent_handle] = index
+            index = parent_index
+        items[index] = item
+        handles[index] = handle
+        positions[handle] = index
+
+    def _bubble_down(self, index):
+        """Ensure the heap ordering property is true below the given index by
+        shifting smaller child items up into the hole left by the item, and
+        update the positions of all moved handles.
+        Running time: O(log n)."""
+        items = self.items
+        handles = self.handles
+        positions = self.positions
+        size = len(items)
+        item = items[index]
+        handle = handles[index]
+        child_index = (index << 1) + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and not items[child_index] < items[right_index]:
+                child_index = right_index
+            child_item = items[child_index]
+            if not child_item < item:
+                break
+            child_handle = handles[child_index]
+            items[index] = child_item
+            handles[index] = child_handle
+            positions[child_handle] = index
+            index = child_index
+            child_index = (index << 1) + 1
+        items[index] = item
+        handles[index] = handle
+        positions[handle] = index
@@ -0,0 +1,128 @@
+#!python
+
+from indexedheap import IndexedMinHeap
+import random
+import unittest
+
+
+class TestIndexedMinHeap(unittest.TestCase):
+    def assert_valid(self, heap):
+        """Verify the heap ordering property and the positions map."""
+        assert len(heap.positions) == heap.size() == len(heap.handles)
+        for index, handle in enumerate(heap.handles):
+            assert heap.positions[handle] == index
+            if index > 0:
+                assert heap.items[(index - 1) >> 1] <= heap.items[index]
+
+    def test_empty_heap(self):
+        heap = IndexedMinHeap()
+        assert heap.size() == 0
+        assert 'A' not in heap
+        with self.assertRaises(ValueError):
+            heap.get_min()
+        with self.assertRaises(ValueError):
+            heap.delete_min()
+        with self.assertRaises(KeyError):
+            heap.remove('A')
+
+    def test_insert_and_delete(self):
+        heap = IndexedMinHeap([('A', 5), ('B', 3)])
+        heap.insert('C', 4)
+        heap.insert('D', 1)
+        with self.assertRaises(ValueError):
+            heap.insert('C', 2)
+        self.assert_valid(heap)
+        assert 'C' in heap
+        assert heap.priority('C') == 4
+        assert heap.get_min() == 'D'
+        assert [heap.delete_min() for _ in range(4)] == ['D', 'B', 'C', 'A']
+
+    def test_decrease_and_increase_key(self):
+        heap = IndexedMinHeap([('A', 5), ('B', 3), ('C', 4)])
+        heap.decrease_key('A', 1)
+        assert heap.get_min() == 'A'
+        with self.assertRaises(ValueError):
+            heap.decrease_key('A', 2)
+        heap.increase_key('A', 10)
+        assert heap.get_min() == 'B'
+        with self.assertRaises(ValueError):
+            heap.increase_key('A', 9)
+        heap.update('C', 0)
+        heap.update('B', 20)
+        self.assert_valid(heap)
+        assert [heap.delete_min() for _ in range(3)] == ['C', 'A', 'B']
+
+    def test_replace_min(self):
+        heap = IndexedMinHeap([('A', 5), ('B', 3), ('C', 4)])
+        assert heap.replace_min('D', 6) == 'B'
+        assert 'B' not in heap
+        with self.assertRaises(ValueError):
+            heap.replace_min('A', 1)
+        self.assert_valid(heap)
+        assert [heap.delete_min() for _ in range(3)] == ['C', 'A', 'D']
+
+    def test_bulk_operations(self):
+        heap = IndexedMinHeap([('A', 5), ('B', 3), ('C', 4)])
+        heap.insert_many([('D', 1)])
+        heap.insert_many([('E', 6), ('F', 0), ('G', 2), ('H', 7)])
+        with self.assertRaises(ValueError):
+            heap.insert_many([('A', 1)])
+        self.assert_valid(heap)
+        assert heap.nsmallest(3) == ['F', 'D', 'G']
+        assert heap.size() == 8
+        other = IndexedMinHeap([('X', -1), ('Y', 10)])
+        heap.meld(other)
+        assert other.size() == 0
+        assert 'X' not in other
+        self.assert_valid(heap)
+        assert heap.pop_many(4) == ['X', 'F', 'D', 'G']
+        assert heap.pop_many(10) == ['B', 'C', 'A', 'E', 'H', 'Y']
+
+    def test_bulk_errors_leave_heap_unchanged(self):
+        heap = IndexedMinHeap([('x', 10)])
+        # Duplicate of a handle in the heap, or within the batch
+        for pairs in [[('y', 1), ('x', 3)], [('y', 1), ('z', 2), ('y', 0)]]:
+            with self.assertRaises(ValueError):
+                heap.insert_many(pairs)
+            self.assert_valid(heap)
+            assert heap.size() == 1 and heap.get_min() == 'x'
+            assert 'y' not in heap
+        other = IndexedMinHeap([('y', 1), ('x', 3)])
+        with self.assertRaises(ValueError):
+            heap.meld(other)
+        self.assert_valid(heap)
+        self.assert_valid(other)
+        assert heap.size() == 1 and other.size() == 2
+        with self.assertRaises(ValueError):
+            heap.meld(heap)
+        assert heap.pop_many(2) == ['x']
+
+    def test_random_operations(self):
+        heap = IndexedMinHeap()
+        expected = {}
+        for handle in range(500):
+            operation = random.random()
+            if operation < 0.5 or not expected:
+                priority = random.randrange(100)
+                heap.insert(handle, priority)
+                expected[handle] = priority
+            elif operation < 0.8:
+                target = random.choice(list(expected))
+                priority = random.randrange(100)
+                heap.update(target, priority)
+                expected[target] = priority
+            elif operation < 0.9:
+                target = random.choice(list(expected))
+                assert heap.remove(target) == expected.pop(target)
+            else:
+                min_priority = min(expected.values())
+                assert expected.pop(heap.delete_min()) == min_priority
+            self.assert_valid(heap)
+        while expected:
+            priority = heap.priority(heap.get_min())
+            assert priority == min(expected.values())
+            expected.pop(heap.delete_min())
+
+
+if __name__ == '__main__':
+    unittest.main()
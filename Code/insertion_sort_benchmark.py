@@ -0,0 +1,83 @@
+#!python
+
+import random
+import sys
+import time
+
+from sorting_iterative import insertion_sort, shell_sort
+from sorting_recursive import merge_sort, quick_sort
+
+
+def pop_insert_insertion_sort(items):
+    """Sort given items with the previous version of insertion_sort, which
+    scans linearly for each item's position and moves it there with pop and
+    insert, two O(n) list shifts per item."""
+    for j in range(1, len(items)):
+        old_index = j
+        while j >= 0:
+            if items[j-1] > items[old_index] and j >= 1:
+                j -= 1
+            else:
+                items.insert(j, items.pop(old_index))
+                break
+
+
+# Sort functions to compare, by name
+SORTS = {
+    'pop_insert': pop_insert_insertion_sort,
+    'binary_insert': insertion_sort,
+    'shell_ciura': lambda items: shell_sort(items, 'ciura'),
+    'shell_tokuda': lambda items: shell_sort(items, 'tokuda'),
+    'merge_sort': merge_sort,
+    'quick_sort': quick_sort,
+}
+
+
+def time_sort(sort, size, min_seconds=0.2):
+    """Return the average time in seconds for the given sort function to sort
+    a list of the given number of random floats, repeating sorts of new lists
+    until at least min_seconds have passed in total."""
+    total = 0.0
+    repeats = 0
+    while total < min_seconds:
+        items = [random.random() for _ in range(size)]
+        start_time = time.perf_counter()
+        sort(items)
+        total += time.perf_counter() - start_time
+        repeats += 1
+    return total / repeats
+
+
+def run_benchmarks(max_size):
+    """Time each sort on lists of 8, 16, 32, ... up to the given number of
+    items, and print a table of average times in microseconds per sort."""
+    print('{:>8}'.format('size') + ''.join(' {:>13}'.format(name) for name in SORTS))
+    size = 8
+    while size <= max_size:
+        row = '{:>8}'.format(size)
+        for sort in SORTS.values():
+            row += ' {:>13.1f}'.format(time_sort(sort, size) * 1e6)
+        print(row)
+        size *= 2
+
+
+def main():
+    """Read command-line arguments and benchmark insertion and Shell sorts."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} max_size'.format(script))
+        print('Benchmark insertion sorts and Shell sorts against merge sort and')
+        print('    quick sort on random lists of 8 up to `max_size` items')
+        print('Example: {} 4096'.format(script))
+        return
+    try:
+        max_size = int(args[0])
+    except ValueError:
+        print('Integer required for `max_size` command-line argument')
+        return
+    run_benchmarks(max_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+#!python
+
+from array import array
+
+from binaryheap import BinaryMinHeap
+
+
+class MaxKey(object):
+    """MaxKey: a wrapper around a key that reverses its ordering, so a min
+    heap of wrapped keys behaves as a max heap of the original keys."""
+
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        """Initialize this wrapper with the given key."""
+        self.key = key
+
+    def __lt__(self, other):
+        """Return True if this key is greater than the other key."""
+        return other.key < self.key
+
+    def __eq__(self, other):
+        """Return True if this key is equal to the other key."""
+        return self.key == other.key
+
+    def __repr__(self):
+        """Return a code representation of this wrapper."""
+        return 'MaxKey({!r})'.format(self.key)
+
+
+class KeyedHeap(BinaryMinHeap):
+    """KeyedHeap: a binary heap that orders items by a key computed once per
+    item when it is inserted, instead of comparing the items themselves. The
+    keys are stored in the items array exactly as in BinaryMinHeap and the
+    items are stored in a parallel values array that moves along with them.
+    With max_heap=True the heap keeps its maximum key at the root instead.
+    With typecode='d' (floats) or typecode='q' (64-bit integers) the keys are
+    stored unboxed in a contiguous array.array instead of a list, which uses
+    8 bytes per key instead of a pointer to a separate Python number object.
+    If there is also no key function, the items are numbers too, so they are
+    stored in another array of the same typecode instead of a list."""
+
+    # Supported typecodes for numeric key arrays
+    TYPECODES = ('d', 'q')
+
+    def __init__(self, items=None, key=None, max_heap=False, typecode=None):
+        """Initialize this heap with the given key function, ordering and key
+        array typecode, and insert the given items, if any."""
+        if typecode is not None and typecode not in self.TYPECODES:
+            raise ValueError('Unsupported key typecode: {!r}'.format(typecode))
+        self.key = key
+        self.max_heap = max_heap
+        self.typecode = typecode
+        # Cached keys (compared) and items (not compared) in parallel arrays
+        self.items = self._new_keys()
+        self.values = self._new_values()
+        if items:
+            self.insert_many(items)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        return 'KeyedHeap({})'.format(list(self.values))
+
+    def _new_keys(self, keys=()):
+        """Return a new array of the given stored keys."""
+        if self.typecode is None:
+            return list(keys)
+        return array(self.typecode, keys)
+
+    def _new_values(self, values=()):
+        """Return a new array of the given items."""
+        if self.typecode is None or self.key is not None:
+            return list(values)
+        return array(self.typecode, values)
+
+    def _stored_key(self, item):
+        """Return the key to store for the given item, reversed if this heap
+        is a max heap: negated floats, bitwise inverted integers (which maps
+        the 64-bit range onto itself), or MaxKey wrappers otherwise."""
+        key = item if self.key is None else self.key(item)
+        if not self.max_heap:
+            return key
+        if self.typecode == 'd':
+            return -key
+        if self.typecode == 'q':
+            return ~key
+        return MaxKey(key)
+
+    def insert(self, item):
+        """Insert the given item into this heap. Running time: O(log n)."""
+        self.items.append(self._stored_key(item))
+        self.values.append(item)
+        self._bubble_up(len(self.items) - 1)
+
+    def get_min(self):
+        """Return the item with the minimum key (or maximum key, if this is a
+        max heap) at the root of this heap. Running time: O(1)."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        return self.values[0]
+
+    def delete_min(self):
+        """Remove and return the item with the minimum key (or maximum key, if
+        this is a max heap) at the root of this heap. Running time: O(log n)."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_value = self.values[0]
+        last_key = self.items.pop()
+        last_value = self.values.pop()
+        if len(self.items) > 0:
+            self.items[0] = last_key
+            self.values[0] = last_value
+            self._bubble_down(0)
+        return min_value
+
+    def replace_min(self, item):
+        """Remove and return the item at the root of this heap, and insert the
+        given item into this heap. Running time: O(log n)."""
+        if self.size() == 0:
+            raise ValueError('Heap is empty and has no minimum item')
+        min_value = self.values[0]
+        self.items[0] = self._stored_key(item)
+        self.values[0] = item
+        self._bubble_down(0)
+        return min_value
+
+    def insert_many(self, items):
+        """Insert all of the given items into this heap, rebuilding the whole
+        heap at once if there are at least as many new items as old items.
+        Running time: O(min(k log n, n + k)) for k new items."""
+        items = list(items)
+        self._insert_pairs([self._stored_key(item) for item in items], items)
+
+    def pop_many(self, k):
+        """Remove and return a list of the k items at the root of this heap in
+        order, or all items if this heap has fewer than k items.
+        Running time: O(k log n), or O(n log n) for large k."""
+        if k <= 0:
+            return []
+        if k * self.SORT_FRACTION >= len(self.items):
+            # A sorted array is a valid heap, so sort all items in place
+            order = self._sorted_indexes()
+            self.items = self._new_keys(self.items[index] for index in order[k:])
+            values = self.values
+            self.values = self._new_values(values[index] for index in order[k:])
+            return [values[index] for index in order[:k]]
+        return [self.delete_min() for _ in range(k)]
+
+    def nsmallest(self, k):
+        """Return a list of the k items at the root of this heap in order, or
+        all items if this heap has fewer than k items, without changing it.
+        Running time: O(k log k), or O(n log n) for large k."""
+        if k * self.SORT_FRACTION >= len(self.items):
+            indexes = self._sorted_indexes()[:k]
+        else:
+            indexes = self._nsmallest_indexes(k)
+        return [self.values[index] for index in indexes]
+
+    def meld(self, other):
+        """Move all items from the given other keyed heap, which must have the
+        same key function and ordering, into this heap, leaving it empty.
+        The other heap's cached keys are reused, not computed again. Raise
+        ValueError if the other heap is this heap.
+        Running time: O(n + m) for heaps of n and m items."""
+        if other is self:
+            raise ValueError('Cannot meld a heap with itself')
+        self._insert_pairs(other.items, other.values)
+        other.items = other._new_keys()
+        other.values = other._new_values()
+
+    def _insert_pairs(self, keys, values):
+        """Insert the given parallel lists of stored keys and items."""
+        if len(keys) >= len(self.items):
+            self.items.extend(keys)
+            self.values.extend(values)
+            if len(self.items) > 1:
+                self._heapify()
+        else:
+            for key, value in zip(keys, values):
+                self.items.append(key)
+                self.values.append(value)
+                self._bubble_up(len(self.items) - 1)
+
+    def _sorted_indexes(self):
+        """Return a list of all indexes sorted by their stored keys."""
+        return sorted(range(len(self.items)), key=self.items.__getitem__)
+
+    def _bubble_up(self, index):
+        """Ensure the heap ordering property is true above the given index by
+        shifting parent keys and items down into the hole left by the item.
+        Running time: O(log n)."""
+        items = self.items
+        values = self.values
+        item = items[index]
+        value = values[index]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent_item = items[parent_index]
+            if not item < parent_item:
+                break
+            items[index] = parent_item
+            values[index] = values[parent_index]
+            index = parent_index
+        items[index] = item
+        values[index] = value
+
+    def _bubble_down(self, index):
+        """Ensure the heap ordering property is true below the given index by
+        shifting child keys and items up into the hole left by the item.
+        Running time: O(log n)."""
+        items = self.items
+        values = self.values
+        size = len(items)
+        item = items[index]
+        value = values[index]
+        child_index = (index << 1) + 1
+        while child_index < size:
+            right_index = child_index + 1
+            if right_index < size and not items[child_index] < items[right_index]:
+                child_index = right_index
+            child_item = items[child_index]
+            if not child_item < item:
+                break
+            items[index] = child_item
+            values[index] = values[child_index]
+            index = child_index
+            child_index = (index << 1) + 1
+        items[index] = item
+        values[index] = value
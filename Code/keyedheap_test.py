@@ -0,0 +1,90 @@
+#!python
+
+from array import array
+from keyedheap import KeyedHeap
+import random
+import unittest
+
+
+class TestKeyedHeap(unittest.TestCase):
+    def test_empty_heap(self):
+        heap = KeyedHeap()
+        assert heap.size() == 0
+        with self.assertRaises(ValueError):
+            heap.get_min()
+        with self.assertRaises(ValueError):
+            heap.delete_min()
+        with self.assertRaises(ValueError):
+            KeyedHeap(typecode='i')
+
+    def test_key_function(self):
+        records = [{'name': name, 'age': age} for name, age in
+                   [('Ann', 35), ('Bob', 20), ('Cat', 41), ('Dan', 28)]]
+        heap = KeyedHeap(records, key=lambda record: record['age'])
+        assert heap.get_min()['name'] == 'Bob'
+        heap.insert({'name': 'Eve', 'age': 19})
+        assert heap.replace_min({'name': 'Fay', 'age': 50})['name'] == 'Eve'
+        names = [heap.delete_min()['name'] for _ in range(5)]
+        assert names == ['Bob', 'Dan', 'Ann', 'Cat', 'Fay']
+
+    def test_key_is_computed_once(self):
+        calls = []
+
+        def key(item):
+            calls.append(item)
+            return -item
+
+        items = random.sample(range(1000), 100)
+        heap = KeyedHeap(items, key=key)
+        heap.insert(5000)
+        assert [heap.delete_min() for _ in range(101)] == sorted(items + [5000], reverse=True)
+        assert len(calls) == 101
+
+    def test_max_heap(self):
+        words = ['pear', 'fig', 'apple', 'kiwi', 'banana']
+        heap = KeyedHeap(words, max_heap=True)
+        assert heap.get_min() == 'pear'
+        assert heap.pop_many(5) == sorted(words, reverse=True)
+        heap = KeyedHeap(words, key=len, max_heap=True)
+        assert heap.delete_min() == 'banana'
+        assert heap.nsmallest(1) == ['apple']
+        assert heap.pop_many(4)[-1] == 'fig'
+
+    def test_numeric_arrays(self):
+        floats = [random.random() for _ in range(500)]
+        for max_heap in [False, True]:
+            heap = KeyedHeap(floats, typecode='d', max_heap=max_heap)
+            assert isinstance(heap.items, array)
+            assert isinstance(heap.values, array)
+            assert heap.pop_many(10) == sorted(floats, reverse=max_heap)[:10]
+            assert heap.nsmallest(5) == sorted(floats, reverse=max_heap)[10:15]
+            expected = sorted(floats, reverse=max_heap)[10:]
+            assert [heap.delete_min() for _ in range(490)] == expected
+        ints = [random.randrange(-2**63, 2**63) for _ in range(500)]
+        for max_heap in [False, True]:
+            heap = KeyedHeap(ints, typecode='q', max_heap=max_heap)
+            assert heap.pop_many(500) == sorted(ints, reverse=max_heap)
+
+    def test_numeric_keys_with_items(self):
+        tasks = [('task{}'.format(index), random.random()) for index in range(200)]
+        heap = KeyedHeap(key=lambda task: task[1], typecode='d')
+        for task in tasks:
+            heap.insert(task)
+        assert isinstance(heap.items, array)
+        assert isinstance(heap.values, list)
+        assert heap.pop_many(200) == sorted(tasks, key=lambda task: task[1])
+
+    def test_meld(self):
+        heap1 = KeyedHeap([5, 1, 9], typecode='q')
+        heap2 = KeyedHeap([4, 8, 2, 7], typecode='q')
+        heap1.meld(heap2)
+        assert heap2.size() == 0
+        assert list(heap1.pop_many(7)) == [1, 2, 4, 5, 7, 8, 9]
+        heap1.insert_many([3, 1, 2])
+        with self.assertRaises(ValueError):
+            heap1.meld(heap1)
+        assert list(heap1.pop_many(3)) == [1, 2, 3]
+
+
+if __name__ == '__main__':
+    unittest.main()
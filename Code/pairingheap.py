@@ -0,0 +1,203 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class PairingHeapNode(object):
+    """PairingHeapNode: a node in a pairing heap that stores an item, its
+    leftmost child node, its next sibling node to the right, and its previous
+    node: the sibling to its left, or its parent if it is the leftmost child.
+    Slots keep each node small, as a heap may have millions of them."""
+
+    __slots__ = ('item', 'child', 'next', 'prev')
+
+    def __init__(self, item):
+        """Initialize this node with the given item and no links."""
+        self.item = item
+        self.child = None
+        self.next = None
+        self.prev = None
+
+    def __repr__(self):
+        """Return a code representation of this node."""
+        return 'PairingHeapNode({!r})'.format(self.item)
+
+
+class PairingHeap(object):
+    """PairingHeap: a partially ordered collection with the same methods as
+    BinaryMinHeap, stored as a tree of nodes where each node's item is less
+    than or equal to the items of all its children. Two heaps are combined
+    (linked) in O(1) time by making the root with the larger item the leftmost
+    child of the other, so inserting an item and melding two heaps are O(1).
+    Deleting the minimum item links the root's children together in two passes
+    (pairs from left to right, then from right to left), which takes O(log n)
+    amortized time. Each insert returns the item's node as a handle that can
+    be passed to decrease_key, which is o(log n) amortized. Both passes are
+    loops over a list of children, not recursive calls, so very deep or wide
+    heaps cannot overflow the call stack."""
+
+    def __init__(self, items=None):
+        """Initialize this heap and insert the given items, if any."""
+        self.root = None
+        self._size = 0
+        if items:
+            for item in items:
+                self.insert(item)
+
+    def __repr__(self):
+        """Return a string representation of this heap."""
+        return 'PairingHeap({} items, min={!r})'.format(
+            self._size, self.root.item if self.root else None)
+
+    def is_empty(self):
+        """Return True if this heap is empty, or False otherwise."""
+        return self._size == 0
+
+    def size(self):
+        """Return the number of items in this heap."""
+        return self._size
+
+    def insert(self, item):
+        """Insert the given item into this heap and return its node, which can
+        be used as a handle for decrease_key. Running time: O(1)."""
+        node = PairingHeapNode(item)
+        self.root = node if self.root is None else self._link(self.root, node)
+        self._size += 1
+        return node
+
+    def get_min(self):
+        """Return the minimum item at the root of this heap.
+        Running time: O(1)."""
+        if self.root is None:
+            raise ValueError('Heap is empty and has no minimum item')
+        return self.root.item
+
+    def delete_min(self):
+        """Remove and return the minimum item at the root of this heap.
+        Running time: O(log n) amortized, O(n) worst case."""
+        if self.root is None:
+            raise ValueError('Heap is empty and has no minimum item')
+        root = self.root
+        self.root = self._merge_pairs(root.child)
+        root.child = None
+        self._size -= 1
+        return root.item
+
+    def replace_min(self, item):
+        """Remove and return the minimum item at the root of this heap,
+        and insert the given item into this heap.
+        Running time: O(log n) amortized."""
+        min_item = self.delete_min()
+        self.insert(item)
+        return min_item
+
+    def insert_many(self, items):
+        """Insert all of the given items into this heap.
+        Running time: O(k) for k new items."""
+        for item in items:
+            self.insert(item)
+
+    def pop_many(self, k):
+        """Remove and return a list of the k minimum items in this heap in
+        sorted order, or all items if this heap has fewer than k items.
+        Running time: O(k log n) amortized."""
+        return [self.delete_min() for _ in range(min(k, self._size))]
+
+    def nsmallest(self, k):
+        """Return a list of the k minimum items in this heap in sorted order,
+        or all items if this heap has fewer than k items, without changing it.
+        The candidates for the next minimum item are the children of nodes
+        already found, so they are kept in an auxiliary binary heap of (item,
+        sequence, node) entries, numbered so nodes are never compared.
+        Running time: O(c log c) for c children of the k nodes found."""
+        result = []
+        if k <= 0 or self.root is None:
+            return result
+        candidates = BinaryMinHeap([(self.root.item, 0, self.root)])
+        count = 1
+        while len(result) < k and not candidates.is_empty():
+            item, _, node = candidates.delete_min()
+            result.append(item)
+            child = node.child
+            while child is not None:
+                candidates.insert((child.item, count, child))
+                count += 1
+                child = child.next
+        return result
+
+    def meld(self, other):
+        """Move all items from the given other pairing heap into this heap,
+        leaving the other heap empty. Running time: O(1)."""
+        if other.root is not None:
+            if self.root is None:
+                self.root = other.root
+            else:
+                self.root = self._link(self.root, other.root)
+        self._size += other._size
+        other.root = None
+        other._size = 0
+
+    def decrease_key(self, node, item):
+        """Lower the item stored in the given node (as returned by insert) to
+        the given item, or raise ValueError if the given item is greater or
+        the node is no longer in this heap (its item was deleted).
+        The node is cut from its parent and linked with the root.
+        Running time: O(1) actual, o(log n) amortized."""
+        if node.prev is None and node is not self.root:
+            raise ValueError('Node is not in heap: {!r}'.format(node))
+        if node.item < item:
+            raise ValueError('New item {!r} is greater than current item {!r}'
+                             .format(item, node.item))
+        node.item = item
+        if node is self.root:
+            return
+        # Cut the node (with its subtree) out of its parent's list of children
+        if node.prev.child is node:
+            node.prev.child = node.next
+        else:
+            node.prev.next = node.next
+        if node.next is not None:
+            node.next.prev = node.prev
+        node.next = node.prev = None
+        self.root = self._link(self.root, node)
+
+    @staticmethod
+    def _link(first, second):
+        """Link the given root nodes of two heaps (without siblings) by making
+        the one with the larger item the leftmost child of the other, and
+        return the node with the smaller item, the root of the linked heap."""
+        if second.item < first.item:
+            first, second = second, first
+        child = first.child
+        second.next = child
+        if child is not None:
+            child.prev = second
+        second.prev = first
+        first.child = second
+        return first
+
+    def _merge_pairs(self, node):
+        """Link the given node and all its siblings to the right into one heap
+        and return its root node, or None if the given node is None. The first
+        pass links each pair from left to right and the second pass links the
+        resulting heaps from right to left, both with loops."""
+        if node is None:
+            return None
+        # First pass: link siblings in pairs from left to right
+        pairs = []
+        while node is not None:
+            first = node
+            second = node.next
+            if second is None:
+                first.next = first.prev = None
+                pairs.append(first)
+                break
+            node = second.next
+            first.next = first.prev = None
+            second.next = second.prev = None
+            pairs.append(self._link(first, second))
+        # Second pass: link the paired heaps from right to left
+        root = pairs.pop()
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
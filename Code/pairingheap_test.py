@@ -0,0 +1,119 @@
+#!python
+
+from pairingheap import PairingHeap
+import random
+import unittest
+
+
+class TestPairingHeap(unittest.TestCase):
+    def test_empty_heap(self):
+        heap = PairingHeap()
+        assert heap.size() == 0
+        assert heap.is_empty() is True
+        with self.assertRaises(ValueError):
+            heap.get_min()
+        with self.assertRaises(ValueError):
+            heap.delete_min()
+        with self.assertRaises(ValueError):
+            heap.replace_min(1)
+
+    def test_insert_and_delete_many_random_items(self):
+        heap = PairingHeap()
+        items = random.sample(range(1000), 100)
+        for index, item in enumerate(items):
+            heap.insert(item)
+            assert heap.size() == index + 1
+            assert heap.get_min() == min(items[: index + 1])
+        for item in sorted(items):
+            assert heap.delete_min() == item
+        assert heap.is_empty() is True
+
+    def test_replace_min(self):
+        heap = PairingHeap([9, 25, 86, 3, 29, 5, 55])
+        assert heap.replace_min(30) == 3
+        assert heap.replace_min(1) == 5
+        assert [heap.delete_min() for _ in range(7)] == [1, 9, 25, 29, 30, 55, 86]
+
+    def test_batch_methods(self):
+        items = [random.randrange(100) for _ in range(200)]
+        heap = PairingHeap([50])
+        heap.insert_many(items)
+        assert heap.size() == 201
+        expected = sorted(items + [50])
+        heap.delete_min()  # Give the root children to search through
+        expected.pop(0)
+        for k in [0, 1, 10, 200, 300]:
+            assert heap.nsmallest(k) == expected[:k]
+        assert heap.size() == 200
+        assert heap.pop_many(0) == []
+        assert heap.pop_many(10) == expected[:10]
+        assert heap.pop_many(500) == expected[10:]
+        assert heap.is_empty() is True
+        assert heap.nsmallest(5) == []
+
+    def test_meld(self):
+        heap1 = PairingHeap([5, 1, 9])
+        heap2 = PairingHeap([4, 8, 2, 7])
+        heap1.meld(heap2)
+        assert heap2.is_empty() is True
+        assert heap1.size() == 7
+        heap1.meld(PairingHeap())
+        assert [heap1.delete_min() for _ in range(7)] == [1, 2, 4, 5, 7, 8, 9]
+        empty = PairingHeap()
+        empty.meld(PairingHeap([3]))
+        assert empty.get_min() == 3
+
+    def test_decrease_key(self):
+        heap = PairingHeap()
+        nodes = {item: heap.insert(item) for item in range(10, 100, 10)}
+        heap.delete_min()  # Build some structure below the root
+        with self.assertRaises(ValueError):
+            heap.decrease_key(nodes[50], 60)
+        heap.decrease_key(nodes[50], 5)
+        assert heap.get_min() == 5
+        heap.decrease_key(nodes[50], 4)  # Decrease the root itself
+        heap.decrease_key(nodes[90], 15)
+        heap.decrease_key(nodes[70], 25)
+        expected = [4, 15, 20, 25, 30, 40, 60, 80]
+        assert [heap.delete_min() for _ in range(8)] == expected
+
+    def test_decrease_key_of_deleted_node(self):
+        heap = PairingHeap()
+        nodes = [heap.insert(item) for item in [3, 1, 2]]
+        heap.delete_min()
+        # The deleted node is stale and leaves the heap unchanged
+        with self.assertRaises(ValueError):
+            heap.decrease_key(nodes[1], 0)
+        assert nodes[1].item == 1
+        heap.pop_many(2)
+        with self.assertRaises(ValueError):
+            heap.decrease_key(nodes[2], 0)
+        assert heap.is_empty() is True
+
+    def test_random_decrease_key(self):
+        heap = PairingHeap()
+        nodes = [heap.insert(random.random()) for _ in range(500)]
+        live = set(range(500))
+        for _ in range(3):
+            for index in random.sample(sorted(live), 100):
+                heap.decrease_key(nodes[index], nodes[index].item / 2)
+            for _ in range(50):
+                item = heap.delete_min()
+                index = next(index for index in live if nodes[index].item == item)
+                assert item == min(nodes[other].item for other in live)
+                live.remove(index)
+        remaining = sorted(nodes[index].item for index in live)
+        assert [heap.delete_min() for _ in remaining] == remaining
+
+    def test_deep_heap_does_not_overflow_stack(self):
+        # Inserting in decreasing order makes a path of 100000 nodes
+        heap = PairingHeap()
+        for item in range(100000, 0, -1):
+            heap.insert(item)
+        assert heap.delete_min() == 1
+        assert heap.delete_min() == 2
+        assert heap.size() == 99998
+
+
+if __name__ == '__main__':
+    unittest.main()
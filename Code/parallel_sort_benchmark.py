@@ -0,0 +1,62 @@
+#!python
+
+import os
+import random
+import sys
+import time
+
+from sorting_parallel import parallel_merge_sort
+
+
+def time_sort(items, workers):
+    """Return the time in seconds to sort a copy of the given items with
+    parallel merge sort using the given number of worker processes."""
+    copy = list(items)
+    start_time = time.perf_counter()
+    parallel_merge_sort(copy, workers)
+    return time.perf_counter() - start_time
+
+
+def run_benchmarks(num_items, max_workers):
+    """Time parallel merge sort of the given number of random integers with
+    1, 2, 4, ... up to the given number of workers, and print a table of
+    times, speedups over one worker and parallel efficiencies."""
+    items = [random.randrange(1 << 62) for _ in range(num_items)]
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    print('{:>8} {:>10} {:>8} {:>10}'.format('workers', 'seconds', 'speedup', 'efficiency'))
+    base_seconds = None
+    for workers in counts:
+        seconds = time_sort(items, workers)
+        if base_seconds is None:
+            base_seconds = seconds
+        speedup = base_seconds / seconds
+        print('{:>8} {:>10.3f} {:>8.2f} {:>10.2f}'.format(
+            workers, seconds, speedup, speedup / workers))
+
+
+def main():
+    """Read command-line arguments and benchmark parallel merge sort."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} num_items [max_workers]'.format(script))
+        print('Benchmark scaling of parallel merge sort of `num_items` random')
+        print('    integers from 1 worker process up to `max_workers`')
+        print('    (default: number of CPUs)')
+        print('Example: {} 1000000 16'.format(script))
+        return
+    try:
+        num_items = int(args[0])
+        max_workers = int(args[1]) if len(args) >= 2 else os.cpu_count() or 1
+    except ValueError:
+        print('Integer required for `num_items` and `max_workers` command-line arguments')
+        return
+    run_benchmarks(num_items, max_workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,25 @@
 #!python3
 
-from prefixtreenode import PrefixTreeNode
+import random
+import sys
+import unicodedata
+from prefixtreenode import PrefixTreeNode, BytePrefixTreeNode
+
+
+def casefold(string):
+    """Return a normalized key for the given string for case-insensitive
+    matching, for use as a prefix tree's key normalizer."""
+    return string.casefold()
+
+
+def strip_accents(string):
+    """Return a normalized key for the given string for case-insensitive and
+    accent-insensitive matching, for use as a prefix tree's key normalizer.
+    The string is decomposed into compatibility form (NFKD) and all combining
+    marks (accents) are removed, so 'Café' and 'cafe' have the same key."""
+    decomposed = unicodedata.normalize('NFKD', string)
+    return ''.join(char for char in decomposed
+                   if not unicodedata.combining(char)).casefold()
 
 
 class PrefixTree:
@@ -13,15 +32,27 @@ class PrefixTree:
     its height depends only on the length of the longest string stored in it.
     This makes a prefix tree effective for spell-checking and autocompletion.
     Each string is stored as a sequence of characters along a path from the
-    tree's root node to a terminal node that marks the end of the string."""
+    tree's root node to a terminal node that marks the end of the string.
+    If byte_keys is True, strings are stored as sequences of UTF-8 bytes in
+    nodes with dense arrays of 256 children slots instead of dictionaries.
+    If a normalize function is given (such as casefold or strip_accents), each
+    string is stored along the path of its normalized key and the original
+    strings are stored as the terminal node's payload, so queries match any
+    original string whose key matches the normalized query."""
 
     # Constant for the start character stored in the prefix tree's root node
     START_CHARACTER = ''
 
-    def __init__(self, strings=None):
-        """Initialize this prefix tree and insert the given strings, if any."""
+    def __init__(self, strings=None, normalize=None, byte_keys=False):
+        """Initialize this prefix tree with the given key normalizer function
+        and key mode, and insert the given strings, if any."""
+        # Function to compute each string's key, or None to use the string
+        self.normalize = normalize
+        # Store keys as UTF-8 bytes instead of characters if this is True
+        self.byte_keys = byte_keys
+        self.node_type = BytePrefixTreeNode if byte_keys else PrefixTreeNode
         # Create a new root node with the start character
-        self.root = PrefixTreeNode(PrefixTree.START_CHARACTER)
+        self.root = self.node_type(PrefixTree.START_CHARACTER)
         # Count the number of strings inserted into the tree
         self.size = 0
         # Insert each string, if any were given
@@ -40,14 +71,24 @@ class PrefixTree:
         else:
             return False
 
+    def _key(self, string):
+        """Return the sequence of characters or bytes that the given string is
+        stored along in this prefix tree."""
+        if self.normalize is not None:
+            string = self.normalize(string)
+        if self.byte_keys:
+            return string.encode('utf-8')
+        return string
+
     def contains(self, string):
-        """Return True if this prefix tree contains the given string."""
+        """Return True if this prefix tree contains the given string (or, with
+        a key normalizer, any string with the same normalized key)."""
         parent = self.root
-        for letter in string:
+        for letter in self._key(string):
             if not parent.has_child(letter):
                 return False
             else:
-                parent = parent.children[letter]
+                parent = parent.get_child(letter)
 
         if parent.terminal == True:
             return True
@@ -57,17 +98,28 @@ class PrefixTree:
     def insert(self, string):
         """Insert the given string into this prefix tree."""
         parent = self.root
-        for letter in string:
+        for letter in self._key(string):
             if not parent.has_child(letter):
-                new_node = PrefixTreeNode(letter)
+                new_node = self.node_type(letter)
                 parent.add_child(letter, new_node)
-                self.size += 1
-            parent = parent.children[letter]
-        parent.terminal = True
+            parent = parent.get_child(letter)
+        if self.normalize is not None:
+            # Store each distinct original string with its normalized key
+            if parent.payload is None:
+                parent.payload = []
+            if string in parent.payload:
+                return
+            parent.payload.append(string)
+            parent.terminal = True
+            self.size += 1
+        # Count each distinct string only once, even if inserted repeatedly
+        elif not parent.terminal:
+            parent.terminal = True
+            self.size += 1
 
     def _find_node(self, string):
         """Return a pair containing the deepest node in this prefix tree that
-        matches the longest prefix of the given string and the node's depth.
+        matches the longest prefix of the given key and the node's depth.
         The depth returned is equal to the number of prefix characters matched.
         Search is done iteratively with a loop starting from the root node."""
         # Match the empty string
@@ -77,8 +129,8 @@ class PrefixTree:
         level = 0
         node = self.root
         for char in string:
-            if char in node.children:
-                node = node.children[char]
+            if node.has_child(char):
+                node = node.get_child(char)
                 level += 1
             else:
                 return [], None
@@ -87,32 +139,163 @@ class PrefixTree:
 
     def complete(self, prefix):
         """Return a list of all strings stored in this prefix tree that start
-        with the given prefix string."""
+        with the given prefix string (or, with a key normalizer, whose keys
+        start with the normalized prefix)."""
         # Create a list of completions in prefix tree
-        start_node, depth = self._find_node(prefix)
+        key = self._key(prefix)
+        start_node, depth = self._find_node(key)
 
         if start_node:
-            return self._traverse(start_node, prefix, [])
+            return self._traverse(start_node, key, [])
         else:
             return []
 
     def strings(self):
         """Return a list of all strings stored in this prefix tree."""
         # Create a list of all strings in prefix tree
-        all_strings = []
         return self.complete('')
 
+    def sorted_strings(self):
+        """Return a list of all strings stored in this prefix tree in sorted
+        (lexicographic) order, by code point like sorted, or by normalized key
+        with a key normalizer. Nodes are visited with an iterative depth-first
+        traversal using an explicit stack, so long strings cannot overflow the
+        call stack, and each node's children are visited in increasing order
+        of their characters, so each string comes before any longer strings
+        it is a prefix of. Running time: O(n + c log c) for n nodes with c
+        children sorted in total (O(n) with byte keys, already in order)."""
+        strings = []
+        stack = [(self.root, b'' if self.byte_keys else '')]
+        while stack:
+            node, prefix = stack.pop()
+            if node.terminal:
+                if node.payload is not None:
+                    strings.extend(node.payload)
+                elif self.byte_keys:
+                    strings.append(prefix.decode('utf-8'))
+                else:
+                    strings.append(prefix)
+            children = node.child_items()
+            if not self.byte_keys:
+                children = sorted(children, key=lambda item: item[0])
+            # Push children in reverse order so the smallest is visited first
+            for key, child in reversed(list(children)):
+                if self.byte_keys:
+                    key = bytes((key,))
+                stack.append((child, prefix + key))
+        return strings
+
     def _traverse(self, node, prefix, visit):
         """Traverse this prefix tree with recursive depth-first traversal.
         Start at the given node with the given prefix representing its path in
         this prefix tree and visit each node with the given visit function."""
         if node.terminal:
-            visit.append(prefix)
-        for key in node.children:
-            self._traverse(node.children[key], prefix + key, visit)
+            if node.payload is not None:
+                visit.extend(node.payload)
+            elif self.byte_keys:
+                visit.append(prefix.decode('utf-8'))
+            else:
+                visit.append(prefix)
+        for key, child in node.child_items():
+            if self.byte_keys:
+                key = bytes((key,))
+            self._traverse(child, prefix + key, visit)
 
         return visit
 
+    def stats(self, samples=None, seed=None):
+        """Return a dict of statistics describing the shape and memory usage of
+        this prefix tree: number of words, nodes and terminal nodes, maximum and
+        mean depth of terminal nodes, a histogram mapping each branching factor
+        (number of children) to the number of nodes with that many children, and
+        an estimate of the bytes used by all nodes (via sys.getsizeof).
+        If samples is None, every node is visited: O(n) time for n nodes.
+        Otherwise the counts are estimated from that many random root-to-leaf
+        walks (Knuth's estimator): O(samples * h) time for tree height h, so
+        the result is cheap to compute even for huge trees, but approximate."""
+        if samples is None:
+            return self._exact_stats()
+        return self._sampled_stats(samples, seed)
+
+    def _exact_stats(self):
+        """Return exact statistics by visiting every node iteratively."""
+        nodes = terminals = total_depth = max_depth = num_bytes = 0
+        branching = {}
+        # Use an explicit stack of (node, depth) pairs to avoid deep recursion
+        stack = [(self.root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            nodes += 1
+            num_bytes += self._node_bytes(node)
+            degree = node.num_children()
+            branching[degree] = branching.get(degree, 0) + 1
+            if node.terminal:
+                terminals += 1
+                total_depth += depth
+                if depth > max_depth:
+                    max_depth = depth
+            for _, child in node.child_items():
+                stack.append((child, depth + 1))
+        return {
+            'words': self.size,
+            'nodes': nodes,
+            'terminals': terminals,
+            'max_depth': max_depth,
+            'mean_depth': total_depth / terminals if terminals else 0.0,
+            'branching': dict(sorted(branching.items())),
+            'bytes': num_bytes,
+            'sampled': False,
+        }
+
+    def _sampled_stats(self, samples, seed=None):
+        """Return statistics estimated from the given number of random walks.
+        Each walk descends from the root choosing a child uniformly at random.
+        Weighting each visited node by the product of branching factors above
+        it gives an unbiased estimate of totals summed over all nodes."""
+        if samples < 1:
+            raise ValueError(f'Number of samples must be positive: {samples}')
+        rng = random.Random(seed)
+        nodes = terminals = total_depth = num_bytes = 0.0
+        max_depth = 0
+        branching = {}
+        for _ in range(samples):
+            node, depth, weight = self.root, 0, 1
+            while True:
+                nodes += weight
+                num_bytes += weight * self._node_bytes(node)
+                degree = node.num_children()
+                branching[degree] = branching.get(degree, 0) + weight
+                if node.terminal:
+                    terminals += weight
+                    total_depth += weight * depth
+                    if depth > max_depth:
+                        max_depth = depth
+                if degree == 0:
+                    break
+                weight *= degree
+                node = rng.choice([child for _, child in node.child_items()])
+                depth += 1
+        terminals /= samples
+        return {
+            'words': self.size,
+            'nodes': round(nodes / samples),
+            'terminals': round(terminals),
+            'max_depth': max_depth,
+            'mean_depth': total_depth / samples / terminals if terminals else 0.0,
+            'branching': {degree: round(count / samples)
+                          for degree, count in sorted(branching.items())},
+            'bytes': round(num_bytes / samples),
+            'sampled': True,
+        }
+
+    @staticmethod
+    def _node_bytes(node):
+        """Return the approximate number of bytes used by the given node, its
+        character, payload and children structure (but not children nodes)."""
+        return (sys.getsizeof(node) + sys.getsizeof(node.__dict__) +
+                sys.getsizeof(node.character) + sys.getsizeof(node.children) +
+                sys.getsizeof(node.payload))
+
 
 def create_prefix_tree(strings):
     print(f'strings: {strings}')
@@ -1,6 +1,7 @@
 #!python3
 
-from prefixtree import PrefixTree, PrefixTreeNode
+from prefixtree import PrefixTree, PrefixTreeNode, casefold, strip_accents
+from prefixtreenode import BytePrefixTreeNode
 import unittest
 
 
@@ -245,6 +246,83 @@ class PrefixTreeTest(unittest.TestCase):
             assert len(tree_strings) == len(input_strings)  # Check length only
             self.assertCountEqual(tree_strings, input_strings)  # Ignore order
 
+    def test_stats(self):
+        tree = PrefixTree(['ABC', 'ABD', 'A', 'XYZ', 'A'])
+        stats = tree.stats()
+        assert stats['words'] == 4
+        # Root, A, B, C, D, X, Y, Z
+        assert stats['nodes'] == 8
+        assert stats['terminals'] == 4
+        assert stats['max_depth'] == 3
+        assert stats['mean_depth'] == (3 + 3 + 1 + 3) / 4
+        assert stats['branching'] == {0: 3, 1: 3, 2: 2}
+        assert stats['bytes'] > 0
+        assert stats['sampled'] is False
+
+    def test_stats_with_samples(self):
+        # In a tree where every path has the same shape the estimate is exact
+        strings = [a + b for a in 'ABCD' for b in 'WXYZ']
+        tree = PrefixTree(strings)
+        exact = tree.stats()
+        sampled = tree.stats(samples=5, seed=1)
+        assert sampled['sampled'] is True
+        for key in ['words', 'nodes', 'terminals', 'max_depth', 'mean_depth',
+                    'branching']:
+            assert sampled[key] == exact[key]
+        with self.assertRaises(ValueError):
+            tree.stats(samples=0)
+
+    def test_byte_keys(self):
+        strings = ['café', 'cafe', 'naïve', 'A', 'ABC', '日本', '日本語']
+        tree = PrefixTree(strings, byte_keys=True)
+        assert isinstance(tree.root, BytePrefixTreeNode)
+        assert tree.size == len(strings)
+        for string in strings:
+            assert tree.contains(string) is True
+        assert tree.contains('caf') is False
+        assert tree.contains('日') is False
+        # Children are visited in byte order, which is code point order
+        assert tree.strings() == sorted(strings)
+        assert tree.complete('caf') == ['cafe', 'café']
+        assert tree.complete('日本') == ['日本', '日本語']
+        assert tree.complete('x') == []
+        # Node for 'A' has one child ('B') and 'ABC' is 3 bytes deep
+        assert tree.root.get_child(ord('A')).num_children() == 1
+        assert tree.stats()['max_depth'] == len('日本語'.encode('utf-8'))
+
+    def test_casefold_normalizer(self):
+        tree = PrefixTree(['Apple', 'apple', 'APPLE', 'Banana'],
+                          normalize=casefold)
+        assert tree.size == 4
+        tree.insert('apple')
+        assert tree.size == 4
+        assert tree.contains('aPpLe') is True
+        assert tree.contains('app') is False
+        assert tree.complete('AP') == ['Apple', 'apple', 'APPLE']
+        assert tree.complete('b') == ['Banana']
+        # Only one path is stored for all three forms of 'apple'
+        assert tree.stats()['terminals'] == 2
+
+    def test_strip_accents_normalizer(self):
+        for byte_keys in [False, True]:
+            tree = PrefixTree(['Café', 'cafe', 'naïve', 'Ångström'],
+                              normalize=strip_accents, byte_keys=byte_keys)
+            assert tree.contains('CAFE') is True
+            assert tree.contains('café') is True
+            assert tree.complete('caf') == ['Café', 'cafe']
+            assert tree.complete('naive') == ['naïve']
+            assert tree.complete('angs') == ['Ångström']
+
+    def test_sorted_strings(self):
+        strings = ['tea', 'ten', 'to', 'A', 'inn', 'in', 'i', 'Zoo', 'café',
+                   'cafe', '日本', 'b' * 5000]
+        for byte_keys in [False, True]:
+            tree = PrefixTree(strings, byte_keys=byte_keys)
+            assert tree.sorted_strings() == sorted(strings)
+        assert PrefixTree().sorted_strings() == []
+        tree = PrefixTree(['b', 'Apple', 'apple', 'B'], normalize=casefold)
+        assert tree.sorted_strings() == ['Apple', 'apple', 'b', 'B']
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,8 @@ class PrefixTreeNode:
         self.children = PrefixTreeNode.CHILDREN_TYPE()
         # Marks if this node terminates a string in the prefix tree
         self.terminal = False
+        # Optional data stored with a terminal node, such as original strings
+        self.payload = None
 
     def is_terminal(self):
         """Return True if this prefix tree node terminates a string."""
@@ -30,27 +32,19 @@ class PrefixTreeNode:
 
     def num_children(self):
         """Return the number of children nodes this prefix tree node has."""
-        counter = 0
-        for key in self.children.keys():
-            counter += 1
-        return counter
+        return len(self.children)
 
     def has_child(self, character):
         """Return True if this prefix tree node has a child node that
         represents the given character amongst its children."""
-        for key in self.children.keys():
-            if key == character:
-                return True
-        return False
+        return character in self.children
 
     def get_child(self, character):
         """Return this prefix tree node's child node that represents the given
         character if it is amongst its children, or raise ValueError if not."""
-        if self.has_child(character):
-            for key, val in self.children.items():
-                if character == val.character:
-                    return val
-        else:
+        try:
+            return self.children[character]
+        except KeyError:
             raise ValueError(f'No child exists for character {character!r}')
 
     def add_child(self, character, child_node):
@@ -61,6 +55,11 @@ class PrefixTreeNode:
         else:
             raise ValueError(f'Child exists for character {character!r}')
 
+    def child_items(self):
+        """Return an iterable of (character, child node) pairs for each of this
+        prefix tree node's children, in the order they were added."""
+        return self.children.items()
+
     def __repr__(self):
         """Return a code representation of this prefix tree node."""
         return f'PrefixTreeNode({self.character!r})'
@@ -68,3 +67,59 @@ class PrefixTreeNode:
     def __str__(self):
         """Return a string view of this prefix tree node."""
         return f'({self.character})'
+
+
+class BytePrefixTreeNode(PrefixTreeNode):
+    """BytePrefixTreeNode: A prefix tree node that stores a single byte (an
+    integer in range [0...255]) of a UTF-8 encoded string and a dense array of
+    256 child slots indexed directly by the next byte, which is empty (None)
+    if no child exists for that byte. Child lookup is a single list index and
+    children are always visited in byte order, which for UTF-8 encoded strings
+    is the same as the code point order of the decoded strings."""
+
+    # Children are stored in a list with one slot for every possible byte
+    CHILDREN_TYPE = list
+    ALPHABET_SIZE = 256
+
+    def __init__(self, character=None):
+        """Initialize this prefix tree node with the given byte value, a dense
+        array of empty children slots, and a boolean terminal property."""
+        super().__init__(character)
+        self.children = [None] * BytePrefixTreeNode.ALPHABET_SIZE
+        # Count the number of occupied children slots
+        self.count = 0
+
+    def num_children(self):
+        """Return the number of children nodes this prefix tree node has."""
+        return self.count
+
+    def has_child(self, character):
+        """Return True if this prefix tree node has a child node that
+        represents the given byte amongst its children."""
+        return self.children[character] is not None
+
+    def get_child(self, character):
+        """Return this prefix tree node's child node that represents the given
+        byte if it is amongst its children, or raise ValueError if not."""
+        child = self.children[character]
+        if child is None:
+            raise ValueError(f'No child exists for byte {character!r}')
+        return child
+
+    def add_child(self, character, child_node):
+        """Add the given byte and child node as a child of this node, or raise
+        ValueError if given byte is amongst this node's children."""
+        if self.children[character] is not None:
+            raise ValueError(f'Child exists for byte {character!r}')
+        self.children[character] = child_node
+        self.count += 1
+
+    def child_items(self):
+        """Return an iterable of (byte, child node) pairs for each of this
+        prefix tree node's children, in increasing byte order."""
+        return ((byte, child) for byte, child in enumerate(self.children)
+                if child is not None)
+
+    def __repr__(self):
+        """Return a code representation of this prefix tree node."""
+        return f'BytePrefixTreeNode({self.character!r})'
@@ -1,6 +1,6 @@
 #!python3
 
-from prefixtreenode import PrefixTreeNode
+from prefixtreenode import PrefixTreeNode, BytePrefixTreeNode
 import unittest
 
 
@@ -50,6 +50,24 @@ class PrefixTreeNodeTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             node_A.add_child('C', node_C)
 
+    def test_byte_child_methods(self):
+        node_A = BytePrefixTreeNode(65)
+        assert len(node_A.children) == BytePrefixTreeNode.ALPHABET_SIZE
+        assert node_A.num_children() == 0
+        assert node_A.has_child(66) is False
+        with self.assertRaises(ValueError):
+            node_A.get_child(66)
+        node_C = BytePrefixTreeNode(67)
+        node_B = BytePrefixTreeNode(66)
+        node_A.add_child(67, node_C)
+        node_A.add_child(66, node_B)
+        assert node_A.num_children() == 2
+        assert node_A.get_child(66) is node_B
+        # Children are listed in byte order, not the order they were added
+        assert list(node_A.child_items()) == [(66, node_B), (67, node_C)]
+        with self.assertRaises(ValueError):
+            node_A.add_child(66, node_B)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,57 +1,159 @@
 #!python
 
-from binaryheap import BinaryMinHeap
+from indexedheap import IndexedMinHeap
 
 
 class PriorityQueue(object):
     """PriorityQueue: a partially ordered queue with methods to enqueue items
     in priority order and to access and dequeue its highest priority item.
-    Item pairs are stored in a binary min heap for its efficient operations."""
+    Item pairs are stored in a binary min heap for its efficient operations.
+    Each enqueued item gets a unique handle, its sequence number, that can be
+    used to change its priority, remove it, or cancel it. The heap orders
+    handles by (priority, sequence) pairs, so items with equal priority are
+    dequeued in first-in, first-out order and items are never compared.
+    Cancelled items are left in the heap as tombstones and skipped when they
+    reach the front, until they make up too much of the heap to be worth
+    keeping, when the heap is rebuilt without them."""
+
+    # Rebuild the heap when more than this fraction of it is cancelled items
+    COMPACT_RATIO = 0.5
+    # Never rebuild the heap for fewer than this many cancelled items
+    COMPACT_MINIMUM = 64
 
     def __init__(self):
         """Initialize this priority queue."""
-        # Initialize new binary min heap to store items in this priority queue
-        self.heap = BinaryMinHeap()
+        # Initialize new indexed min heap to store handles ordered by priority
+        self.heap = IndexedMinHeap()
+        # Map each handle of a live (not cancelled) item to its item
+        self.items = {}
+        # Counter to generate a new unique handle for each enqueued item
+        self.counter = 0
+        # Count the number of cancelled items still stored in the heap
+        self.cancelled = 0
 
     def __repr__(self):
         """Return a string representation of this priority queue."""
-        return 'PriorityQueue({} items, front={})'.format(self.size(), self.front())
+        return 'PriorityQueue({} items, front={})'.format(self.size(), self._peek())
+
+    def __contains__(self, handle):
+        """Return True if the item with the given handle is in this queue."""
+        return handle in self.items
 
     def is_empty(self):
         """Return True if this priority queue is empty, or False otherwise."""
-        return self.heap.is_empty()
+        return len(self.items) == 0
 
     def length(self):
         """Return the number of items in this priority queue."""
-        return self.heap.size()
+        return len(self.items)
+
+    def size(self):
+        """Return the number of items in this priority queue."""
+        return len(self.items)
 
     def enqueue(self, item, priority):
         """Insert the given item into this priority queue in order according to
-        the given priority."""
-        # TODO: Insert given item into heap in order according to given priority
-        # ...
+        the given priority, after any items with equal priority, and return a
+        handle for the item. Running time: O(log n)."""
+        handle = self.counter
+        self.counter += 1
+        self.items[handle] = item
+        self.heap.insert(handle, (priority, handle))
+        return handle
 
     def front(self):
         """Return the item at the front of this priority queue without removing
         it, or None if this priority queue is empty."""
         if self.size() == 0:
             return None
-        # TODO: Return minimum item from heap
-        # ...
+        self._discard_cancelled()
+        return self.items[self.heap.get_min()]
 
     def dequeue(self):
         """Remove and return the item at the front of this priority queue,
         or raise ValueError if this priority queue is empty."""
         if self.size() == 0:
             raise ValueError('Priority queue is empty and has no front item')
-        # TODO: Remove and return minimum item from heap
-        # ...
+        self._discard_cancelled()
+        return self.items.pop(self.heap.delete_min())
 
     def push_pop(self, item, priority):
         """Remove and return the item at the front of this priority queue,
         and insert the given item in order according to the given priority.
-        This method is more efficient than calling dequeue and then enqueue."""
+        This method is more efficient than calling dequeue and then enqueue,
+        as it replaces the heap's minimum with a single bubble down."""
         if self.size() == 0:
             raise ValueError('Priority queue is empty and has no front item')
-        # TODO: Replace and return minimum item from heap
-        # ...
+        self._discard_cancelled()
+        handle = self.counter
+        self.counter += 1
+        self.items[handle] = item
+        return self.items.pop(self.heap.replace_min(handle, (priority, handle)))
+
+    def priority(self, handle):
+        """Return the priority of the item with the given handle, or raise
+        KeyError if it is not in this priority queue."""
+        if handle not in self.items:
+            raise KeyError(handle)
+        return self.heap.priority(handle)[0]
+
+    def update_priority(self, handle, priority):
+        """Change the priority of the item with the given handle, or raise
+        KeyError if it is not in this priority queue. The item keeps its place
+        among items of equal priority by its original enqueue order.
+        Running time: O(log n)."""
+        if handle not in self.items:
+            raise KeyError(handle)
+        self.heap.update(handle, (priority, handle))
+
+    def remove(self, handle):
+        """Remove and return the item with the given handle, or raise KeyError
+        if it is not in this priority queue. Running time: O(log n)."""
+        if handle not in self.items:
+            raise KeyError(handle)
+        self.heap.remove(handle)
+        return self.items.pop(handle)
+
+    def cancel(self, handle):
+        """Remove and return the item with the given handle, or raise KeyError
+        if it is not in this priority queue, without touching the heap.
+        Running time: O(1) amortized, including occasional O(n) rebuilds."""
+        item = self.items.pop(handle)
+        self.cancelled += 1
+        if (self.cancelled > self.COMPACT_MINIMUM and
+                self.cancelled > self.COMPACT_RATIO * self.heap.size()):
+            self._compact()
+        return item
+
+    def _peek(self):
+        """Return the item at the front of this priority queue, or None if it
+        is empty, without changing the heap (unlike front, which discards
+        cancelled items from the front), so it is safe to call for debugging.
+        Running time: O(1) if the heap's minimum is live, otherwise O(n) to
+        scan the heap for the live item with the minimum priority."""
+        heap = self.heap
+        if self.size() == 0:
+            return None
+        if heap.handles[0] in self.items:
+            return self.items[heap.handles[0]]
+        # Priorities are unique (priority, handle) pairs, so the minimum
+        # live priority identifies the front item
+        _, handle = min((priority, handle) for handle, priority
+                        in zip(heap.handles, heap.items) if handle in self.items)
+        return self.items[handle]
+
+    def _discard_cancelled(self):
+        """Delete cancelled items from the front of the heap until the item at
+        the front is live or the heap is empty."""
+        heap = self.heap
+        while heap.size() > 0 and heap.get_min() not in self.items:
+            heap.delete_min()
+            self.cancelled -= 1
+
+    def _compact(self):
+        """Rebuild the heap from the live items only. Running time: O(n)."""
+        pairs = [(handle, priority) for handle, priority
+                 in zip(self.heap.handles, self.heap.items)
+                 if handle in self.items]
+        self.heap = IndexedMinHeap(pairs)
+        self.cancelled = 0
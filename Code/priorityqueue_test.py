@@ -0,0 +1,114 @@
+#!python
+
+from priorityqueue import PriorityQueue
+import random
+import unittest
+
+
+class TestPriorityQueue(unittest.TestCase):
+    def test_empty_queue(self):
+        queue = PriorityQueue()
+        assert queue.is_empty() is True
+        assert queue.length() == 0
+        assert queue.front() is None
+        with self.assertRaises(ValueError):
+            queue.dequeue()
+        with self.assertRaises(ValueError):
+            queue.push_pop('A', 1)
+
+    def test_enqueue_and_dequeue(self):
+        queue = PriorityQueue()
+        queue.enqueue('C', 3)
+        queue.enqueue('A', 1)
+        queue.enqueue('B', 2)
+        assert queue.length() == 3
+        assert queue.front() == 'A'
+        assert repr(queue) == 'PriorityQueue(3 items, front=A)'
+        assert queue.dequeue() == 'A'
+        assert queue.dequeue() == 'B'
+        assert queue.dequeue() == 'C'
+        assert queue.is_empty() is True
+
+    def test_push_pop(self):
+        queue = PriorityQueue()
+        queue.enqueue('B', 2)
+        queue.enqueue('C', 3)
+        assert queue.push_pop('A', 1) == 'B'
+        assert queue.push_pop('D', 4) == 'A'
+        assert [queue.dequeue() for _ in range(2)] == ['C', 'D']
+
+    def test_update_priority_and_remove(self):
+        queue = PriorityQueue()
+        handle_a = queue.enqueue('A', 1)
+        handle_b = queue.enqueue('B', 2)
+        handle_c = queue.enqueue('C', 3)
+        queue.update_priority(handle_c, 0)
+        assert queue.front() == 'C'
+        queue.update_priority(handle_c, 5)
+        assert queue.front() == 'A'
+        assert queue.remove(handle_a) == 'A'
+        assert handle_a not in queue
+        assert handle_b in queue
+        with self.assertRaises(KeyError):
+            queue.remove(handle_a)
+        with self.assertRaises(KeyError):
+            queue.update_priority(handle_a, 1)
+        assert [queue.dequeue() for _ in range(2)] == ['B', 'C']
+
+    def test_equal_priorities_are_fifo(self):
+        queue = PriorityQueue()
+        # Dictionaries cannot be compared, so this fails if items are compared
+        items = [{'id': index} for index in range(10)]
+        for item in items:
+            queue.enqueue(item, 1)
+        queue.enqueue({'id': 'first'}, 0)
+        assert queue.dequeue() == {'id': 'first'}
+        assert [queue.dequeue() for _ in items] == items
+
+    def test_cancel(self):
+        queue = PriorityQueue()
+        handle_a = queue.enqueue('A', 1)
+        handle_b = queue.enqueue('B', 2)
+        queue.enqueue('C', 3)
+        assert queue.cancel(handle_a) == 'A'
+        assert handle_a not in queue
+        assert queue.length() == 2
+        with self.assertRaises(KeyError):
+            queue.cancel(handle_a)
+        with self.assertRaises(KeyError):
+            queue.update_priority(handle_a, 0)
+        # The cancelled item is still in the heap until it reaches the front
+        assert queue.heap.size() == 3
+        # Showing the queue does not discard it
+        assert repr(queue) == 'PriorityQueue(2 items, front=B)'
+        assert queue.heap.size() == 3 and queue.cancelled == 1
+        assert queue.front() == 'B'
+        assert queue.heap.size() == 2
+        queue.cancel(handle_b)
+        assert queue.push_pop('D', 4) == 'C'
+        assert queue.dequeue() == 'D'
+        assert queue.is_empty() is True
+        assert queue.cancelled == 0
+
+    def test_cancel_compacts_heap(self):
+        queue = PriorityQueue()
+        handles = [queue.enqueue(index, index) for index in range(1000)]
+        for handle in handles[:600]:
+            queue.cancel(handle)
+        # The heap is rebuilt once cancelled items pass half of its size
+        assert queue.heap.size() < 1000
+        assert queue.heap.size() - queue.cancelled == 400
+        assert queue.priority(handles[600]) == 600
+        assert [queue.dequeue() for _ in range(400)] == list(range(600, 1000))
+
+    def test_many_random_items(self):
+        queue = PriorityQueue()
+        priorities = random.sample(range(1000), 100)
+        for priority in priorities:
+            queue.enqueue(str(priority), priority)
+        for priority in sorted(priorities):
+            assert queue.dequeue() == str(priority)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+#!python
+
+import asyncio
+import queue
+import random
+import sys
+import threading
+import time
+
+from concurrentqueue import ThreadSafePriorityQueue, AsyncPriorityQueue
+
+
+class StdlibPriorityQueue(object):
+    """StdlibPriorityQueue: a wrapper with ThreadSafePriorityQueue's put and
+    get methods around the standard library's queue.PriorityQueue, storing
+    (priority, sequence, item) entries so items are never compared."""
+
+    def __init__(self, maxsize=0):
+        """Initialize this priority queue with the given maximum size."""
+        self.queue = queue.PriorityQueue(maxsize)
+        self.counter = 0
+        self.lock = threading.Lock()
+
+    def put(self, item, priority, block=True, timeout=None):
+        """Insert the given item in order according to the given priority."""
+        with self.lock:
+            self.counter += 1
+            sequence = self.counter
+        self.queue.put((priority, sequence, item), block, timeout)
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the item at the front of this priority queue."""
+        return self.queue.get(block, timeout)[2]
+
+
+# Thread-safe queue classes to compare, by name
+QUEUES = {
+    'threadsafe': ThreadSafePriorityQueue,
+    'stdlib': StdlibPriorityQueue,
+}
+
+
+def time_threads(queue_class, num_items, producers, consumers, maxsize=0):
+    """Return the time in seconds for the given numbers of producer threads to
+    put and consumer threads to get the given number of items in total."""
+    pq = queue_class(maxsize)
+    priorities = [random.random() for _ in range(num_items)]
+
+    def produce(index):
+        for priority in priorities[index::producers]:
+            pq.put(priority, priority)
+
+    def consume(index):
+        for _ in range(len(range(index, num_items, consumers))):
+            pq.get()
+
+    threads = [threading.Thread(target=produce, args=(index,))
+               for index in range(producers)]
+    threads += [threading.Thread(target=consume, args=(index,))
+                for index in range(consumers)]
+    start_time = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start_time
+
+
+def time_tasks(num_items, producers, consumers, maxsize=0):
+    """Return the time in seconds for the given numbers of producer tasks to
+    put and consumer tasks to get the given number of items in total."""
+    priorities = [random.random() for _ in range(num_items)]
+
+    async def run():
+        pq = AsyncPriorityQueue(maxsize)
+
+        async def produce(index):
+            for priority in priorities[index::producers]:
+                await pq.put(priority, priority)
+
+        async def consume(index):
+            for _ in range(len(range(index, num_items, consumers))):
+                await pq.get()
+
+        await asyncio.gather(*[produce(index) for index in range(producers)],
+                             *[consume(index) for index in range(consumers)])
+
+    start_time = time.perf_counter()
+    asyncio.run(run())
+    return time.perf_counter() - start_time
+
+
+def run_benchmarks(num_items, counts=(1, 2, 4, 8), maxsize=1000):
+    """Time each queue with each combination of the given numbers of producers
+    and consumers, with and without the given maximum size, and print a table
+    of throughputs in items per second, one row per combination."""
+    names = list(QUEUES) + ['async']
+    print('{:>9} {:>9} {:>8}'.format('producers', 'consumers', 'maxsize') +
+          ''.join(' {:>12}'.format(name) for name in names))
+    for size in [0, maxsize]:
+        for producers in counts:
+            for consumers in counts:
+                row = '{:>9} {:>9} {:>8}'.format(producers, consumers, size)
+                for queue_class in QUEUES.values():
+                    seconds = time_threads(queue_class, num_items,
+                                           producers, consumers, size)
+                    row += ' {:>12.0f}'.format(num_items / seconds)
+                seconds = time_tasks(num_items, producers, consumers, size)
+                row += ' {:>12.0f}'.format(num_items / seconds)
+                print(row)
+
+
+def main():
+    """Read command-line arguments and benchmark concurrent priority queues."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} num_items'.format(script))
+        print('Benchmark throughput of concurrent priority queues with')
+        print('    1 to 8 producer and consumer threads (or asyncio tasks)')
+        print('Example: {} 100000'.format(script))
+        return
+    try:
+        num_items = int(args[0])
+    except ValueError:
+        print('Integer required for `num_items` command-line argument')
+        return
+    run_benchmarks(num_items)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,26 @@
 #!python
 
-from sorting_iterative import is_sorted, bubble_sort, selection_sort, insertion_sort
+from sorting_iterative import is_sorted, bubble_sort, selection_sort, insertion_sort, shell_sort
 from sorting_recursive import merge_sort, quick_sort
-from sorting_integer import counting_sort, bucket_sort
+from sorting_adaptive import tim_sort
+from sorting_integer import counting_sort, bucket_sort, radix_sort
+
+# Sorting functions that can be tested and benchmarked, by name
+SORTS = {
+    'bubble_sort': bubble_sort,
+    'selection_sort': selection_sort,
+    'insertion_sort': insertion_sort,
+    'shell_sort': shell_sort,
+    'merge_sort': merge_sort,
+    'quick_sort': quick_sort,
+    'tim_sort': tim_sort,
+    'counting_sort': counting_sort,
+    'bucket_sort': bucket_sort,
+    'radix_sort': radix_sort,
+}
+
+# Names of sorts that do arithmetic on items, so can only sort plain numbers
+INTEGER_SORTS = {'counting_sort', 'bucket_sort', 'radix_sort'}
 
 
 def random_ints(count=20, min=1, max=50):
@@ -26,11 +44,131 @@ def test_sorting(sort=bubble_sort, num_items=20, max_value=50):
     print('Sorted order?  {!r}'.format(is_sorted(items)))
 
 
+def test_external_sort(args):
+    """Sort a file with external merge sort using the given command-line
+    arguments (input file, output file, key type, memory in MB, fan-in) and
+    print statistics about the runs and merge passes."""
+    from sorting_external import external_sort
+    if len(args) < 2:
+        print('Usage: sorting.py external input output [type] [memory] [fan_in]')
+        print('Sort lines of file `input` into file `output` using at most')
+        print('    `memory` MB (default 64) for sorted runs, merging `fan_in`')
+        print('    runs at a time (default 16), comparing lines by `type`:')
+        print('    int (default), float or str')
+        return
+    input_path, output_path = args[0], args[1]
+    key_type = args[2] if len(args) >= 3 else 'int'
+    try:
+        memory = int(float(args[3]) * (1 << 20)) if len(args) >= 4 else 64 << 20
+        fan_in = int(args[4]) if len(args) >= 5 else 16
+    except ValueError:
+        print('Number required for `memory` and `fan_in` command-line arguments')
+        return
+    stats = external_sort(input_path, output_path, key_type, memory, fan_in)
+    print('Sorted items: {}'.format(stats['items']))
+    print('Sorted runs:  {}'.format(stats['runs']))
+    print('Merge passes: {}'.format(stats['passes']))
+    print('Time elapsed: {:.6f} sec'.format(stats['seconds']))
+    print('Throughput:   {:.0f} items/sec'.format(stats['items_per_second']))
+
+
+def test_benchmark(args):
+    """Benchmark all sorting functions (or those named by the command-line
+    argument `sorts`, separated by commas) on every input distribution at
+    sizes from 10 up to the command-line argument `max`, print the results,
+    and write them to the output file and compare them to the baseline file
+    given by command-line arguments, if any."""
+    from sorting_benchmark import (benchmark_sizes, run_matrix, write_results,
+                                   read_results, compare_results, format_result)
+    if len(args) == 0:
+        print('Usage: sorting.py benchmark max [output] [baseline] [sorts]')
+        print('Time sorting functions on each input distribution at sizes 10,')
+        print('    100, ... up to `max`, writing results to file `output` as')
+        print('    JSON (or CSV if it ends with .csv) and reporting results over')
+        print('    20% slower than in file `baseline`; `-` skips either file.')
+        print('    `sorts` is a comma-separated list of names (default: all)')
+        return
+    try:
+        max_size = int(float(args[0]))
+    except ValueError:
+        print('Integer required for `max` command-line argument')
+        return
+    output_path = args[1] if len(args) >= 2 and args[1] != '-' else None
+    baseline_path = args[2] if len(args) >= 3 and args[2] != '-' else None
+    names = args[3].split(',') if len(args) >= 4 else list(SORTS)
+    for name in names:
+        if name not in SORTS:
+            print('Sorting function {!r} does not exist'.format(name))
+            return
+    sorts = {name: SORTS[name] for name in names}
+    print('{:<16} {:<14} {:>9} {:>12} {:>12} {}'.format(
+        'algorithm', 'distribution', 'size', 'min', 'median', 'status'))
+    results = run_matrix(sorts, sizes=benchmark_sizes(max_size),
+                         progress=lambda result: print(format_result(result)))
+    if output_path:
+        write_results(results, output_path)
+        print('Wrote {} results to {}'.format(len(results), output_path))
+    if baseline_path:
+        regressions = compare_results(results, read_results(baseline_path))
+        print('Regressions against {}: {}'.format(baseline_path, len(regressions)))
+        for result, base_time, ratio in regressions:
+            change = 'wrong result' if ratio is None else '{:.2f}x slower'.format(ratio)
+            print('    {} (baseline min {:.6f}): {}'.format(
+                format_result(result), base_time, change))
+
+
+def test_instrumented_sort(args):
+    """Sort a list of random integers with the sorting function named by the
+    command-line arguments (sort name, number of items, maximum value) and
+    print counts of its comparisons, reads and writes, its peak memory and
+    its maximum call depth."""
+    from sorting_instrument import measure_sort
+    if len(args) == 0 or args[0] not in SORTS:
+        print('Usage: sorting.py count sort [num] [max]')
+        print('Count comparisons, reads and writes of items made by sorting')
+        print('    function `sort` on `num` integers (default 1000) randomly')
+        print('    sampled from [1...`max`] (default 1000000), and measure peak')
+        print('    memory allocated and maximum call depth')
+        print('Available sorting functions: {}'.format(', '.join(SORTS)))
+        return
+    sort_name = args[0]
+    try:
+        num_items = int(args[1]) if len(args) >= 2 else 1000
+        max_value = int(args[2]) if len(args) >= 3 else 1000000
+    except ValueError:
+        print('Integer required for `num` and `max` command-line arguments')
+        return
+    items = random_ints(num_items, 1, max_value)
+    stats = measure_sort(SORTS[sort_name], items,
+                         compare=sort_name not in INTEGER_SORTS)
+    print('Sorted {} items with {}: sorted order? {!r}'.format(
+        num_items, sort_name, is_sorted(items)))
+    if sort_name in INTEGER_SORTS:
+        print('Comparisons:  not counted (sort does arithmetic on items)')
+    else:
+        print('Comparisons:  {}'.format(stats.comparisons))
+    print('Item reads:   {}'.format(stats.reads))
+    print('Item writes:  {}'.format(stats.writes))
+    print('Peak memory:  {} bytes'.format(stats.peak_memory))
+    print('Call depth:   {}'.format(stats.max_depth))
+    print('Time elapsed: {:.6f} sec (instrumented)'.format(stats.seconds))
+
+
 def main():
     """Read command-line arguments and test sorting algorithms."""
     import sys
     args = sys.argv[1:]  # Ignore script file name
 
+    if len(args) >= 1 and args[0] == 'external':
+        test_external_sort(args[1:])
+        return
+    if len(args) >= 1 and args[0] == 'benchmark':
+        test_benchmark(args[1:])
+        return
+    if len(args) >= 1 and args[0] == 'count':
+        test_instrumented_sort(args[1:])
+        return
+
     if len(args) == 0:
         script = sys.argv[0]  # Get script file name
         print('Usage: {} sort num max'.format(script))
@@ -42,21 +180,25 @@ def main():
         print('Sorting items with bubble_sort(items)')
         print('Sorted items:  [3, 4, 6, 7, 7, 9, 11, 15, 18, 20]')
         print('Sorted order?  True')
+        print('\nUsage: {} external input output [type] [memory] [fan_in]'.format(script))
+        print('Sort a file larger than memory with external merge sort')
+        print('\nUsage: {} benchmark max [output] [baseline] [sorts]'.format(script))
+        print('Benchmark sorting functions across input distributions and sizes')
+        print('\nUsage: {} count sort [num] [max]'.format(script))
+        print('Count comparisons, reads and writes made by a sorting function')
         return
 
     # Get sort function by name
     if len(args) >= 1:
         sort_name = args[0]
-        # Terrible hack abusing globals
-        if sort_name in globals():
-            sort_function = globals()[sort_name]
+        if sort_name in SORTS:
+            sort_function = SORTS[sort_name]
         else:
             # Don't explode, just warn user and show list of sorting functions
             print('Sorting function {!r} does not exist'.format(sort_name))
             print('Available sorting functions:')
-            for name in globals():
-                if 'sort' in name:
-                    print('    {}'.format(name))
+            for name in SORTS:
+                print('    {}'.format(name))
             return
 
     # Get num_items and max_value, but don't explode if input is not an integer
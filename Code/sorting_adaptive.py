@@ -0,0 +1,271 @@
+#!python
+
+from bisect import bisect_left, bisect_right
+
+from sorting_buffers import sortable_view, copy_range
+from sorting_iterative import binary_insertion_sort_range, sort_by_key
+
+# Lists shorter than this are sorted with one binary insertion sort, and
+# longer lists are split into runs of between MIN_MERGE / 2 and MIN_MERGE items
+MIN_MERGE = 64
+# Number of consecutive items taken from one run before a merge gallops
+MIN_GALLOP = 7
+
+
+def tim_sort(items, key=None, reverse=False):
+    """Sort given items in place with an adaptive natural merge sort (Timsort
+    style) and return them. Items are scanned left to right for runs already
+    in order: ascending runs, and strictly descending runs which are reversed
+    (strictly, so equal items keep their order). Runs shorter than a minimum
+    length are extended with binary insertion sort. Each run is pushed on a
+    stack whose run lengths must shrink faster than the Fibonacci numbers,
+    and adjacent runs are merged whenever that invariant would break, so
+    merges stay balanced and the stack stays O(log n) deep. Merges skip items
+    already in place, copy only the shorter run to a buffer, and switch to
+    galloping (exponential search) when one run keeps winning. Items are
+    compared by the given key function, in descending order if reverse is
+    True (see sort_by_key). Buffers such as array.array, mmap or NumPy arrays
+    are sorted directly through a memoryview (see sortable_view). The sort is
+    stable.
+    Best case running time: O(n) if items are already in ascending or
+    descending order (one run, n - 1 comparisons)
+    Worst case running time: O(n log n) in general, and O(n log r) for input
+    made of r runs
+    Memory usage: O(n) worst case for the merge buffer, half of all items"""
+    if key is not None or reverse:
+        return sort_by_key(tim_sort, items, key, reverse)
+    view = sortable_view(items)
+    length = len(view)
+    if length < 2:
+        return items
+    min_run = min_run_length(length)
+    runs = []  # Stack of (start index, length) of sorted runs to merge
+    low = 0
+    while low < length:
+        end = count_run(view, low, length)
+        if end - low < min_run:
+            # Extend a short run to the minimum length with insertion sort
+            forced_end = min(low + min_run, length)
+            binary_insertion_sort_range(view, low, forced_end, end)
+            end = forced_end
+        runs.append((low, end - low))
+        _merge_collapse(view, runs)
+        low = end
+    # Merge all remaining runs on the stack, from the top
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if index > 0 and runs[index - 1][1] < runs[index + 1][1]:
+            index -= 1
+        _merge_runs_at(view, runs, index)
+    return items
+
+
+def min_run_length(length):
+    """Return the minimum run length for sorting the given number of items:
+    a number between MIN_MERGE / 2 and MIN_MERGE such that length / min_run
+    is a power of 2 or slightly less, so the final merges are balanced.
+    Running time: O(log n)"""
+    extra = 0  # Becomes 1 if any bit shifted off is set
+    while length >= MIN_MERGE:
+        extra |= length & 1
+        length >>= 1
+    return length + extra
+
+
+def count_run(items, low, high):
+    """Return the end index of the run of items in order starting at index
+    low in range `[low...high-1]`. A strictly descending run is reversed in
+    place, so the run from low to the returned index is always ascending.
+    Running time: O(k) for a run of k items"""
+    end = low + 1
+    if end == high:
+        return end
+    if items[end] < items[low]:
+        while end + 1 < high and items[end + 1] < items[end]:
+            end += 1
+        end += 1
+        items[low:end] = items[low:end][::-1]
+    else:
+        while end + 1 < high and not items[end + 1] < items[end]:
+            end += 1
+        end += 1
+    return end
+
+
+def gallop_left(key, items, low, high, reverse=False):
+    """Return the first index in sorted range `[low...high-1]` whose item is
+    not less than the given key, like bisect_left, but first probing items at
+    exponentially growing distances from low (or from high if reverse is True)
+    to find a range to bisect. Running time: O(log k) when the index is k
+    items from where the search starts"""
+    step = 1
+    if not reverse:
+        start, probe = low, low
+        while probe < high and items[probe] < key:
+            start = probe + 1
+            probe = low + step
+            step = 2 * step + 1
+        return bisect_left(items, key, start, min(probe, high))
+    end, probe = high, high - 1
+    while probe >= low and not items[probe] < key:
+        end = probe
+        step *= 2
+        probe = high - step
+    return bisect_left(items, key, max(probe + 1, low), end)
+
+
+def gallop_right(key, items, low, high, reverse=False):
+    """Return the first index in sorted range `[low...high-1]` whose item is
+    greater than the given key, like bisect_right, but first probing items at
+    exponentially growing distances from low (or from high if reverse is True)
+    to find a range to bisect. Running time: O(log k) when the index is k
+    items from where the search starts"""
+    step = 1
+    if not reverse:
+        start, probe = low, low
+        while probe < high and not key < items[probe]:
+            start = probe + 1
+            probe = low + step
+            step = 2 * step + 1
+        return bisect_right(items, key, start, min(probe, high))
+    end, probe = high, high - 1
+    while probe >= low and key < items[probe]:
+        end = probe
+        step *= 2
+        probe = high - step
+    return bisect_right(items, key, max(probe + 1, low), end)
+
+
+def merge_runs(items, low, middle, high):
+    """Merge the adjacent sorted runs `[low...middle-1]` and `[middle...high-1]`
+    of given items in place. Items at the start of the left run that are not
+    greater than the right run's first item, and items at the end of the
+    right run that are not less than the left run's last item, are already in
+    place and skipped with galloping searches. Then the shorter of the
+    remaining runs is copied to a buffer and merged from that end.
+    Running time: O(n) worst case, O(log n) if the runs are already in order
+    Memory usage: O(min(m, n)) for runs of m and n items"""
+    low = gallop_right(items[middle], items, low, middle)
+    if low == middle:
+        return  # Runs are already in order
+    high = gallop_left(items[middle - 1], items, middle, high, reverse=True)
+    if middle - low <= high - middle:
+        _merge_low(items, low, middle, high)
+    else:
+        _merge_high(items, low, middle, high)
+
+
+def _merge_collapse(items, runs):
+    """Merge runs at the top of the given stack until their lengths satisfy
+    the invariants: each run is longer than the sum of the next two runs
+    above it, and each run is longer than the next run above it."""
+    while len(runs) > 1:
+        index = len(runs) - 2
+        if ((index > 0 and runs[index - 1][1] <= runs[index][1] + runs[index + 1][1]) or
+                (index > 1 and runs[index - 2][1] <= runs[index - 1][1] + runs[index][1])):
+            # Merge the middle run with the shorter of its neighbors
+            if runs[index - 1][1] < runs[index + 1][1]:
+                index -= 1
+        elif runs[index][1] > runs[index + 1][1]:
+            break  # Invariants hold
+        _merge_runs_at(items, runs, index)
+
+
+def _merge_runs_at(items, runs, index):
+    """Merge the runs at the given index and the next index of the given
+    stack of runs, and replace them with the merged run on the stack."""
+    low, left_length = runs[index]
+    middle, right_length = runs[index + 1]
+    runs[index] = (low, left_length + right_length)
+    del runs[index + 1]
+    merge_runs(items, low, middle, middle + right_length)
+
+
+def _merge_low(items, low, middle, high):
+    """Merge the adjacent sorted runs `[low...middle-1]` and `[middle...high-1]`
+    of given items from left to right, copying the left run to a buffer. The
+    first item of the right run must be less than the first of the left run,
+    and the last item of the left run greater than the last of the right."""
+    buffer = copy_range(items, low, middle)
+    left, left_end = 0, middle - low
+    right, index = middle, low
+    while left < left_end and right < high:
+        # Take one item at a time until one run wins MIN_GALLOP times in a row
+        left_wins = right_wins = 0
+        while left < left_end and right < high:
+            if items[right] < buffer[left]:
+                items[index] = items[right]
+                right += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                items[index] = buffer[left]
+                left += 1
+                left_wins += 1
+                right_wins = 0
+            index += 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+        # Gallop: copy whole slices of each run, until both slices are short
+        while left < left_end and right < high:
+            end = gallop_right(items[right], buffer, left, left_end)
+            count = end - left
+            items[index:index + count] = buffer[left:end]
+            index += count
+            left = end
+            if left == left_end:
+                break
+            end = gallop_left(buffer[left], items, right, high)
+            right_count = end - right
+            items[index:index + right_count] = items[right:end]
+            index += right_count
+            right = end
+            if count < MIN_GALLOP and right_count < MIN_GALLOP:
+                break
+    # Copy the rest of the left run, since the rest of the right is in place
+    items[index:index + left_end - left] = buffer[left:left_end]
+
+
+def _merge_high(items, low, middle, high):
+    """Merge the adjacent sorted runs `[low...middle-1]` and `[middle...high-1]`
+    of given items from right to left, copying the right run to a buffer. The
+    first item of the right run must be less than the first of the left run,
+    and the last item of the left run greater than the last of the right."""
+    buffer = copy_range(items, middle, high)
+    left, right = middle - 1, high - middle - 1
+    index = high - 1
+    while left >= low and right >= 0:
+        # Take one item at a time until one run wins MIN_GALLOP times in a row
+        left_wins = right_wins = 0
+        while left >= low and right >= 0:
+            if buffer[right] < items[left]:
+                items[index] = items[left]
+                left -= 1
+                left_wins += 1
+                right_wins = 0
+            else:
+                items[index] = buffer[right]
+                right -= 1
+                right_wins += 1
+                left_wins = 0
+            index -= 1
+            if left_wins >= MIN_GALLOP or right_wins >= MIN_GALLOP:
+                break
+        # Gallop: copy whole slices of each run, until both slices are short
+        while left >= low and right >= 0:
+            start = gallop_right(buffer[right], items, low, left + 1, reverse=True)
+            count = left + 1 - start
+            items[index - count + 1:index + 1] = items[start:left + 1]
+            index -= count
+            left = start - 1
+            if left < low:
+                break
+            start = gallop_left(items[left], buffer, 0, right + 1, reverse=True)
+            right_count = right + 1 - start
+            items[index - right_count + 1:index + 1] = buffer[start:right + 1]
+            index -= right_count
+            right = start - 1
+            if count < MIN_GALLOP and right_count < MIN_GALLOP:
+                break
+    # Copy the rest of the right run, since the rest of the left is in place
+    items[low:low + right + 1] = buffer[0:right + 1]
@@ -0,0 +1,208 @@
+#!python
+
+import csv
+import itertools
+import json
+import random
+import time
+
+from sorting_iterative import is_sorted
+
+
+def uniform_ints(size, rng):
+    """Return a list of integers sampled uniformly from range [0...size)."""
+    return [rng.randrange(size) for _ in range(size)]
+
+
+def sorted_ints(size, rng):
+    """Return a list of integers in ascending order."""
+    return list(range(size))
+
+
+def reversed_ints(size, rng):
+    """Return a list of integers in descending order."""
+    return list(range(size, 0, -1))
+
+
+def few_unique_ints(size, rng):
+    """Return a list of integers sampled uniformly from range [0...10)."""
+    return [rng.randrange(10) for _ in range(size)]
+
+
+def organ_pipe_ints(size, rng):
+    """Return a list of integers ascending to the middle, then descending."""
+    half = size // 2
+    return list(range(half)) + list(range(size - half, 0, -1))
+
+
+def nearly_sorted_ints(size, rng):
+    """Return a list of integers in ascending order with 1% of them swapped
+    with random other items."""
+    items = list(range(size))
+    for _ in range(max(1, size // 100)):
+        index1, index2 = rng.randrange(size), rng.randrange(size)
+        items[index1], items[index2] = items[index2], items[index1]
+    return items
+
+
+def zipf_ints(size, rng, exponent=1.1):
+    """Return a list of integers sampled from range [1...size] with a Zipf
+    distribution: each integer k is drawn with probability proportional to
+    1 / k^exponent, so a few small integers make up most of the list."""
+    cum_weights = list(itertools.accumulate(1 / k ** exponent for k in range(1, size + 1)))
+    return rng.choices(range(1, size + 1), cum_weights=cum_weights, k=size)
+
+
+# Functions to generate input lists of a given size, by distribution name
+DISTRIBUTIONS = {
+    'uniform': uniform_ints,
+    'sorted': sorted_ints,
+    'reversed': reversed_ints,
+    'few_unique': few_unique_ints,
+    'organ_pipe': organ_pipe_ints,
+    'nearly_sorted': nearly_sorted_ints,
+    'zipf': zipf_ints,
+}
+
+# Names of sorts with O(n^2) running time on some distribution
+QUADRATIC_SORTS = {'bubble_sort', 'selection_sort', 'insertion_sort'}
+
+# Columns of each benchmark result, in output order
+FIELDS = ['algorithm', 'distribution', 'size', 'repeats', 'min', 'median', 'status']
+
+
+def benchmark_sizes(max_size, min_size=10):
+    """Return a list of sizes from min_size to max_size, by factors of 10."""
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def time_sort(sort, items, repeats, min_seconds=0.01):
+    """Time sorting new copies of the given items with the given sort function
+    the given number of times and return the minimum and median times per sort
+    in seconds, and whether every result was in sorted order. Each repetition
+    sorts as many copies as take at least min_seconds in total (calibrated by
+    the first sort), so timings of small inputs are not just timer noise."""
+    copy = list(items)
+    start_time = time.perf_counter()
+    sort(copy)
+    seconds = time.perf_counter() - start_time
+    correct = len(copy) == len(items) and is_sorted(copy)
+    number = max(1, min(10000, int(min_seconds / seconds))) if seconds > 0 else 10000
+    times = []
+    for _ in range(repeats):
+        copies = [list(items) for _ in range(number)]
+        start_time = time.perf_counter()
+        for copy in copies:
+            sort(copy)
+        times.append((time.perf_counter() - start_time) / number)
+        correct = correct and is_sorted(copies[-1])
+    times.sort()
+    return times[0], times[len(times) // 2], correct
+
+
+def run_matrix(sorts, distributions=None, sizes=None, repeats=3, timeout=10.0,
+               seed=0, progress=None):
+    """Time each of the given sort functions (a dict of sorts by name) on each
+    input distribution and size, and return a list of result dicts with the
+    keys in FIELDS. Every sort gets the same input for a distribution and size.
+    A sort is skipped at sizes where its time, extrapolated from its last size
+    (quadratically for QUADRATIC_SORTS, linearly otherwise), would exceed the
+    given timeout in seconds. Status is 'ok', 'wrong' if a result was not in
+    sorted order, or 'skipped'. If given, progress is called with each result."""
+    if distributions is None:
+        distributions = list(DISTRIBUTIONS)
+    if sizes is None:
+        sizes = benchmark_sizes(10 ** 5)
+    results = []
+    for distribution in distributions:
+        # Last size and median time of each sort, to extrapolate from
+        last_times = {}
+        for size in sizes:
+            rng = random.Random('{}:{}:{}'.format(seed, distribution, size))
+            items = DISTRIBUTIONS[distribution](size, rng)
+            for name, sort in sorts.items():
+                result = {'algorithm': name, 'distribution': distribution,
+                          'size': size, 'repeats': 0, 'min': None,
+                          'median': None, 'status': 'skipped'}
+                if name in last_times:
+                    last_size, last_time = last_times[name]
+                    exponent = 2 if name in QUADRATIC_SORTS else 1
+                    if last_time * (size / last_size) ** exponent > timeout:
+                        results.append(result)
+                        if progress:
+                            progress(result)
+                        continue
+                minimum, median, correct = time_sort(sort, items, repeats)
+                last_times[name] = (size, median)
+                result.update(repeats=repeats, min=minimum, median=median,
+                              status='ok' if correct else 'wrong')
+                results.append(result)
+                if progress:
+                    progress(result)
+    return results
+
+
+def write_results(results, path):
+    """Write the given results to a file at the given path, as CSV if its name
+    ends with .csv or as JSON otherwise."""
+    with open(path, 'w', newline='') as file:
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(file, FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        else:
+            json.dump(results, file, indent=1)
+
+
+def read_results(path):
+    """Return a list of results read from a JSON or CSV file written by
+    write_results at the given path."""
+    with open(path, newline='') as file:
+        if not path.endswith('.csv'):
+            return json.load(file)
+        results = []
+        for row in csv.DictReader(file):
+            row['size'] = int(row['size'])
+            row['repeats'] = int(row['repeats'])
+            for field in ['min', 'median']:
+                row[field] = float(row[field]) if row[field] else None
+            results.append(row)
+        return results
+
+
+def compare_results(results, baseline, tolerance=0.2):
+    """Return a list of (result, baseline time, ratio) tuples for each of the
+    given results whose minimum time (the least noisy) is more than the given
+    tolerance (a fraction) slower than the result for the same algorithm,
+    distribution and size in the given baseline results, and (result, baseline
+    time, None) for each result that was correct in the baseline but is not."""
+    base = {(result['algorithm'], result['distribution'], result['size']): result
+            for result in baseline}
+    regressions = []
+    for result in results:
+        old = base.get((result['algorithm'], result['distribution'], result['size']))
+        if old is None or old['status'] != 'ok':
+            continue
+        if result['status'] == 'wrong':
+            regressions.append((result, old['min'], None))
+        elif result['status'] == 'ok' and old['min']:
+            ratio = result['min'] / old['min']
+            if ratio > 1 + tolerance:
+                regressions.append((result, old['min'], ratio))
+    return regressions
+
+
+def format_result(result):
+    """Return a line of text showing the given result."""
+    if result['status'] == 'skipped':
+        timing = '{:>12} {:>12}'.format('-', '-')
+    else:
+        timing = '{:>12.6f} {:>12.6f}'.format(result['min'], result['median'])
+    return '{:<16} {:<14} {:>9} {} {}'.format(
+        result['algorithm'], result['distribution'], result['size'], timing,
+        result['status'])
@@ -0,0 +1,52 @@
+#!python
+
+from array import array
+
+
+def sortable_view(items):
+    """Return the given items if they are a list, or else a writable flat
+    memoryview of them if they support the buffer protocol, such as an
+    array.array, bytearray, mmap or NumPy array. Sorts index and slice the
+    view directly, so they sort the underlying memory in place without ever
+    converting it to a list of Python objects. A view of raw bytes, such as an
+    mmap of int64s, must be cast to its item format first, as in
+    memoryview(mapped).cast('q'). Other sequences are returned unchanged."""
+    if isinstance(items, list):
+        return items
+    try:
+        view = memoryview(items)
+    except TypeError:
+        return items  # Not a buffer, so sort it as a mutable sequence
+    if view.readonly:
+        raise TypeError('Cannot sort a read-only buffer in place')
+    if view.ndim != 1:
+        if not view.c_contiguous:
+            raise TypeError('Cannot sort a non-contiguous buffer in place')
+        view = view.cast('B').cast(view.format)
+    return view
+
+
+def assign_slice(items, start, stop, values):
+    """Replace range `[start...stop-1]` of the given items (a list or a view
+    from sortable_view) with the given list of values."""
+    if isinstance(items, memoryview):
+        values = array(items.format, values)
+    items[start:stop] = values
+
+
+def copy_range(items, start, stop):
+    """Return a copy of range `[start...stop-1]` of the given items (a list or
+    a view from sortable_view) of the same kind: a list, or a view of a copy
+    of the memory, since slicing a view does not copy it."""
+    if isinstance(items, memoryview):
+        return memoryview(bytearray(items[start:stop])).cast(items.format)
+    return items[start:stop]
+
+
+def new_buffer(items):
+    """Return a new buffer with room for as many items as the given items (a
+    list or a view from sortable_view), of the same kind: a list of None, or
+    a view of zeroed memory with the same item format."""
+    if isinstance(items, memoryview):
+        return memoryview(bytearray(items.nbytes)).cast(items.format)
+    return [None] * len(items)
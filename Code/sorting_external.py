@@ -0,0 +1,165 @@
+#!python
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from binaryheap import BinaryMinHeap
+
+
+def line_text(line):
+    """Return the given line without its trailing newline, so lines compare as
+    strings in the same order as the text they contain."""
+    return line[:-1]
+
+
+# Bytes of pointers held for each buffered line while a run is sorted: its
+# slot in the chunk list, its key's slot in the sort's key array, and up to
+# one more for the sort's merge space and the chunk list's overallocation
+RECORD_POINTER_BYTES = 3 * 8
+
+
+# Functions to parse each line of a file into a sort key, by type name
+KEY_TYPES = {
+    'int': int,
+    'float': float,
+    'str': line_text,
+}
+
+
+def external_sort(input_path, output_path, key_type='int', memory=64 << 20,
+                  fan_in=16, buffer_size=1 << 16, temp_dir=None):
+    """Sort the lines of the given input file, which may be much larger than
+    the given memory budget in bytes, into the given output file, comparing
+    lines as integers, floats or strings according to the given key type.
+    First, the input is read sequentially in chunks that fit in about memory
+    bytes of Python objects, and each chunk is sorted in memory and written to
+    a temporary file as a sorted run. The budget limits the memory of each
+    buffered chunk while it is sorted: for each line, the size of its str
+    object, the size of its sort key and the pointers to them (see
+    _record_size), which is several times the length of the line's text. It
+    does not include the file buffers, or the interpreter itself. Then, up to
+    fan_in runs at a time are merged into longer runs with a k-way merge,
+    until one run remains: the sorted output. All files are read and written
+    sequentially with buffers of buffer_size bytes.
+    Return a dict of statistics: number of items, number of initial runs,
+    number of merge passes, elapsed seconds and items sorted per second.
+    Running time: O(n log n) comparisons and O(n log_k r) items read and
+    written for n items in r runs merged k at a time.
+    Memory usage: about memory + fan_in * buffer_size bytes."""
+    if key_type not in KEY_TYPES:
+        raise ValueError('Unsupported key type: {!r}'.format(key_type))
+    if fan_in < 2:
+        raise ValueError('Merge fan-in must be at least 2: {}'.format(fan_in))
+    key = KEY_TYPES[key_type]
+    start_time = time.perf_counter()
+    work_dir = tempfile.mkdtemp(prefix='external_sort_', dir=temp_dir)
+    try:
+        runs, num_items = _write_sorted_runs(input_path, work_dir, key, memory,
+                                             buffer_size)
+        num_runs = len(runs)
+        passes = 0
+        while len(runs) > 1:
+            # Merge groups of up to fan_in runs into fewer, longer runs
+            passes += 1
+            merged_runs = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                if len(runs) <= fan_in:
+                    path = output_path  # Final pass writes the output file
+                else:
+                    path = os.path.join(work_dir, 'pass{}_{}'.format(passes, start))
+                merge_runs(group, path, key, buffer_size)
+                for run in group:
+                    os.remove(run)
+                merged_runs.append(path)
+            runs = merged_runs
+        if num_runs == 1:
+            shutil.move(runs[0], output_path)
+        elif num_runs == 0:
+            open(output_path, 'w').close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    seconds = time.perf_counter() - start_time
+    return {
+        'items': num_items,
+        'runs': num_runs,
+        'passes': passes,
+        'seconds': seconds,
+        'items_per_second': num_items / seconds if seconds > 0 else 0.0,
+    }
+
+
+def _write_sorted_runs(input_path, work_dir, key, memory, buffer_size):
+    """Read the given input file in chunks of lines whose records (see
+    _record_size) total about memory bytes, sort each chunk and write it to a
+    new file in the given directory. Return a list of the paths of the sorted
+    runs and the total number of lines."""
+    runs = []
+    num_items = 0
+    with open(input_path, buffering=buffer_size) as file:
+        chunk = []
+        chunk_bytes = 0
+        for line in file:
+            if not line.endswith('\n'):
+                line += '\n'  # Last line of a file may not end with a newline
+            chunk.append(line)
+            chunk_bytes += _record_size(line, key)
+            if chunk_bytes >= memory:
+                runs.append(_write_run(chunk, work_dir, len(runs), key, buffer_size))
+                num_items += len(chunk)
+                chunk = []
+                chunk_bytes = 0
+        if chunk:
+            runs.append(_write_run(chunk, work_dir, len(runs), key, buffer_size))
+            num_items += len(chunk)
+    return runs, num_items
+
+
+def _record_size(line, key):
+    """Return the number of bytes of memory the given line takes up while a
+    chunk holding it is sorted: its str object, the sort key computed from it
+    by the given key function, and the pointers to both. The key is computed
+    here only to measure it, since its size depends on its value."""
+    return sys.getsizeof(line) + sys.getsizeof(key(line)) + RECORD_POINTER_BYTES
+
+
+def _write_run(lines, work_dir, index, key, buffer_size):
+    """Sort the given lines and write them to a new run file in the given
+    directory, and return its path."""
+    lines.sort(key=key)
+    path = os.path.join(work_dir, 'run{}'.format(index))
+    with open(path, 'w', buffering=buffer_size) as file:
+        file.writelines(lines)
+    return path
+
+
+def merge_runs(paths, output_path, key=line_text, buffer_size=1 << 16):
+    """Merge the given files of sorted lines into the given output file with
+    a k-way merge: a min heap holds the next line of each file, ordered by key
+    and then by file index (so the merge is stable), and each line written is
+    replaced by the next line of its file with one bubble down (replace_min).
+    Every line in the files must end with a newline.
+    Running time: O(n log k) for n lines in k files."""
+    files = [open(path, buffering=buffer_size) for path in paths]
+    try:
+        entries = []
+        for index, file in enumerate(files):
+            line = file.readline()
+            if line:
+                entries.append((key(line), index, line))
+        heap = BinaryMinHeap(entries)
+        with open(output_path, 'w', buffering=buffer_size) as output:
+            while not heap.is_empty():
+                _, index, line = heap.get_min()
+                output.write(line)
+                next_line = files[index].readline()
+                if next_line:
+                    heap.replace_min((key(next_line), index, next_line))
+                else:
+                    heap.delete_min()
+    finally:
+        for file in files:
+            file.close()
@@ -0,0 +1,199 @@
+#!python
+
+import sys
+import time
+import tracemalloc
+
+
+class CountingKey(object):
+    """CountingKey: a wrapper around an item that compares like the item, and
+    counts each comparison in the given stats. Sorting wrapped items counts
+    the comparisons made by a sorting algorithm without changing its code."""
+
+    __slots__ = ('item', 'stats')
+
+    def __init__(self, item, stats):
+        """Initialize this wrapper with the given item and stats to count in."""
+        self.item = item
+        self.stats = stats
+
+    def __repr__(self):
+        """Return a code representation of this wrapper."""
+        return 'CountingKey({!r})'.format(self.item)
+
+    def __lt__(self, other):
+        """Count a comparison and return this item < the other item."""
+        self.stats.comparisons += 1
+        return self.item < other.item
+
+    def __le__(self, other):
+        """Count a comparison and return this item <= the other item."""
+        self.stats.comparisons += 1
+        return self.item <= other.item
+
+    def __gt__(self, other):
+        """Count a comparison and return this item > the other item."""
+        self.stats.comparisons += 1
+        return self.item > other.item
+
+    def __ge__(self, other):
+        """Count a comparison and return this item >= the other item."""
+        self.stats.comparisons += 1
+        return self.item >= other.item
+
+    def __eq__(self, other):
+        """Count a comparison and return this item == the other item."""
+        self.stats.comparisons += 1
+        return self.item == other.item
+
+    def __ne__(self, other):
+        """Count a comparison and return this item != the other item."""
+        self.stats.comparisons += 1
+        return self.item != other.item
+
+    __hash__ = None
+
+
+class CountingList(list):
+    """CountingList: a list that counts each item read from it and written to
+    it by indexing or slicing in the given stats. Only accesses to this list
+    are counted, not to auxiliary lists a sorting algorithm creates."""
+
+    def __init__(self, items, stats):
+        """Initialize this list with the given items and stats to count in."""
+        super(CountingList, self).__init__(items)
+        self.stats = stats
+
+    def __getitem__(self, index):
+        """Count the items read and return the item or slice at the index."""
+        result = super(CountingList, self).__getitem__(index)
+        self.stats.reads += len(result) if isinstance(index, slice) else 1
+        return result
+
+    def __iter__(self):
+        """Count the items read while iterating over this list."""
+        for item in super(CountingList, self).__iter__():
+            self.stats.reads += 1
+            yield item
+
+    def __setitem__(self, index, value):
+        """Count the items written and set the item or slice at the index."""
+        if isinstance(index, slice):
+            value = list(value)
+            self.stats.writes += len(value)
+        else:
+            self.stats.writes += 1
+        super(CountingList, self).__setitem__(index, value)
+
+
+class SortStats(object):
+    """SortStats: a context manager that measures a sorting algorithm run
+    inside it. Comparisons, reads and writes are counted by sorting a list
+    made with wrap, whose items are CountingKeys in a CountingList. While the
+    context is active, peak memory allocated (with tracemalloc) and the
+    maximum depth of nested Python calls (with a profile function) are also
+    tracked, if enabled. Nothing is measured outside the context, and sorting
+    functions are not changed, so there is no overhead when it is not used."""
+
+    def __init__(self, memory=True, depth=True):
+        """Initialize these stats to track peak memory and call depth or not."""
+        self.memory = memory
+        self.depth = depth
+        self.comparisons = 0
+        self.reads = 0
+        self.writes = 0
+        self.peak_memory = 0
+        self.max_depth = 0
+        self.seconds = 0.0
+        self._depth = 0
+        self._start_time = None
+        self._started_tracemalloc = False
+        self._previous_profile = None
+        # Calls to wrapper methods and this context manager's own methods are
+        # not counted in the call depth
+        self._ignored_codes = {method.__code__ for method in [
+            CountingKey.__lt__, CountingKey.__le__, CountingKey.__gt__,
+            CountingKey.__ge__, CountingKey.__eq__, CountingKey.__ne__,
+            CountingList.__getitem__, CountingList.__setitem__,
+            CountingList.__iter__, SortStats.__enter__, SortStats.__exit__]}
+
+    def __repr__(self):
+        """Return a string representation of these stats."""
+        return 'SortStats({!r})'.format(self.report())
+
+    def wrap(self, items, compare=True):
+        """Return a CountingList of the given items, each wrapped in a
+        CountingKey unless compare is False (for sorts that do arithmetic on
+        items, such as counting sort, so only reads and writes are counted)."""
+        if compare:
+            items = [CountingKey(item, self) for item in items]
+        return CountingList(items, self)
+
+    def unwrap(self, counted):
+        """Return a plain list of the original items in the given list made
+        with wrap, in its current order, without counting any reads."""
+        items = list.__iter__(counted)
+        return [item.item if type(item) is CountingKey else item for item in items]
+
+    def report(self):
+        """Return a dict of the counts and measurements of these stats."""
+        return {
+            'comparisons': self.comparisons,
+            'reads': self.reads,
+            'writes': self.writes,
+            'peak_memory': self.peak_memory,
+            'max_depth': self.max_depth,
+            'seconds': self.seconds,
+        }
+
+    def __enter__(self):
+        """Start tracking memory and call depth, and return these stats."""
+        if self.memory:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        if self.depth:
+            self._depth = 0
+            self._previous_profile = sys.getprofile()
+            sys.setprofile(self._profile)
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop tracking memory and call depth, and record the measurements."""
+        self.seconds += time.perf_counter() - self._start_time
+        if self.depth:
+            sys.setprofile(self._previous_profile)
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1] - self._memory_start
+            self.peak_memory = max(self.peak_memory, peak)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+        return False
+
+    def _profile(self, frame, event, arg):
+        """Track the depth of nested Python function calls (a profile function
+        for sys.setprofile)."""
+        if event == 'call':
+            if frame.f_code not in self._ignored_codes:
+                self._depth += 1
+                if self._depth > self.max_depth:
+                    self.max_depth = self._depth
+        elif event == 'return':
+            if frame.f_code not in self._ignored_codes:
+                self._depth -= 1
+
+
+def measure_sort(sort, items, compare=True, memory=True, depth=True):
+    """Sort the given items in place with the given sort function and return
+    SortStats of the comparisons, reads and writes it made, its peak memory
+    allocated and its maximum call depth (including the call to sort itself).
+    Set compare to False for sorts that do arithmetic on items."""
+    stats = SortStats(memory, depth)
+    counted = stats.wrap(items, compare)
+    with stats:
+        sort(counted)
+    items[:] = stats.unwrap(counted)
+    return stats
@@ -1,26 +1,284 @@
 #!python
 
+try:
+    import numpy
+except ImportError:  # NumPy is optional, only used to speed up large inputs
+    numpy = None
 
-def counting_sort(numbers):
+from sorting_buffers import sortable_view, assign_slice, new_buffer
+from sorting_recursive import insertion_sort_range, quick_sort
+
+# Inputs with at least this many numbers are sorted with NumPy, if installed
+NUMPY_THRESHOLD = 1 << 16
+# Smallest and largest integers that fit in a NumPy int64 array
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+# Number of numbers bucket sort aims to place in each bucket, on average
+ITEMS_PER_BUCKET = 4
+# Buckets with more than this many numbers are sorted with quick sort
+BUCKET_SORT_CUTOFF = 32
+
+
+def counting_sort(numbers, key=None, reverse=False):
     """Sort given numbers (integers) by counting occurrences of each number,
-    then looping over counts and copying that many numbers into output list.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Find range of given numbers (minimum and maximum integer values)
-    # TODO: Create list of counts with a slot for each number in input range
-    # TODO: Loop over given numbers and increment each number's count
-    # TODO: Loop over counts and append that many numbers into output list
-    # FIXME: Improve this to mutate input instead of creating new output list
+    then looping over counts and copying that many numbers back into the
+    given list, at the index given by the running total (prefix sum) of the
+    counts of all smaller numbers. The list is mutated in place, as are
+    buffers such as array.array, mmap or NumPy arrays, through a memoryview
+    (see sortable_view). Given a key function returning integers, or reverse,
+    items are placed by their keys instead (see _counting_sort_by_key), and
+    the sort is stable.
+    Running time: O(n + k) for n numbers in a range of k integers, as both
+    the numbers and the counts are looped over once. This is only better than
+    comparison sorting if k is not much larger than n log n; for wider
+    ranges, use radix_sort instead.
+    Memory usage: O(k) for the list of counts, no matter how many numbers."""
+    numbers = sortable_view(numbers)
+    if len(numbers) <= 1:
+        return
+    if key is not None or reverse:
+        _counting_sort_by_key(numbers, _integer_keys(numbers, key, reverse))
+        return
+    minimum, maximum = min(numbers), max(numbers)
+    if _use_numpy(numbers, minimum, maximum):
+        array = numpy.asarray(numbers, dtype=numpy.int64)
+        counts = numpy.bincount(array - minimum)
+        values = numpy.arange(minimum, maximum + 1, dtype=numpy.int64)
+        _write_back(numbers, numpy.repeat(values, counts))
+        return
+    # Create list of counts with a slot for each number in input range
+    counts = [0] * (maximum - minimum + 1)
+    for number in numbers:
+        counts[number - minimum] += 1
+    # Copy each number into its range of indexes, which starts at the prefix
+    # sum of the counts of all smaller numbers
+    start = 0
+    for offset, count in enumerate(counts):
+        if count:
+            assign_slice(numbers, start, start + count, [minimum + offset] * count)
+            start += count
 
 
-def bucket_sort(numbers, num_buckets=10):
+def bucket_sort(numbers, num_buckets=None, key=None, reverse=False):
     """Sort given numbers by distributing into buckets representing subranges,
-    then sorting each bucket and concatenating all buckets in sorted order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-    # TODO: Find range of given numbers (minimum and maximum values)
-    # TODO: Create list of buckets to store numbers in subranges of input range
-    # TODO: Loop over given numbers and place each item in appropriate bucket
-    # TODO: Sort each bucket using any sorting algorithm (recursive or another)
-    # TODO: Loop over buckets and append each bucket's numbers into output list
-    # FIXME: Improve this to mutate input instead of creating new output list
+    then sorting each bucket and copying all buckets in sorted order back into
+    the given list, which is mutated in place. If num_buckets is not given, it
+    adapts to the input size so each bucket holds ITEMS_PER_BUCKET numbers on
+    average. Small buckets are sorted with insertion sort and large buckets
+    (from skewed input) with quick sort. Buffers are sorted through a
+    memoryview (see sortable_view). Given a key function returning
+    numbers, or reverse, items are distributed by their keys instead (see
+    _bucket_sort_by_key), and the sort is stable.
+    Running time: O(n) on average if numbers are uniformly distributed, as
+    each bucket holds O(1) numbers; O(n log n) worst case if they are skewed
+    so most numbers land in a few buckets.
+    Memory usage: O(n + b) for n numbers in b buckets."""
+    numbers = sortable_view(numbers)
+    length = len(numbers)
+    if length <= 1:
+        return
+    if num_buckets is None:
+        num_buckets = max(1, length // ITEMS_PER_BUCKET)
+    if key is not None or reverse:
+        _bucket_sort_by_key(numbers, _integer_keys(numbers, key, reverse),
+                            num_buckets)
+        return
+    minimum, maximum = min(numbers), max(numbers)
+    if minimum == maximum:
+        return  # All numbers are equal, so they are already sorted
+    # Create list of buckets to store numbers in subranges of input range
+    buckets = [[] for _ in range(num_buckets)]
+    # Scale maps the input range onto bucket indexes, so each bucket's
+    # numbers are all less than or equal to the next bucket's numbers
+    scale = num_buckets / (maximum - minimum)
+    last = num_buckets - 1
+    for number in numbers:
+        index = int((number - minimum) * scale)
+        buckets[index if index < last else last].append(number)
+    # Sort each bucket and copy it into its range of indexes
+    start = 0
+    for bucket in buckets:
+        count = len(bucket)
+        if count > BUCKET_SORT_CUTOFF:
+            quick_sort(bucket)
+        elif count > 1:
+            insertion_sort_range(bucket, 0, count - 1)
+        assign_slice(numbers, start, start + count, bucket)
+        start += count
+
+
+def radix_sort(numbers, digit_bits=8, key=None, reverse=False):
+    """Sort given numbers (integers, possibly negative) with least significant
+    digit first radix sort: each pass distributes the numbers into 2^digit_bits
+    buckets by one digit of the number minus the minimum number (so all digits
+    are non-negative), keeping their order from the previous pass, until every
+    digit is done. The list is mutated in place. Given a key function
+    returning integers, or reverse, the indexes of items are distributed by
+    the digits of their keys instead, and the items are put back in the order
+    of the sorted indexes. Buffers such as array.array, mmap or NumPy arrays
+    are sorted through a memoryview (see sortable_view), scattering numbers
+    by digit into a second buffer instead of lists (see _radix_sort_view).
+    The sort is stable.
+    Running time: O(d * (n + 2^b)) for n numbers in a range of k integers with
+    d = log(k) / b passes of b-bit digits, so it handles ranges far too wide
+    for counting sort, such as 64-bit timestamps, in a fixed number of passes.
+    Memory usage: O(n + 2^b) for the buckets of one pass."""
+    if digit_bits < 1:
+        raise ValueError('Digit size must be at least 1 bit: {}'.format(digit_bits))
+    numbers = sortable_view(numbers)
+    if len(numbers) <= 1:
+        return
+    if key is not None or reverse:
+        keys = _integer_keys(numbers, key, reverse)
+        order = _radix_sort_indexes(keys, digit_bits)
+        assign_slice(numbers, 0, len(numbers), [numbers[index] for index in order])
+        return
+    minimum, maximum = min(numbers), max(numbers)
+    span_bits = (maximum - minimum).bit_length()
+    if span_bits == 0:
+        return  # All numbers are equal, so they are already sorted
+    radix = 1 << digit_bits
+    mask = radix - 1
+    if _use_numpy(numbers, minimum, maximum) and digit_bits <= 16:
+        # Offsets from the minimum fit in uint64 even for the full int64 range
+        array = numpy.asarray(numbers, dtype=numpy.int64)
+        offsets = array.astype(numpy.uint64) - numpy.uint64(minimum & ((1 << 64) - 1))
+        digit_type = numpy.uint8 if digit_bits <= 8 else numpy.uint16
+        for shift in range(0, span_bits, digit_bits):
+            digits = ((offsets >> numpy.uint64(shift)) & numpy.uint64(mask)).astype(digit_type)
+            # Stable sort of 8 or 16 bit keys is a counting (radix) sort
+            order = numpy.argsort(digits, kind='stable')
+            array, offsets = array[order], offsets[order]
+        _write_back(numbers, array)
+        return
+    if isinstance(numbers, memoryview):
+        _radix_sort_view(numbers, minimum, span_bits, digit_bits)
+        return
+    items = list(numbers)
+    for shift in range(0, span_bits, digit_bits):
+        buckets = [[] for _ in range(radix)]
+        for number in items:
+            buckets[((number - minimum) >> shift) & mask].append(number)
+        items = [number for bucket in buckets for number in bucket]
+    numbers[:] = items
+
+
+def _integer_keys(numbers, key, reverse):
+    """Return a list of the keys of the given numbers, computed once each with
+    the given key function (or the numbers themselves), and negated if reverse
+    is True so that sorting keys in ascending order sorts numbers descending
+    while numbers with equal keys keep their order."""
+    keys = list(numbers) if key is None else [key(number) for number in numbers]
+    if reverse:
+        keys = [-number for number in keys]
+    return keys
+
+
+def _counting_sort_by_key(items, keys):
+    """Sort given items in place by the given parallel list of integer keys
+    with stable counting sort: the count of each key is turned into the
+    starting index for items with that key by a prefix sum, then each item is
+    placed at the next index for its key in a new list, in input order.
+    Running time: O(n + k) for n items with keys in a range of k integers
+    Memory usage: O(n + k) for the placed items and the list of counts"""
+    minimum = min(keys)
+    counts = [0] * (max(keys) - minimum + 1)
+    for key in keys:
+        counts[key - minimum] += 1
+    # Replace each count with the prefix sum of the counts before it
+    total = 0
+    for offset, count in enumerate(counts):
+        counts[offset] = total
+        total += count
+    placed = [None] * len(items)
+    for item, key in zip(items, keys):
+        index = counts[key - minimum]
+        placed[index] = item
+        counts[key - minimum] = index + 1
+    assign_slice(items, 0, len(items), placed)
+
+
+def _bucket_sort_by_key(items, keys, num_buckets):
+    """Sort given items in place by the given parallel list of number keys
+    with bucket sort: (key, index) pairs are distributed into buckets by key,
+    each bucket is sorted (by key, then index, so the sort is stable), and the
+    items are put back in the order of the sorted indexes.
+    Running time: O(n) on average for uniformly distributed keys
+    Memory usage: O(n + b) for n items in b buckets"""
+    minimum, maximum = min(keys), max(keys)
+    if minimum == maximum:
+        return  # All keys are equal, so items are already in stable order
+    buckets = [[] for _ in range(num_buckets)]
+    scale = num_buckets / (maximum - minimum)
+    last = num_buckets - 1
+    for index, key in enumerate(keys):
+        bucket_index = int((key - minimum) * scale)
+        buckets[bucket_index if bucket_index < last else last].append((key, index))
+    order = []
+    for bucket in buckets:
+        count = len(bucket)
+        if count > BUCKET_SORT_CUTOFF:
+            quick_sort(bucket)
+        elif count > 1:
+            insertion_sort_range(bucket, 0, count - 1)
+        order.extend(index for _, index in bucket)
+    assign_slice(items, 0, len(items), [items[index] for index in order])
+
+
+def _radix_sort_view(view, minimum, span_bits, digit_bits):
+    """Sort the integers in the given memoryview in place with least
+    significant digit first radix sort, given their minimum and the number of
+    bits in their range. Each pass counts the numbers with each digit, turns
+    the counts into starting indexes by a prefix sum, and scatters the numbers
+    into a second buffer of the same format in order, so the numbers are never
+    held in a list. The buffers swap roles after each pass."""
+    radix = 1 << digit_bits
+    mask = radix - 1
+    source, target = view, new_buffer(view)
+    for shift in range(0, span_bits, digit_bits):
+        counts = [0] * radix
+        for number in source:
+            counts[((number - minimum) >> shift) & mask] += 1
+        total = 0
+        for digit, count in enumerate(counts):
+            counts[digit] = total
+            total += count
+        for number in source:
+            digit = ((number - minimum) >> shift) & mask
+            target[counts[digit]] = number
+            counts[digit] += 1
+        source, target = target, source
+    if source is not view:
+        view[:] = source
+
+
+def _radix_sort_indexes(keys, digit_bits):
+    """Return a list of the indexes of the given integer keys, sorted stably
+    by key with least significant digit first radix sort of the indexes."""
+    order = list(range(len(keys)))
+    minimum = min(keys)
+    radix = 1 << digit_bits
+    mask = radix - 1
+    for shift in range(0, (max(keys) - minimum).bit_length(), digit_bits):
+        buckets = [[] for _ in range(radix)]
+        for index in order:
+            buckets[((keys[index] - minimum) >> shift) & mask].append(index)
+        order = [index for bucket in buckets for index in bucket]
+    return order
+
+
+def _use_numpy(numbers, minimum, maximum):
+    """Return True if NumPy is installed and the given integers are enough to
+    benefit from it and all fit in an int64 array, or False otherwise."""
+    return (numpy is not None and len(numbers) >= NUMPY_THRESHOLD and
+            isinstance(minimum, int) and isinstance(maximum, int) and
+            INT64_MIN <= minimum and maximum <= INT64_MAX)
+
+
+def _write_back(numbers, array):
+    """Copy the given NumPy array of sorted numbers into the given list or
+    memoryview, converting its items back to Python ints for lists."""
+    if isinstance(numbers, list):
+        numbers[:] = array.tolist()
+    else:
+        numbers_array = numpy.asarray(numbers)
+        numbers_array[:] = array
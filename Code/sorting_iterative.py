@@ -1,3 +1,8 @@
+from bisect import bisect_right
+
+from sorting_buffers import sortable_view, assign_slice
+
+
 def is_sorted(items):
     """Return a boolean indicating whether given items are in sorted order.
     Time: O(N)
@@ -9,11 +14,41 @@ def is_sorted(items):
     return True
 
 
-def bubble_sort(items):
+def sort_by_key(sort, items, key=None, reverse=False):
+    """Sort given items in place with the given sort function by the given key
+    function (or the items themselves), in descending order if reverse is True,
+    and return them. Each key is computed exactly once and decorated with the
+    item's index into a (key, index) pair, the pairs are sorted, and the items
+    are put back in the order of the sorted indexes. Items with equal keys are
+    ordered by index, so the result is stable even if the sort is not, and
+    items themselves are never compared. For reverse order, indexes are
+    negated and the sorted pairs reversed, so equal items keep their order.
+    Time: O(N) plus the sort's time to sort N pairs
+    Space: O(N) for the pairs"""
+    view = sortable_view(items)
+    length = len(view)
+    keys = view if key is None else map(key, view)
+    if reverse:
+        pairs = list(zip(keys, range(0, -length, -1)))
+        sort(pairs)
+        pairs.reverse()
+        assign_slice(view, 0, length, [view[-index] for _, index in pairs])
+    else:
+        pairs = list(zip(keys, range(length)))
+        sort(pairs)
+        assign_slice(view, 0, length, [view[index] for _, index in pairs])
+    return items
+
+
+def bubble_sort(items, key=None, reverse=False):
     """Sort given items by swapping adjacent items that are out of order, and
-    repeating until all items are in sorted order.
+    repeating until all items are in sorted order. Items are compared by the
+    given key function, in descending order if reverse is True (see
+    sort_by_key).
     Time: O(N^2)
-    Space: O(1)"""
+    Space: O(1), or O(N) with a key function or reverse"""
+    if key is not None or reverse:
+        return sort_by_key(bubble_sort, items, key, reverse)
 
     for i in range(len(items)):
 
@@ -24,11 +59,15 @@ def bubble_sort(items):
     return items
 
 
-def selection_sort(items):
+def selection_sort(items, key=None, reverse=False):
     """Sort given items by finding minimum item, swapping it with first
-    unsorted item, and repeating until all items are in sorted order.
+    unsorted item, and repeating until all items are in sorted order. Items
+    are compared by the given key function, in descending order if reverse is
+    True (see sort_by_key), which also makes the sort stable.
     TODO: Running time: ??? Why and under what conditions?
     TODO: Memory usage: ??? Why and under what conditions?"""
+    if key is not None or reverse:
+        return sort_by_key(selection_sort, items, key, reverse)
     for i in range(len(items)):
 
         low_index = i
@@ -42,19 +81,93 @@ def selection_sort(items):
     return items
 
 
-def insertion_sort(items):
+def insertion_sort(items, key=None, reverse=False):
     """Sort given items by taking first unsorted item, inserting it in sorted
     order in front of items, and repeating until all items are in order.
-    TODO: Running time: ??? Why and under what conditions?
-    TODO: Memory usage: ??? Why and under what conditions?"""
-
-    for j in range(1, len(items)):
+    The insertion point is found with binary search and larger items are
+    shifted right with one slice assignment (see binary_insertion_sort_range).
+    Items are compared by the given key function, in descending order if
+    reverse is True (see sort_by_key). The sort is stable.
+    Time: O(N log N) comparisons and O(N^2) moves, but moves are memory copies
+    done in C, so it is fast up to a few hundred items, and O(N) if sorted
+    Space: O(1), or O(N) with a key function or reverse"""
+    if key is not None or reverse:
+        return sort_by_key(insertion_sort, items, key, reverse)
+    binary_insertion_sort_range(items, 0, len(items), 1)
+    return items
 
-        old_index = j
-        while j >= 0:
 
-            if items[j-1] > items[old_index] and j >= 1:
-                j -= 1
-            else:
-                items.insert(j, items.pop(old_index))
-                break
+def binary_insertion_sort_range(items, low, high, start):
+    """Sort given items in range `[low...high-1]` in place, where range
+    `[low...start-1]` is already sorted, by finding the position of each next
+    item with binary search and shifting the larger items right with one
+    slice assignment. Equal items are inserted after each other, so the sort
+    is stable.
+    Time: O(N log N) comparisons and O(N^2) moves, which are memory copies,
+    so it is fast for the short ranges it is used on
+    Space: O(1), items is modified in-place"""
+    for index in range(max(start, low + 1), high):
+        item = items[index]
+        if not item < items[index - 1]:
+            continue  # Item is already in order
+        position = bisect_right(items, item, low, index - 1)
+        items[position + 1:index + 1] = items[position:index]
+        items[position] = item
+
+
+def ciura_gaps(length):
+    """Return a list of gaps for Shell sort of the given number of items, from
+    largest to smallest: Ciura's experimentally best sequence, extended by
+    factors of 2.25 for large inputs.
+    Time: O(log N)"""
+    gaps = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+    while gaps[-1] < length:
+        gaps.append(int(gaps[-1] * 2.25))
+    return [gap for gap in reversed(gaps) if gap < length] or [1]
+
+
+def tokuda_gaps(length):
+    """Return a list of gaps for Shell sort of the given number of items, from
+    largest to smallest: Tokuda's sequence ceil((9 (9/4)^k - 4) / 5).
+    Time: O(log N)"""
+    gaps = []
+    power = 1.0  # (9/4)^k
+    gap = 1
+    while gap < length or not gaps:
+        gaps.append(gap)
+        power *= 2.25
+        gap = -int(-(9 * power - 4) // 5)  # Round up
+    return gaps[::-1]
+
+
+# Functions to generate Shell sort gap sequences, by name
+GAP_SEQUENCES = {
+    'ciura': ciura_gaps,
+    'tokuda': tokuda_gaps,
+}
+
+
+def shell_sort(items, gaps='ciura', key=None, reverse=False):
+    """Sort given items with Shell sort: insertion sort of the items that are
+    gap apart, for each gap in a decreasing sequence ending with 1, named by
+    gaps ('ciura' or 'tokuda'). Large gaps move items long distances in few
+    steps, so the final insertion sort has little left to do. Items are
+    compared by the given key function, in descending order if reverse is
+    True (see sort_by_key), which also makes the sort stable.
+    Time: about O(N^(4/3)) on average with these gaps, and O(N log N) if sorted
+    Space: O(1), or O(N) with a key function or reverse"""
+    if gaps not in GAP_SEQUENCES:
+        raise ValueError('Unknown gap sequence: {!r}'.format(gaps))
+    if key is not None or reverse:
+        return sort_by_key(lambda pairs: shell_sort(pairs, gaps), items, key, reverse)
+    length = len(items)
+    for gap in GAP_SEQUENCES[gaps](length):
+        # Insertion sort of each of the gap interleaved sublists at once
+        for index in range(gap, length):
+            item = items[index]
+            position = index
+            while position >= gap and item < items[position - gap]:
+                items[position] = items[position - gap]
+                position -= gap
+            items[position] = item
+    return items
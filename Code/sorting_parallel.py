@@ -0,0 +1,156 @@
+#!python
+
+import os
+from array import array
+from multiprocessing import Pool, shared_memory
+
+from sorting_recursive import merge, merge_sort
+
+# Lists with fewer than this many items are sorted in this process
+PARALLEL_THRESHOLD = 1 << 14
+
+# Shared memory blocks attached by each worker process, and views of them
+_blocks = []
+_views = []
+
+
+def parallel_merge_sort(items, workers=None):
+    """Sort given items (all ints or all floats) in place with merge sort
+    across a pool of worker processes. The items are copied once into a block
+    of shared memory as a C array (int64 or double), split into one chunk per
+    worker, and each worker sorts its chunk with merge_sort. Then sorted runs
+    are merged in pairs, pass after pass, into a second shared block and back
+    until one run remains. Each merge is itself split across the workers by
+    co-ranking: for each piece of the output, a binary search finds how many
+    of its items come from each run, so every worker merges an equal share.
+    Workers only receive shared memory names and index ranges, so no item is
+    ever pickled. The sort is stable, and returns the given list.
+    Running time: O(n log n / p + n log p / p + p log n) with p workers
+    Memory usage: O(n) for two shared blocks, plus O(n / p) in each worker"""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('Number of workers must be positive: {}'.format(workers))
+    length = len(items)
+    if workers == 1 or length < PARALLEL_THRESHOLD:
+        return merge_sort(items)
+    typecode = _typecode(items)
+    itemsize = array(typecode).itemsize
+    blocks = [shared_memory.SharedMemory(create=True, size=length * itemsize)
+              for _ in range(2)]
+    views = []
+    try:
+        views.extend(block.buf.cast(typecode) for block in blocks)
+        views[0][:] = array(typecode, items)
+        names = [block.name for block in blocks]
+        with Pool(workers, _attach, (names, typecode)) as pool:
+            # Sort one chunk of items per worker
+            bounds = [length * index // workers for index in range(workers + 1)]
+            pool.starmap(_sort_chunk, zip(bounds, bounds[1:]))
+            runs = list(zip(bounds, bounds[1:]))
+            # Merge pairs of runs, alternating between the shared blocks
+            source = 0
+            piece_size = -(-length // workers)  # Round up
+            while len(runs) > 1:
+                tasks = []
+                merged_runs = []
+                for index in range(0, len(runs), 2):
+                    if index + 1 == len(runs):
+                        # Odd run out is copied to the other block as a piece
+                        low, high = runs[index]
+                        tasks.append((source, low, high, high, high, low))
+                        merged_runs.append((low, high))
+                        continue
+                    low, middle = runs[index]
+                    high = runs[index + 1][1]
+                    tasks.extend(_merge_pieces(views[source], source, low,
+                                               middle, high, piece_size))
+                    merged_runs.append((low, high))
+                pool.starmap(_merge_piece, tasks)
+                runs = merged_runs
+                source = 1 - source
+            items[:] = views[source].tolist()
+    finally:
+        # Views must be released before the blocks can be closed
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return items
+
+
+def co_rank(items, index, low, middle, high):
+    """Return the number `i` of items from the sorted range `[low...middle-1]`
+    among the first `index` items of the stable merge of that range with the
+    sorted range `[middle...high-1]`, so the merge's output up to `index` is
+    the first `i` items of the left range and `index - i` of the right range.
+    Running time: O(log n) with a binary search over `i`."""
+    left_length = middle - low
+    right_length = high - middle
+    # Search for i in [minimum...maximum] so the left and right parts of the
+    # prefix fit in their ranges
+    minimum = max(0, index - right_length)
+    maximum = min(index, left_length)
+    while minimum < maximum:
+        i = (minimum + maximum) // 2
+        j = index - i
+        # Take more left items if the next left item precedes the last right
+        # item taken (equal items come from the left first)
+        if j > 0 and not items[middle + j - 1] < items[low + i]:
+            minimum = i + 1
+        else:
+            maximum = i
+    return minimum
+
+
+def _merge_pieces(view, source, low, middle, high, piece_size):
+    """Return a list of tasks for _merge_piece that together merge the sorted
+    ranges `[low...middle-1]` and `[middle...high-1]` of the given view, each
+    writing a piece of at most piece_size items of the output."""
+    tasks = []
+    left, right = low, middle
+    for start in range(low, high, piece_size):
+        end = min(start + piece_size, high)
+        next_left = low + co_rank(view, end - low, low, middle, high)
+        next_right = middle + (end - low) - (next_left - low)
+        tasks.append((source, left, next_left, right, next_right, start))
+        left, right = next_left, next_right
+    return tasks
+
+
+def _typecode(items):
+    """Return the array typecode to store the given items in: 'q' (int64) if
+    they are all ints, or 'd' (double) if they are all floats."""
+    types = set(map(type, items))
+    if types == {int}:
+        return 'q'
+    if types == {float}:
+        return 'd'
+    raise TypeError('Parallel sort requires all ints or all floats, not {}'
+                    .format(', '.join(sorted(kind.__name__ for kind in types))))
+
+
+def _attach(names, typecode):
+    """Attach this worker process to the shared memory blocks with the given
+    names and keep views of them as arrays of the given typecode."""
+    for name in names:
+        # Keep each block referenced, as closing it would invalidate its view
+        block = shared_memory.SharedMemory(name)
+        _blocks.append(block)
+        _views.append(block.buf.cast(typecode))
+
+
+def _sort_chunk(low, high):
+    """Sort the range `[low...high-1]` of the first shared block in place."""
+    view = _views[0]
+    chunk = merge_sort(view[low:high].tolist())
+    view[low:high] = array(view.format, chunk)
+
+
+def _merge_piece(source, left, left_end, right, right_end, start):
+    """Merge the sorted ranges `[left...left_end-1]` and `[right...right_end-1]`
+    of the given source shared block into the other block, from index start."""
+    view = _views[source]
+    merged = merge(view[left:left_end].tolist(), view[right:right_end].tolist())
+    _views[1 - source][start:start + len(merged)] = array(view.format, merged)
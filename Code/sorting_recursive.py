@@ -1,48 +1,89 @@
 #!python
 import random
 
+from sorting_buffers import sortable_view, assign_slice, new_buffer
+from sorting_iterative import sort_by_key
+
 
 def merge(items1, items2):
     """Merge given lists of items, each assumed to already be in sorted order,
     and return a new list containing all items in sorted order.
-    TODO: Running time: o(n) all cases, it must traverse the entirity of both arrays to combine them
-    TODO: Memory usage: o(n) all cases, it builds an array containing all elements of both arrays"""
-
-    if not items1 and not items2:
-        return []
-    elif not items1:
-      # Recurse in items2 until empty
-        return [items2[0]] + merge(items1, items2[1:])
-    elif not items2:
-      # Recurse in items1 until empty
-        return [items1[0]] + merge(items1[1:], items2)
-    else:
-        if items1[0] < items2[0]:
-            return [items1[0]] + merge(items1[1:], items2)
+    Items are compared by index with a loop, and equal items are taken from
+    items1 first, so the merge is stable.
+    Running time: O(n) all cases, it must traverse the entirity of both arrays to combine them
+    Memory usage: O(n) all cases, it builds an array containing all elements of both arrays"""
+    merged = []
+    index1, index2 = 0, 0
+    length1, length2 = len(items1), len(items2)
+    while index1 < length1 and index2 < length2:
+        if items2[index2] < items1[index1]:
+            merged.append(items2[index2])
+            index2 += 1
         else:
-            return [items2[0]] + merge(items1, items2[1:])
-
-
-def merge_sort(items):
-    """Sort given items by splitting list into two approximately equal halves,
-    sorting each recursively, and merging results into a list in sorted order.
-    TODO: Running time: o(nlogn) in all cases, since the items input is halved n times
-    TODO: Memory usage: o(n) in all cases, since it is not done in place and must create a new array"""
-    # TODO: Check if list is so small it's already sorted (base case)
-    # TODO: Split items list into approximately equal halves
-    # TODO: Sort each half by recursively calling merge sort
-    # TODO: Merge sorted halves into one list in sorted order
-    if len(items) == 1:
-        return items
+            merged.append(items1[index1])
+            index1 += 1
+    # Append the remaining items of whichever list is not used up
+    merged.extend(items1[index1:])
+    merged.extend(items2[index2:])
+    return merged
+
+
+def merge_ranges(source, target, low, middle, high):
+    """Merge the sorted ranges `[low...middle-1]` and `[middle...high-1]` of
+    the source list into the range `[low...high-1]` of the target list.
+    Equal items are taken from the left range first, so the merge is stable.
+    Running time: O(n) for n = high - low items.
+    Memory usage: O(1), target must already have room for all items."""
+    if middle == high or not source[middle] < source[middle - 1]:
+        # Ranges are already in order, so copy them with one slice
+        target[low:high] = source[low:high]
+        return
+    index, left, right = low, low, middle
+    while left < middle and right < high:
+        if source[right] < source[left]:
+            target[index] = source[right]
+            right += 1
+        else:
+            target[index] = source[left]
+            left += 1
+        index += 1
+    # Copy the remaining items of whichever range is not used up
+    if left < middle:
+        target[index:high] = source[left:middle]
     else:
-        midpoint = len(items) // 2
-        left = merge_sort(items[:midpoint])
-        right = merge_sort(items[midpoint:])
-        items2 = merge(left, right)
+        target[index:high] = source[right:high]
 
-    for i in range(len(items2)):
-        items[i] = items2[i]
 
+def merge_sort(items, key=None, reverse=False):
+    """Sort given items by merging sorted runs of 1, 2, 4, ... items bottom-up
+    (without recursion), until one run of all items is in sorted order.
+    Each pass merges runs from items into a single auxiliary buffer or back,
+    alternating, so no sublists are sliced and only one buffer is allocated.
+    Items are compared by the given key function, in descending order if
+    reverse is True (see sort_by_key). Buffers such as array.array, mmap or
+    NumPy arrays are sorted directly through a memoryview (see sortable_view),
+    with a buffer of the same item format.
+    The sort is stable and mutates items in place (and also returns it).
+    Running time: O(n log n) in all cases, log n passes each merging n items
+    Memory usage: O(n) in all cases, for the single auxiliary buffer"""
+    if key is not None or reverse:
+        return sort_by_key(merge_sort, items, key, reverse)
+    view = sortable_view(items)
+    length = len(view)
+    if length <= 1:
+        return items
+    source, target = view, new_buffer(view)
+    width = 1
+    while width < length:
+        for low in range(0, length, 2 * width):
+            middle = min(low + width, length)
+            high = min(low + 2 * width, length)
+            merge_ranges(source, target, low, middle, high)
+        source, target = target, source
+        width *= 2
+    # Copy sorted items back if the last pass merged them into the buffer
+    if source is not view:
+        view[:] = source
     return items
 
 
@@ -72,29 +113,156 @@ def partition(items, low, high):
     return pointer_index
 
 
-def quick_sort(items, low=None, high=None):
+def median_of_three(items, index1, index2, index3):
+    """Return the index of the median of the items at the three given indexes.
+    Running time: O(1), at most three comparisons."""
+    item1, item2, item3 = items[index1], items[index2], items[index3]
+    if item1 < item2:
+        if item2 < item3:
+            return index2
+        return index3 if item1 < item3 else index1
+    if item1 < item3:
+        return index1
+    return index3 if item2 < item3 else index2
+
+
+def choose_pivot(items, low, high):
+    """Return a pivot item for range `[low...high]`: the median of the first,
+    middle and last items, or for large ranges Tukey's ninther, the median of
+    the medians of three groups of three items spread across the range. On
+    sorted or reversed input either is the true median, avoiding the O(n^2)
+    worst case of always pivoting on the last item.
+    Running time: O(1), at most twelve comparisons."""
+    middle = (low + high) // 2
+    if high - low < NINTHER_THRESHOLD:
+        return items[median_of_three(items, low, middle, high)]
+    step = (high - low) // 8
+    first = median_of_three(items, low, low + step, low + 2 * step)
+    second = median_of_three(items, middle - step, middle, middle + step)
+    third = median_of_three(items, high - 2 * step, high - step, high)
+    return items[median_of_three(items, first, second, third)]
+
+
+def partition_three_way(items, low, high, pivot):
+    """Return indexes `(lt, gt)` after in-place partitioning given items in
+    range `[low...high]` around the given pivot item into three ranges (Dutch
+    national flag): items less than pivot into `[low...lt-1]`, items equal to
+    pivot into `[lt...gt]`, and items greater than pivot into `[gt+1...high]`.
+    Grouping all duplicates of the pivot in the middle means they are never
+    partitioned again, so lists with few unique items sort in O(n log k) time.
+    Running time: O(n) in all cases, one pass over the range
+    Memory usage: O(1) in all cases, items is modified in-place"""
+    lt, index, gt = low, low, high
+    while index <= gt:
+        item = items[index]
+        if item < pivot:
+            items[lt], items[index] = item, items[lt]
+            lt += 1
+            index += 1
+        elif pivot < item:
+            items[index], items[gt] = items[gt], item
+            gt -= 1
+        else:
+            index += 1
+    return lt, gt
+
+
+def insertion_sort_range(items, low, high):
+    """Sort given items in range `[low...high]` in place by inserting each item
+    into sorted order among the items before it, shifting larger items right.
+    Running time: O(n^2) worst case, but fast for the few items it is used on
+    Memory usage: O(1), items is modified in-place"""
+    for index in range(low + 1, high + 1):
+        item = items[index]
+        position = index
+        while position > low and item < items[position - 1]:
+            items[position] = items[position - 1]
+            position -= 1
+        items[position] = item
+
+
+def heap_sort_range(items, low, high):
+    """Sort given items in range `[low...high]` in place by building a binary
+    max heap of the range, then repeatedly swapping its maximum item to the end
+    of the range and bubbling down the item swapped into the root.
+    Running time: O(n log n) in all cases
+    Memory usage: O(1), items is modified in-place"""
+    size = high - low + 1
+
+    def bubble_down(index, size):
+        # Index is relative to low, so children of i are at 2i+1 and 2i+2
+        item = items[low + index]
+        child = 2 * index + 1
+        while child < size:
+            if child + 1 < size and items[low + child] < items[low + child + 1]:
+                child += 1
+            if not item < items[low + child]:
+                break
+            items[low + index] = items[low + child]
+            index = child
+            child = 2 * index + 1
+        items[low + index] = item
+
+    for index in reversed(range(size // 2)):
+        bubble_down(index, size)
+    for end in range(size - 1, 0, -1):
+        items[low], items[low + end] = items[low + end], items[low]
+        bubble_down(0, end)
+
+
+# Ranges with at most this many items are finished with insertion sort
+INSERTION_SORT_CUTOFF = 16
+# Ranges with at least this many items choose a pivot with Tukey's ninther
+NINTHER_THRESHOLD = 40
+
+
+def quick_sort(items, low=None, high=None, key=None, reverse=False):
     """Sort given items in place by partitioning items in range `[low...high]`
-    around a pivot item and recursively sorting each remaining sublist range.
-    TODO: Best case running time: o(nlogn) if pivots are always directly in the middle of each partition
-    TODO: Worst case running time: o(n^2) if elements in each partition are already sorted and pivot is rightmost
-    TODO: Memory usage: o(n) in worst case, o(logn) in average case. Worst case occurs when items are sorted, increasing
-    the callstack to n size. In the average case, fewer recursive calls are required and the callstack is smaller."""
-    # TODO: Check if high and low range bounds have default values (not given)
-    # TODO: Check if list or range is so small it's already sorted (base case)
-    # TODO: Partition items in-place around a pivot and get index of pivot
-    # TODO: Sort each sublist range by recursively calling quick sort
-
-    if low == None:
+    around a pivot item and sorting each remaining sublist range, introsort
+    style: the pivot is a median of three or ninther, partitioning is three-way
+    so duplicates of the pivot are done, ranges of up to INSERTION_SORT_CUTOFF
+    items are finished with insertion sort, and the smaller side is sorted
+    recursively while the larger side is sorted by the loop, so the recursion
+    depth is at most log n. If the partitions are still unbalanced after
+    2 log n levels, the range is heap sorted instead. Items are compared by the
+    given key function, in descending order if reverse is True (see
+    sort_by_key), which also makes the sort stable. Buffers such as
+    array.array, mmap or NumPy arrays are sorted directly through a memoryview
+    (see sortable_view).
+    Best case running time: O(n) if all items are equal (one partition pass)
+    Worst case running time: O(n log n), by falling back to heap sort
+    Memory usage: O(log n) in all cases for the call stack"""
+    items = sortable_view(items)
+    if low is None:
         low = 0
-
-    if high == None:
+    if high is None:
         high = len(items) - 1
+    if key is not None or reverse:
+        part = list(items[low:high + 1])
+        assign_slice(items, low, high + 1, sort_by_key(quick_sort, part, key, reverse))
+    elif low < high:
+        depth_limit = 2 * (high - low + 1).bit_length()
+        introsort(items, low, high, depth_limit)
 
-    if low < high:
-        pivot = partition(items, low, high)
 
-        quick_sort(items, low, pivot - 1)
-        quick_sort(items, pivot + 1, high)
+def introsort(items, low, high, depth_limit):
+    """Sort given items in range `[low...high]` in place with quick sort,
+    switching to heap sort if more than depth_limit partitions are nested."""
+    while high - low >= INSERTION_SORT_CUTOFF:
+        if depth_limit == 0:
+            heap_sort_range(items, low, high)
+            return
+        depth_limit -= 1
+        pivot = choose_pivot(items, low, high)
+        lt, gt = partition_three_way(items, low, high, pivot)
+        # Recurse on the smaller side and loop on the larger side
+        if lt - low < high - gt:
+            introsort(items, low, lt - 1, depth_limit)
+            low = gt + 1
+        else:
+            introsort(items, gt + 1, high, depth_limit)
+            high = lt - 1
+    insertion_sort_range(items, low, high)
 
 
 def partition_subarrays(items):
@@ -120,6 +288,7 @@ def quick_sort_subarrays(items):
         return quick_sort_subarrays(left) + [pivot] + quick_sort_subarrays(right)
 
 
-items = [24, 31, 23, 35, 15, 39, 5, 19, 39,
-         20, 15, 25, 40, 29, 12, 39, 24, 34, 36, 41]
-print(quick_sort_subarrays(items))
+if __name__ == '__main__':
+    items = [24, 31, 23, 35, 15, 39, 5, 19, 39,
+             20, 15, 25, 40, 29, 12, 39, 24, 34, 36, 41]
+    print(quick_sort_subarrays(items))
@@ -0,0 +1,120 @@
+#!python
+
+from prefixtree import PrefixTree
+from sorting_iterative import binary_insertion_sort_range
+
+# Ranges with at most this many strings are sorted with radix quick sort
+MSD_CUTOFF = 64
+# Ranges with at most this many strings are sorted with insertion sort
+RADIX_INSERTION_CUTOFF = 8
+
+
+def msd_radix_sort(strings):
+    """Sort given strings in place with most significant digit first radix
+    sort: distribute the strings into buckets by their first character, put
+    the buckets back in order of their characters, then sort each bucket the
+    same way by the next character, and so on. Strings that end at the
+    current depth form the first bucket and are done. Each character of a
+    shared prefix is only examined once per string, instead of in every
+    comparison. Buckets with at most MSD_CUTOFF strings are finished with
+    radix_quick_sort. Ranges left to sort are kept on an explicit stack, so
+    long shared prefixes cannot overflow the call stack.
+    Running time: O(D + n log n) for n strings with D characters in total in
+    their distinguishing prefixes; buckets are kept in a dict and only the
+    distinct characters at each step are sorted.
+    Memory usage: O(n) for the buckets of one range at a time"""
+    stack = [(0, len(strings), 0)]
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= MSD_CUTOFF:
+            radix_quick_sort(strings, low, high, depth)
+            continue
+        buckets = {}
+        for string in strings[low:high]:
+            # Slice is '' for strings that end here, which sorts first
+            character = string[depth:depth + 1]
+            bucket = buckets.get(character)
+            if bucket is None:
+                buckets[character] = [string]
+            else:
+                bucket.append(string)
+        start = low
+        for character in sorted(buckets):
+            bucket = buckets[character]
+            end = start + len(bucket)
+            strings[start:end] = bucket
+            if character and end - start > 1:
+                stack.append((start, end, depth + 1))
+            start = end
+    return strings
+
+
+def radix_quick_sort(strings, low=0, high=None, depth=0):
+    """Sort given strings in range `[low...high-1]`, which all share the same
+    first depth characters, in place with three-way radix quick sort: choose
+    a pivot character (median of three) at the current depth, partition the
+    range into strings whose character there is less than, equal to or
+    greater than the pivot, and sort the less and greater parts at the same
+    depth and the equal part at the next depth, so characters of a shared
+    prefix are never compared again. Ranges of at most RADIX_INSERTION_CUTOFF
+    strings are finished with binary insertion sort. Ranges left to sort are
+    kept on an explicit stack.
+    Running time: O(D + n log n) on average for n strings with D characters
+    in total in their distinguishing prefixes
+    Memory usage: O(log n + L) for the stack, with L the longest prefix"""
+    if high is None:
+        high = len(strings)
+    stack = [(low, high, depth)]
+    while stack:
+        low, high, depth = stack.pop()
+        if high - low <= RADIX_INSERTION_CUTOFF:
+            binary_insertion_sort_range(strings, low, high, low + 1)
+            continue
+        end = depth + 1
+        first = strings[low][depth:end]
+        middle = strings[(low + high) // 2][depth:end]
+        last = strings[high - 1][depth:end]
+        # Median of the three characters
+        pivot = sorted((first, middle, last))[1]
+        lt, index, gt = low, low, high - 1
+        while index <= gt:
+            string = strings[index]
+            character = string[depth:end]
+            if character < pivot:
+                strings[lt], strings[index] = string, strings[lt]
+                lt += 1
+                index += 1
+            elif pivot < character:
+                strings[index], strings[gt] = strings[gt], string
+                gt -= 1
+            else:
+                index += 1
+        stack.append((low, lt, depth))
+        stack.append((gt + 1, high, depth))
+        if pivot:
+            # Strings equal to a pivot of '' have ended, so are done
+            stack.append((lt, gt + 1, depth + 1))
+    return strings
+
+
+def trie_sort(strings, byte_keys=False):
+    """Sort given strings in place by inserting each distinct string into a
+    PrefixTree (with UTF-8 byte keys if byte_keys is True), counting repeated
+    strings, then writing them back in the order of the tree's ordered
+    traversal (see PrefixTree.sorted_strings), each as many times as it was
+    given. Shared prefixes are stored once, so no prefix is compared again.
+    Running time: O(D + c log c) for D characters in total and c child
+    characters sorted during the traversal (O(D) with byte keys)
+    Memory usage: O(N) for the tree's nodes, with N distinct prefixes"""
+    counts = {}
+    tree = PrefixTree(byte_keys=byte_keys)
+    for string in strings:
+        count = counts.get(string)
+        if count is None:
+            counts[string] = 1
+            tree.insert(string)
+        else:
+            counts[string] = count + 1
+    strings[:] = [string for string in tree.sorted_strings()
+                  for _ in range(counts[string])]
+    return strings
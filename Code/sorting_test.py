@@ -2,7 +2,28 @@
 
 from sorting import random_ints
 from sorting_iterative import is_sorted, bubble_sort, selection_sort, insertion_sort
-from sorting_recursive import merge_sort, quick_sort
+from sorting_iterative import shell_sort, ciura_gaps, tokuda_gaps
+from sorting_recursive import merge, merge_sort, quick_sort, introsort
+from sorting_recursive import partition_three_way, heap_sort_range
+from sorting_adaptive import tim_sort, count_run, gallop_left, gallop_right
+from sorting_integer import counting_sort, bucket_sort, radix_sort
+from sorting_parallel import parallel_merge_sort, co_rank
+from sorting_external import external_sort
+from sorting_buffers import sortable_view
+from sorting_strings import msd_radix_sort, radix_quick_sort, trie_sort
+from sorting_instrument import SortStats, measure_sort
+from sorting_benchmark import DISTRIBUTIONS, run_matrix, compare_results
+from sorting_benchmark import write_results, read_results
+import sorting_integer
+import sorting_parallel
+from array import array
+import mmap
+import os
+import pytest
+import random
+import sys
+import tempfile
+import tracemalloc
 
 sort = bubble_sort
 
@@ -100,3 +121,477 @@ def test_sort_on_seven_dwarf_names():
     sorted_items = sorted(items)  # Copy
     sort(items)  # Mutate
     assert items == sorted_items
+
+
+def test_insertion_sort_is_stable():
+    records = [(random.randint(1, 5), index) for index in range(300)]
+    items = list(records)
+    insertion_sort(items, key=lambda record: record[0])
+    assert items == sorted(records, key=lambda record: record[0])
+    items = random_ints(500, 1, 1000)
+    sorted_items = sorted(items)
+    assert insertion_sort(items) is items
+    assert items == sorted_items
+
+
+def test_gap_sequences():
+    assert ciura_gaps(1000) == [701, 301, 132, 57, 23, 10, 4, 1]
+    assert ciura_gaps(1) == [1]
+    assert ciura_gaps(10000)[:2] == [8858, 3937]
+    assert tokuda_gaps(250) == [233, 103, 46, 20, 9, 4, 1]
+    assert tokuda_gaps(1) == [1]
+
+
+def test_shell_sort():
+    for gaps in ['ciura', 'tokuda']:
+        for items in [[], [1], random_ints(2000, 1, 100),
+                      list(range(1000, 0, -1)), random_ints(3000, 1, 10 ** 6)]:
+            sorted_items = sorted(items)
+            shell_sort(items, gaps)
+            assert items == sorted_items
+    with pytest.raises(ValueError):
+        shell_sort([2, 1], 'fibonacci')
+
+
+def test_merge():
+    assert merge([], []) == []
+    assert merge([1, 3], []) == [1, 3]
+    assert merge([], [2]) == [2]
+    assert merge([1, 3, 5], [2, 3, 4, 6]) == [1, 2, 3, 3, 4, 5, 6]
+    # Long lists are merged without recursion
+    assert merge(list(range(0, 10000, 2)), list(range(1, 10000, 2))) == list(range(10000))
+
+
+def test_merge_sort_on_large_lists():
+    items = random_ints(20000, 1, 1000)
+    sorted_items = sorted(items)
+    result = merge_sort(items)
+    assert result is items  # Sorted in place
+    assert items == sorted_items
+    for items in [list(range(5000)), list(range(5000, 0, -1))]:
+        sorted_items = sorted(items)
+        merge_sort(items)
+        assert items == sorted_items
+
+
+def test_merge_sort_is_stable():
+    class Record(object):
+        def __init__(self, key, name):
+            self.key, self.name = key, name
+
+        def __lt__(self, other):
+            return self.key < other.key
+
+    records = [Record(random.randint(1, 5), index) for index in range(200)]
+    expected = sorted(records, key=lambda record: record.key)
+    merge_sort(records)
+    assert [record.name for record in records] == [record.name for record in expected]
+
+
+def test_quick_sort_on_adversarial_lists():
+    # Sorted, reversed and all-duplicate lists are deeper than the recursion
+    # limit with a last-item pivot, but not with median-of-three pivots
+    lists = [list(range(5000)), list(range(5000, 0, -1)), [7] * 5000,
+             random_ints(5000, 1, 3), list(range(2500)) + list(range(2500, 0, -1))]
+    for items in lists:
+        sorted_items = sorted(items)
+        quick_sort(items)
+        assert items == sorted_items
+
+
+def test_quick_sort_on_subrange():
+    items = [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
+    quick_sort(items, 2, 6)
+    assert items == [9, 8, 3, 4, 5, 6, 7, 2, 1, 0]
+
+
+def test_partition_three_way():
+    items = [5, 1, 5, 9, 3, 5, 7, 5]
+    lt, gt = partition_three_way(items, 0, len(items) - 1, 5)
+    assert all(item < 5 for item in items[:lt])
+    assert items[lt:gt + 1] == [5, 5, 5, 5]
+    assert all(item > 5 for item in items[gt + 1:])
+
+
+def test_heap_sort_fallback():
+    items = random_ints(1000, 1, 100)
+    sorted_items = sorted(items)
+    # A depth limit of 0 heap sorts the whole range immediately
+    introsort(items, 0, len(items) - 1, 0)
+    assert items == sorted_items
+    items = [5, 4, 3, 2, 1, 0]
+    heap_sort_range(items, 1, 4)
+    assert items == [5, 1, 2, 3, 4, 0]
+
+
+def test_count_run():
+    items = [1, 2, 2, 5, 3, 9, 8, 8, 7]
+    assert count_run(items, 0, len(items)) == 4
+    assert count_run(items, 4, len(items)) == 6
+    # Strictly descending run is reversed in place, but stops at equal items
+    assert count_run(items, 5, len(items)) == 7
+    assert items[5:7] == [8, 9]
+
+
+def test_gallops():
+    items = [1, 2, 2, 2, 3, 5, 8, 13]
+    for key in range(15):
+        for reverse in [False, True]:
+            assert gallop_left(key, items, 0, len(items), reverse) == \
+                sum(1 for item in items if item < key)
+            assert gallop_right(key, items, 0, len(items), reverse) == \
+                sum(1 for item in items if item <= key)
+
+
+def test_tim_sort_on_runs():
+    lists = [random_ints(5000, 1, 5000), random_ints(5000, 1, 3),
+             list(range(3000)) + random_ints(100, 1, 3000),
+             list(range(2000, 0, -1)) + list(range(2000)), []]
+    runs = []
+    while len(runs) < 5000:
+        run = sorted(random_ints(random.randint(1, 500), 1, 100))
+        runs.extend(run if random.random() < 0.5 else run[::-1])
+    lists.append(runs)
+    for items in lists:
+        sorted_items = sorted(items)
+        assert tim_sort(items) is items
+        assert items == sorted_items
+
+
+def test_tim_sort_is_stable():
+    # Sort (key, index) pairs by key only and check indexes stay in order
+    class Record(object):
+        def __init__(self, key, index):
+            self.key, self.index = key, index
+
+        def __lt__(self, other):
+            return self.key < other.key
+
+    keys = random_ints(2000, 1, 10) + list(range(500, 0, -1)) * 2
+    records = [Record(key, index) for index, key in enumerate(keys)]
+    tim_sort(records)
+    pairs = [(record.key, record.index) for record in records]
+    assert pairs == sorted(pairs)
+
+
+def test_tim_sort_on_presorted_items_is_linear():
+    comparisons = [0]
+
+    class Counted(int):
+        def __lt__(self, other):
+            comparisons[0] += 1
+            return int(self) < int(other)
+
+    for items in [list(range(10000)), list(range(10000, 0, -1))]:
+        comparisons[0] = 0
+        tim_sort([Counted(item) for item in items])
+        assert comparisons[0] == len(items) - 1
+
+
+def test_counting_sort():
+    for items in [[], [5], [3, 3, 3], random_ints(1000, -50, 50)]:
+        sorted_items = sorted(items)
+        counting_sort(items)
+        assert items == sorted_items
+
+
+def test_bucket_sort():
+    skewed = [random.expovariate(1) ** 4 for _ in range(1000)]
+    for items in [[], [2.5], [7, 7], random_ints(1000, -1000, 1000),
+                  [random.random() for _ in range(1000)], skewed]:
+        sorted_items = sorted(items)
+        bucket_sort(items)
+        assert items == sorted_items
+    items = random_ints(100, -5, 5)
+    sorted_items = sorted(items)
+    bucket_sort(items, num_buckets=3)
+    assert items == sorted_items
+
+
+def test_radix_sort():
+    wide = random_ints(1000, -(1 << 62), 1 << 62)
+    for items in [[], [-1], [4, 4], random_ints(1000, -50, 50), wide]:
+        for digit_bits in [1, 8, 16]:
+            copy = list(items)
+            radix_sort(copy, digit_bits)
+            assert copy == sorted(items)
+
+
+def test_integer_sorts_with_numpy(monkeypatch):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(sorting_integer, 'NUMPY_THRESHOLD', 2)
+    for sort in [counting_sort, radix_sort]:
+        items = random_ints(1000, -500, 500)
+        sorted_items = sorted(items)
+        sort(items)
+        assert items == sorted_items
+        assert all(type(item) is int for item in items)
+    items = random_ints(1000, -(1 << 63), (1 << 63) - 1)
+    sorted_items = sorted(items)
+    radix_sort(items, 16)
+    assert items == sorted_items
+
+
+def test_co_rank():
+    left, right = [1, 2, 2, 5], [2, 3, 4]
+    items = left + right
+    # Stable merge is 1 2 2 (left) 2 (right) 3 4 5, with left 2s first
+    expected = [0, 1, 2, 3, 3, 3, 3, 4]
+    for index in range(len(items) + 1):
+        assert co_rank(items, index, 0, len(left), len(items)) == expected[index]
+
+
+def test_parallel_merge_sort(monkeypatch):
+    monkeypatch.setattr(sorting_parallel, 'PARALLEL_THRESHOLD', 10)
+    for items in [random_ints(1001, -1000, 1000),
+                  [random.random() for _ in range(500)], list(range(100, 0, -1))]:
+        sorted_items = sorted(items)
+        assert parallel_merge_sort(items, workers=3) is items
+        assert items == sorted_items
+    with pytest.raises(TypeError):
+        parallel_merge_sort([1, 2.5] * 10, workers=2)
+
+
+def test_sorts_with_key_and_reverse():
+    sorts = [bubble_sort, selection_sort, insertion_sort, merge_sort,
+             quick_sort, tim_sort, counting_sort, bucket_sort, radix_sort]
+    records = [(random.randint(1, 10), index) for index in range(200)]
+    for sort in sorts:
+        for reverse in [False, True]:
+            calls = [0]
+
+            def key(record):
+                calls[0] += 1
+                return record[0]
+
+            items = list(records)
+            sort(items, key=key, reverse=reverse)
+            # Built-in sort is stable, so equal keys keep their input order
+            assert items == sorted(records, key=key, reverse=reverse)
+            assert calls[0] == 2 * len(records)  # Once by sort, once above
+        items = random_ints(50, -20, 20)
+        sorted_items = sorted(items, reverse=True)
+        sort(items, reverse=True)
+        assert items == sorted_items
+
+
+def test_quick_sort_subrange_with_key():
+    items = list(range(10))
+    quick_sort(items, 2, 6, key=lambda item: -item)
+    assert items == [0, 1, 6, 5, 4, 3, 2, 7, 8, 9]
+
+
+def run_external_sort(lines, key_type, memory, fan_in):
+    """Write the given lines to a file, sort it with external merge sort and
+    return the lines of the sorted file and the sort statistics."""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'input.txt')
+        output_path = os.path.join(directory, 'output.txt')
+        with open(input_path, 'w') as file:
+            file.write('\n'.join(lines))  # Last line has no newline
+        stats = external_sort(input_path, output_path, key_type, memory, fan_in)
+        with open(output_path) as file:
+            output = file.read().splitlines()
+        # Only the input and output files are left in the directory
+        assert sorted(os.listdir(directory)) == ['input.txt', 'output.txt']
+    return output, stats
+
+
+def test_external_sort_on_integers():
+    numbers = random_ints(1000, -500, 500)
+    lines = [str(number) for number in numbers]
+    # Each run holds about 100 bytes of lines, merged 3 runs at a time
+    output, stats = run_external_sort(lines, 'int', 100, 3)
+    assert output == [str(number) for number in sorted(numbers)]
+    assert stats['items'] == 1000
+    assert stats['runs'] > 27
+    assert stats['passes'] >= 4
+
+
+def test_external_sort_on_strings():
+    words = 'one fish two fish red fish blue fish a a\tb ab'.split(' ')
+    output, stats = run_external_sort(words, 'str', 10, 2)
+    assert output == sorted(words)
+    assert stats['runs'] > 1
+
+
+def test_external_sort_on_single_run_and_empty_file():
+    output, stats = run_external_sort(['3', '1', '2'], 'int', 1000, 2)
+    assert output == ['1', '2', '3']
+    assert stats['runs'] == 1 and stats['passes'] == 0
+    output, stats = run_external_sort([], 'str', 1000, 2)
+    assert output == []
+    assert stats['items'] == 0
+
+
+def test_external_sort_memory_budget():
+    memory = 1 << 18
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'input.txt')
+        output_path = os.path.join(directory, 'output.txt')
+        numbers = random_ints(50000, -10 ** 6, 10 ** 6)
+        with open(input_path, 'w') as file:
+            file.write('\n'.join(str(number) for number in numbers))
+        # Text is smaller than the budget, but its Python objects are not
+        assert os.path.getsize(input_path) < 2 * memory
+        tracemalloc.start()
+        try:
+            stats = external_sort(input_path, output_path, 'int', memory,
+                                  fan_in=4, buffer_size=1 << 12)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        assert stats['runs'] > 4
+        assert peak <= 2 * memory
+        with open(output_path) as file:
+            assert [int(line) for line in file] == sorted(numbers)
+
+
+def test_benchmark_distributions():
+    for name, distribution in DISTRIBUTIONS.items():
+        items = distribution(100, random.Random(0))
+        assert len(items) == 100
+        assert items == distribution(100, random.Random(0))  # Reproducible
+    assert DISTRIBUTIONS['sorted'](5, None) == [0, 1, 2, 3, 4]
+    assert DISTRIBUTIONS['organ_pipe'](5, None) == [0, 1, 3, 2, 1]
+
+
+def test_benchmark_matrix():
+    sorts = {'merge_sort': merge_sort, 'broken': lambda items: items.reverse(),
+             'bubble_sort': bubble_sort}
+    results = run_matrix(sorts, ['uniform', 'sorted'], [10, 100, 1000],
+                         repeats=1, timeout=0.0001)
+    assert len(results) == 2 * 3 * 3
+    statuses = {(result['algorithm'], result['distribution'], result['size']):
+                result['status'] for result in results}
+    assert statuses['merge_sort', 'uniform', 10] == 'ok'
+    assert statuses['broken', 'sorted', 10] == 'wrong'
+    # Quadratic sort is extrapolated to take longer than the timeout
+    assert statuses['bubble_sort', 'uniform', 1000] == 'skipped'
+    # Results survive a round trip through JSON and CSV files
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ['results.json', 'results.csv']:
+            path = os.path.join(directory, name)
+            write_results(results, path)
+            assert read_results(path) == results
+    # Compare against a baseline where every sort was correct and 10x faster
+    baseline = [dict(result, status='ok', min=(result['min'] or 1) / 10)
+                for result in results]
+    regressions = compare_results(results, baseline)
+    wrong = [result for result, _, ratio in regressions if ratio is None]
+    slower = [result for result, _, ratio in regressions if ratio is not None]
+    assert len(wrong) == 6
+    assert all(result['status'] == 'ok' for result in slower)
+    # Results that were already wrong in the baseline are not regressions
+    assert compare_results(results, results) == []
+
+
+def test_measure_sort_counts():
+    items = random_ints(100, 1, 1000)
+    sorted_items = sorted(items)
+    stats = measure_sort(bubble_sort, items)
+    assert items == sorted_items  # Original items are sorted, not wrappers
+    assert stats.comparisons == 100 * 99 // 2
+    assert stats.max_depth == 1
+    assert stats.peak_memory >= 0
+    stats = measure_sort(selection_sort, items)
+    assert stats.comparisons == 100 * 101 // 2
+    assert stats.writes == 2 * 100  # One swap per item
+    stats = measure_sort(tim_sort, list(range(1000)))
+    assert stats.comparisons == 999
+    assert stats.writes == 0
+    stats = measure_sort(counting_sort, items, compare=False)
+    assert stats.comparisons == 0
+    assert stats.writes == 100
+    assert items == sorted_items
+
+
+def test_sort_stats_context():
+    profile = sys.getprofile()
+    stats = SortStats()
+
+    def recurse(depth):
+        if depth > 1:
+            recurse(depth - 1)
+
+    counted = stats.wrap([3, 1, 2])
+    with stats:
+        recurse(5)
+        counted.sort()
+    assert stats.max_depth == 5
+    assert stats.comparisons >= 2
+    assert stats.unwrap(counted) == [1, 2, 3]
+    assert sys.getprofile() is profile  # Profile function is restored
+
+
+def test_sorts_on_buffers():
+    sorts = [merge_sort, quick_sort, tim_sort, insertion_sort, shell_sort,
+             counting_sort, bucket_sort, radix_sort]
+    for sort in sorts:
+        for typecode in ['q', 'i', 'B']:
+            numbers = random_ints(500, 0, 200)
+            items = array(typecode, numbers)
+            sort(items)
+            assert items.tolist() == sorted(numbers)
+            memory = bytearray(array(typecode, numbers))
+            sort(memoryview(memory).cast(typecode))
+            assert array(typecode, bytes(memory)).tolist() == sorted(numbers)
+        items = array('q', random_ints(100, 1, 10))
+        sorted_items = sorted(items, reverse=True)
+        sort(items, reverse=True)
+        assert items.tolist() == sorted_items
+    floats = [random.random() for _ in range(500)]
+    for sort in [merge_sort, quick_sort, tim_sort, bucket_sort]:
+        items = array('d', floats)
+        sort(items)
+        assert items.tolist() == sorted(floats)
+
+
+def test_sort_memory_mapped_file():
+    numbers = random_ints(5000, -(1 << 62), 1 << 62)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'numbers.bin')
+        for sort in [quick_sort, merge_sort, radix_sort]:
+            with open(path, 'wb') as file:
+                file.write(array('q', numbers).tobytes())
+            with open(path, 'r+b') as file:
+                mapped = mmap.mmap(file.fileno(), 0)
+                view = memoryview(mapped).cast('q')
+                sort(view)
+                view.release()
+                mapped.close()
+            with open(path, 'rb') as file:
+                assert array('q', file.read()).tolist() == sorted(numbers)
+
+
+def test_sortable_view():
+    items = [3, 1, 2]
+    assert sortable_view(items) is items
+    view = sortable_view(array('q', [3, 1, 2]))
+    assert isinstance(view, memoryview) and view.format == 'q'
+    with pytest.raises(TypeError):
+        sortable_view(b'read-only bytes')
+
+
+def test_string_sorts():
+    rng = random.Random(0)
+    words = [''.join(rng.choice('abcde') for _ in range(rng.randrange(8)))
+             for _ in range(1000)]
+    urls = ['https://example.com/{}/{}'.format(rng.choice(['a', 'ab', 'abc']),
+                                               rng.randrange(100))
+            for _ in range(1000)]
+    unicode_words = ['éclair', 'eclair', 'zebra', '日本', 'Zebra', '', 'é']
+    prefixes = ['a' * length for length in range(300, 0, -1)] + ['']
+    for string_sort in [msd_radix_sort, radix_quick_sort, trie_sort,
+                        lambda items: trie_sort(items, byte_keys=True)]:
+        for strings in [[], [''], ['b', 'a', 'b', ''], words, urls,
+                        unicode_words, prefixes, ['same'] * 100]:
+            items = list(strings)
+            assert string_sort(items) is items
+            assert items == sorted(strings)
+
+
+def test_radix_quick_sort_subrange():
+    items = ['d', 'c', 'b', 'a', 'ab', 'aa', 'z']
+    radix_quick_sort(items, 1, 6)
+    assert items == ['d', 'a', 'aa', 'ab', 'b', 'c', 'z']
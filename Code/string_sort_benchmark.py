@@ -0,0 +1,105 @@
+#!python
+
+import os
+import random
+import sys
+import time
+
+from sorting_recursive import merge_sort, quick_sort
+from sorting_adaptive import tim_sort
+from sorting_strings import msd_radix_sort, radix_quick_sort, trie_sort
+
+# Word list to sort, if present, instead of generated words
+WORDS_FILE = '/usr/share/dict/words'
+
+# Sort functions to compare, by name
+SORTS = {
+    'msd_radix': msd_radix_sort,
+    'radix_quick': radix_quick_sort,
+    'trie': trie_sort,
+    'trie_bytes': lambda items: trie_sort(items, byte_keys=True),
+    'merge_sort': merge_sort,
+    'quick_sort': quick_sort,
+    'tim_sort': tim_sort,
+}
+
+
+def random_words(size, rng):
+    """Return a list of words, sampled from WORDS_FILE if it exists or else
+    generated from random lowercase letters with lengths of 3 to 12."""
+    if os.path.exists(WORDS_FILE):
+        with open(WORDS_FILE) as file:
+            words = file.read().split()
+        return [rng.choice(words) for _ in range(size)]
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 12)))
+            for _ in range(size)]
+
+
+def random_urls(size, rng):
+    """Return a list of URLs from a few hosts and paths, so many of them
+    share long prefixes, like URLs in a web server log."""
+    hosts = ['https://www.example.com', 'https://api.example.com',
+             'https://static.example.org', 'http://example.net']
+    paths = ['/', '/index.html', '/users/', '/api/v1/items/', '/api/v2/items/',
+             '/static/images/', '/search?q=']
+    return ['{}{}{}'.format(rng.choice(hosts), rng.choice(paths),
+                            rng.randrange(size)) for _ in range(size)]
+
+
+# Functions to generate input lists of a given size, by input name
+INPUTS = {
+    'words': random_words,
+    'urls': random_urls,
+}
+
+
+def time_sort(sort, strings, repeats=3):
+    """Return the minimum time in seconds for the given sort function to sort
+    a new copy of the given strings, over the given number of repeats, and
+    raise ValueError if any result differs from the sorted strings."""
+    expected = sorted(strings)
+    best = None
+    for _ in range(repeats):
+        items = list(strings)
+        start_time = time.perf_counter()
+        sort(items)
+        seconds = time.perf_counter() - start_time
+        if items != expected:
+            raise ValueError('{} sorted strings incorrectly'.format(sort.__name__))
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def run_benchmarks(size):
+    """Time each sort on each input of the given number of strings, and print
+    a table of minimum times in milliseconds per sort."""
+    print('{:>8}'.format('input') + ''.join(' {:>12}'.format(name) for name in SORTS))
+    for name, generate in INPUTS.items():
+        strings = generate(size, random.Random(name))
+        row = '{:>8}'.format(name)
+        for sort in SORTS.values():
+            row += ' {:>12.1f}'.format(time_sort(sort, strings) * 1e3)
+        print(row)
+
+
+def main():
+    """Read command-line arguments and benchmark string sorts."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} size'.format(script))
+        print('Benchmark string sorts against merge sort, quick sort and tim sort')
+        print('    on lists of `size` words and URLs')
+        print('Example: {} 100000'.format(script))
+        return
+    try:
+        size = int(args[0])
+    except ValueError:
+        print('Integer required for `size` command-line argument')
+        return
+    run_benchmarks(size)
+
+
+if __name__ == '__main__':
+    main()
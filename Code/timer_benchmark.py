@@ -0,0 +1,76 @@
+#!python
+
+import random
+import sys
+import time
+
+from timerscheduler import TimerScheduler
+
+
+class FakeClock(object):
+    """FakeClock: a clock that only moves when the benchmark advances it."""
+
+    def __init__(self, now=0.0):
+        """Initialize this clock with the given current time."""
+        self.now = now
+
+    def __call__(self):
+        """Return the current time of this clock."""
+        return self.now
+
+
+def time_scheduler(num_timers, cancel_fraction, wheel_slots, step=0.001):
+    """Return the time in seconds to schedule the given number of timers with
+    random delays of up to one second, advancing the clock by the given step
+    and running due timers after every 100 timers, cancel the given fraction
+    of them, and run the rest, with the given timing wheel size."""
+    clock = FakeClock()
+    scheduler = TimerScheduler(clock, wheel_slots, wheel_resolution=0.001)
+    delays = [random.random() for _ in range(num_timers)]
+    cancels = [random.random() < cancel_fraction for _ in range(num_timers)]
+    callback = int
+    start_time = time.perf_counter()
+    for index, (delay, cancel) in enumerate(zip(delays, cancels)):
+        handle = scheduler.call_later(delay, callback)
+        if cancel:
+            scheduler.cancel(handle)
+        if index % 100 == 99:
+            clock.now += step
+            scheduler.run_due()
+    scheduler.run_due(clock.now + 1)
+    return time.perf_counter() - start_time
+
+
+def run_benchmarks(num_timers, wheel_sizes=(0, 256, 1024)):
+    """Time the scheduler with each timing wheel size and fraction of timers
+    cancelled, and print a table of throughputs in timers per second."""
+    print('{:>8}'.format('cancel') +
+          ''.join(' {:>12}'.format('wheel={}'.format(size)) for size in wheel_sizes))
+    for cancel_fraction in [0.0, 0.5, 0.9, 0.99]:
+        row = '{:>8}'.format(cancel_fraction)
+        for size in wheel_sizes:
+            seconds = time_scheduler(num_timers, cancel_fraction, size)
+            row += ' {:>12.0f}'.format(num_timers / seconds)
+        print(row)
+
+
+def main():
+    """Read command-line arguments and benchmark the timer scheduler."""
+    args = sys.argv[1:]  # Ignore script file name
+    if len(args) == 0:
+        script = sys.argv[0]  # Get script file name
+        print('Usage: {} num_timers'.format(script))
+        print('Benchmark throughput of scheduling, cancelling and running timers')
+        print('    with and without a timing wheel in front of the queue')
+        print('Example: {} 100000'.format(script))
+        return
+    try:
+        num_timers = int(args[0])
+    except ValueError:
+        print('Integer required for `num_timers` command-line argument')
+        return
+    run_benchmarks(num_timers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!python
+
+import time
+from collections import deque
+
+from priorityqueue import PriorityQueue
+
+
+class TimerScheduler(object):
+    """TimerScheduler: a scheduler of delayed callbacks, such as timeouts and
+    retries, that are run in deadline order by calling run_due with the current
+    time. Timers are stored in a PriorityQueue ordered by deadline, and most of
+    them are expected to be cancelled before they are due, so cancelling only
+    marks a timer in O(1) time and its heap entry is discarded lazily.
+    Optionally, timers due within the next wheel_slots * wheel_resolution
+    seconds are kept in a timing wheel in front of the queue instead: a
+    circular array of slots, one per wheel_resolution seconds, each a dict of
+    timers due in that interval. Scheduling and cancelling a near-term timer
+    is then a single dict insert or delete with no heap operation at all, and
+    timers further in the future fall back to the queue."""
+
+    def __init__(self, clock=time.monotonic, wheel_slots=0, wheel_resolution=0.01):
+        """Initialize this scheduler with the given clock function (returning
+        the current time in seconds) and timing wheel size, or no timing wheel
+        if wheel_slots is 0."""
+        self.clock = clock
+        self.queue = PriorityQueue()
+        # Counter to generate a new unique handle for each timer
+        self.counter = 0
+        # Map each pending timer's handle in the queue to its queue handle
+        self.queued = {}
+        # Map each pending timer's handle in the timing wheel to its slot
+        self.wheeled = {}
+        self.wheel_resolution = wheel_resolution
+        self.wheel = [{} for _ in range(wheel_slots)]
+        # Index of the wheel interval containing the last time run_due ran
+        self.tick = int(clock() // wheel_resolution) if wheel_slots else 0
+        # Due timers (when, handle, callback, args) waiting to be run in order
+        self.ready = deque()
+
+    def __repr__(self):
+        """Return a string representation of this scheduler."""
+        return 'TimerScheduler({} timers)'.format(self.size())
+
+    def size(self):
+        """Return the number of pending (not yet run or cancelled) timers."""
+        return len(self.queued) + len(self.wheeled) + len(self.ready)
+
+    def call_at(self, when, callback, *args):
+        """Schedule the given callback to be called with the given arguments at
+        the given time, and return a handle for the timer. Timers with equal
+        deadlines run in the order they were scheduled. Running time: O(1) for
+        a timer in the timing wheel, or O(log n) for a timer in the queue."""
+        handle = self.counter
+        self.counter += 1
+        timer = (when, handle, callback, args)
+        if self.wheel:
+            # Timers already due go in the current slot to run next time
+            tick = max(int(when // self.wheel_resolution), self.tick)
+            if tick - self.tick < len(self.wheel):
+                slot = tick % len(self.wheel)
+                self.wheel[slot][handle] = timer
+                self.wheeled[handle] = slot
+                return handle
+        self.queued[handle] = self.queue.enqueue(timer, when)
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        """Schedule the given callback to be called with the given arguments
+        after the given delay in seconds, and return a handle for the timer."""
+        return self.call_at(self.clock() + delay, callback, *args)
+
+    def cancel(self, handle):
+        """Cancel the timer with the given handle and return True, or return
+        False if it has already run or been cancelled. Running time: O(1),
+        unless a callback raised and left due timers waiting to be run."""
+        if handle in self.wheeled:
+            del self.wheel[self.wheeled.pop(handle)][handle]
+            return True
+        if handle in self.queued:
+            self.queue.cancel(self.queued.pop(handle))
+            return True
+        for index, timer in enumerate(self.ready):
+            if timer[1] == handle:
+                del self.ready[index]
+                return True
+        return False
+
+    def run_due(self, now=None):
+        """Run the callbacks of all timers due at the given time (or the clock's
+        current time) in deadline order and return the number run. Timers that
+        callbacks schedule to be due already run on the next call. If a
+        callback raises an exception, it is propagated and the remaining due
+        timers run on the next call."""
+        if now is None:
+            now = self.clock()
+        due = []
+        # Collect due timers from the front of the queue
+        queue = self.queue
+        while not queue.is_empty() and queue.front()[0] <= now:
+            timer = queue.dequeue()
+            del self.queued[timer[1]]
+            due.append(timer)
+        # Collect due timers from the slots of each interval up to now
+        if self.wheel:
+            due.extend(self._advance_wheel(now))
+        due.sort(key=lambda timer: (timer[0], timer[1]))
+        self.ready.extend(due)
+        count = 0
+        while self.ready:
+            _, _, callback, args = self.ready.popleft()
+            callback(*args)
+            count += 1
+        return count
+
+    def _advance_wheel(self, now):
+        """Remove and return a list of all timers in the timing wheel that are
+        due at the given time, and advance the wheel's current interval."""
+        due = []
+        now_tick = int(now // self.wheel_resolution)
+        num_slots = len(self.wheel)
+        last_tick = min(now_tick, self.tick + num_slots - 1)
+        for tick in range(self.tick, last_tick + 1):
+            slot = self.wheel[tick % num_slots]
+            if not slot:
+                continue
+            if tick < now_tick:
+                timers = list(slot.values())
+                slot.clear()
+            else:
+                timers = [timer for timer in slot.values() if timer[0] <= now]
+                for timer in timers:
+                    del slot[timer[1]]
+            for timer in timers:
+                del self.wheeled[timer[1]]
+            due.extend(timers)
+        if now_tick > self.tick:
+            self.tick = now_tick
+        return due
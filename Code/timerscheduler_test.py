@@ -0,0 +1,121 @@
+#!python
+
+from timerscheduler import TimerScheduler
+import random
+import unittest
+
+
+class FakeClock(object):
+    """FakeClock: a clock that only moves when the test advances it."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestTimerScheduler(unittest.TestCase):
+    def schedulers(self):
+        """Return a fake clock and schedulers without and with a wheel."""
+        clock = FakeClock(100.0)
+        return clock, [TimerScheduler(clock),
+                       TimerScheduler(clock, wheel_slots=8, wheel_resolution=1.0)]
+
+    def test_run_due_in_deadline_order(self):
+        clock, schedulers = self.schedulers()
+        for scheduler in schedulers:
+            fired = []
+            scheduler.call_later(5, fired.append, 'C')
+            scheduler.call_later(1, fired.append, 'A')
+            scheduler.call_at(102.5, fired.append, 'B')
+            scheduler.call_later(50, fired.append, 'D')
+            scheduler.call_at(102.5, fired.append, 'B2')
+            assert scheduler.size() == 5
+            assert scheduler.run_due(100.5) == 0
+            assert scheduler.run_due(102.5) == 3
+            assert fired == ['A', 'B', 'B2']
+            assert scheduler.run_due(120) == 1
+            assert scheduler.run_due() == 0
+            assert scheduler.run_due(200) == 1
+            assert fired == ['A', 'B', 'B2', 'C', 'D']
+            assert scheduler.size() == 0
+
+    def test_cancel(self):
+        clock, schedulers = self.schedulers()
+        for scheduler in schedulers:
+            fired = []
+            near = scheduler.call_later(1, fired.append, 'near')
+            far = scheduler.call_later(60, fired.append, 'far')
+            kept = scheduler.call_later(2, fired.append, 'kept')
+            assert scheduler.cancel(near) is True
+            assert scheduler.cancel(far) is True
+            assert scheduler.cancel(far) is False
+            assert scheduler.size() == 1
+            assert scheduler.run_due(1000) == 1
+            assert fired == ['kept']
+            assert scheduler.cancel(kept) is False
+
+    def test_near_timers_skip_the_queue(self):
+        clock = FakeClock(0.0)
+        scheduler = TimerScheduler(clock, wheel_slots=16, wheel_resolution=0.5)
+        handles = [scheduler.call_later(delay, print) for delay in [0.1, 3, 7.9]]
+        assert scheduler.queue.heap.size() == 0
+        for handle in handles:
+            scheduler.cancel(handle)
+        scheduler.call_later(8, print)
+        assert scheduler.queue.heap.size() == 1
+
+    def test_clock_jumps_past_whole_wheel(self):
+        clock = FakeClock(0.0)
+        scheduler = TimerScheduler(clock, wheel_slots=4, wheel_resolution=1.0)
+        fired = []
+        scheduler.call_at(0.5, fired.append, 1)
+        scheduler.call_at(3.5, fired.append, 2)
+        scheduler.call_at(10, fired.append, 3)
+        assert scheduler.run_due(3.0) == 1
+        # Timers scheduled in the past run on the next call
+        scheduler.call_at(1.0, fired.append, 0)
+        assert scheduler.run_due(50) == 3
+        assert fired == [1, 0, 2, 3]
+
+    def test_callback_exception_keeps_remaining_timers(self):
+        clock, schedulers = self.schedulers()
+        for scheduler in schedulers:
+            fired = []
+
+            def fail():
+                raise RuntimeError('timer failed')
+
+            scheduler.call_later(1, fired.append, 'A')
+            scheduler.call_later(2, fail)
+            scheduler.call_later(3, fired.append, 'C')
+            with self.assertRaises(RuntimeError):
+                scheduler.run_due(110)
+            assert fired == ['A']
+            assert scheduler.size() == 1
+            assert scheduler.run_due(110) == 1
+            assert fired == ['A', 'C']
+
+    def test_random_timers_match_sorted_order(self):
+        clock = FakeClock(0.0)
+        for slots in [0, 32]:
+            scheduler = TimerScheduler(clock, wheel_slots=slots, wheel_resolution=0.25)
+            fired = []
+            expected = []
+            for number in range(500):
+                when = random.uniform(0, 20)
+                handle = scheduler.call_at(when, fired.append, number)
+                if random.random() < 0.5:
+                    scheduler.cancel(handle)
+                else:
+                    expected.append((when, number))
+            now = 0.0
+            while now < 21:
+                now += random.uniform(0, 2)
+                scheduler.run_due(now)
+            assert fired == [number for _, number in sorted(expected)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+#!python
+
+from binaryheap import BinaryMinHeap
+
+
+class TopK(object):
+    """TopK: an accumulator that keeps the k items with the largest keys seen
+    in a stream of any length, using O(k) memory. The items are stored in a
+    binary min heap of (key, -sequence, item) entries, so the smallest kept key
+    is always at the root: each new item is rejected with one comparison if
+    its key is not larger than that key, and otherwise replaces the root item
+    with one bubble down. Items are never compared, only keys and sequence
+    numbers, and of items with equal keys the earliest ones are kept, since
+    the latest of them is at the root and is replaced first."""
+
+    def __init__(self, k, key=None):
+        """Initialize this accumulator to keep the k items with the largest
+        keys, computed by the given key function or the items themselves."""
+        if k < 1:
+            raise ValueError('Number of items to keep must be positive: {}'.format(k))
+        self.k = k
+        self.key = key
+        self.heap = BinaryMinHeap()
+        # Count the number of items fed, to number the heap's entries
+        self.count = 0
+
+    def __repr__(self):
+        """Return a string representation of this accumulator."""
+        return 'TopK({}, {} of {} items)'.format(self.k, self.size(), self.count)
+
+    def size(self):
+        """Return the number of items kept by this accumulator."""
+        return self.heap.size()
+
+    def feed(self, item):
+        """Offer the given item to this accumulator. Running time: O(1) if it
+        is rejected, or O(log k) if it replaces a kept item."""
+        key = item if self.key is None else self.key(item)
+        self._offer(key, self.count, item)
+        self.count += 1
+
+    def feed_many(self, items):
+        """Offer each of the given items to this accumulator. This method is
+        more efficient than calling feed for each item, as it keeps the
+        smallest kept key in a local variable to reject items against."""
+        key_function = self.key
+        heap = self.heap
+        count = self.count
+        iterator = iter(items)
+        # Fill the heap until it holds k items, unless it already does
+        if heap.size() < self.k:
+            for item in iterator:
+                key = item if key_function is None else key_function(item)
+                heap.insert((key, -count, item))
+                count += 1
+                if heap.size() == self.k:
+                    break
+        if heap.size() == self.k:
+            threshold = heap.items[0][0]
+            for item in iterator:
+                key = item if key_function is None else key_function(item)
+                if threshold < key:
+                    heap.replace_min((key, -count, item))
+                    threshold = heap.items[0][0]
+                count += 1
+        self.count = count
+
+    def merge(self, other):
+        """Offer all items kept by the given other accumulator, such as one
+        from a parallel worker, to this accumulator, reusing their keys.
+        Running time: O(m log k) for m items kept by the other accumulator."""
+        for key, _, item in sorted(other.heap.items, key=lambda entry: -entry[1]):
+            self._offer(key, self.count, item)
+            self.count += 1
+
+    def results(self):
+        """Return a list of the kept items sorted by key from largest to
+        smallest, with items of equal keys in the order they were fed."""
+        entries = sorted(self.heap.items, key=lambda entry: -entry[1])
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return [item for _, _, item in entries]
+
+    def _offer(self, key, sequence, item):
+        """Keep the given item with the given key and sequence number if there
+        are fewer than k items or its key is larger than the smallest key."""
+        heap = self.heap
+        if heap.size() < self.k:
+            heap.insert((key, -sequence, item))
+        elif heap.items[0][0] < key:
+            heap.replace_min((key, -sequence, item))
@@ -0,0 +1,75 @@
+#!python
+
+from topk import TopK
+import random
+import unittest
+
+
+class TestTopK(unittest.TestCase):
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            TopK(0)
+
+    def test_feed(self):
+        top = TopK(3)
+        for item in [5, 1, 9, 3, 7, 2]:
+            top.feed(item)
+        assert top.size() == 3
+        assert top.count == 6
+        assert top.results() == [9, 7, 5]
+
+    def test_fewer_items_than_k(self):
+        top = TopK(5)
+        top.feed_many([2, 1])
+        assert top.results() == [2, 1]
+
+    def test_feed_many_random_items(self):
+        items = [random.randrange(1000) for _ in range(5000)]
+        for k in [1, 10, 100]:
+            top = TopK(k)
+            top.feed_many(items)
+            assert top.results() == sorted(items, reverse=True)[:k]
+            assert top.count == len(items)
+
+    def test_feed_many_when_full(self):
+        top = TopK(3)
+        top.feed_many(range(10))
+        top.feed_many(range(100, 110))
+        assert top.size() == 3
+        assert top.results() == [109, 108, 107]
+        top = TopK(2)
+        top.feed(5)
+        top.feed(6)
+        top.feed_many([1, 2, 3])
+        assert top.results() == [6, 5]
+        top.feed_many([7, 4])
+        top.feed(8)
+        top.feed_many([])
+        assert top.results() == [8, 7]
+        assert top.count == 8
+
+    def test_key_and_ties(self):
+        records = [('a', 3), ('b', 5), ('c', 3), ('d', 5), ('e', 1), ('f', 3)]
+        for feed_many in [False, True]:
+            top = TopK(3, key=lambda record: record[1])
+            if feed_many:
+                top.feed_many(iter(records))
+            else:
+                for record in records:
+                    top.feed(record)
+            # Items are never compared, and earlier items win ties
+            assert top.results() == [('b', 5), ('d', 5), ('a', 3)]
+
+    def test_merge(self):
+        items = [random.random() for _ in range(3000)]
+        workers = [TopK(20) for _ in range(3)]
+        for index, worker in enumerate(workers):
+            worker.feed_many(items[index::3])
+        top = TopK(20)
+        for worker in workers:
+            top.merge(worker)
+        assert top.results() == sorted(items, reverse=True)[:20]
+
+
+if __name__ == '__main__':
+    unittest.main()